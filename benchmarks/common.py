@@ -0,0 +1,91 @@
+import argparse
+import json
+import platform
+import statistics
+import sys
+import threading
+import time
+from collections.abc import Awaitable, Callable
+from pathlib import Path
+from typing import Any
+
+
+def parse_args(description: str, **defaults: int) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=description)
+    for name, default in defaults.items():
+        parser.add_argument(f"--{name.replace('_', '-')}", type=int, default=default)
+    parser.add_argument("--output", type=Path, default=None, help="Write JSON results to file instead of stdout")
+    return parser.parse_args()
+
+
+def environment() -> dict[str, Any]:
+    is_gil_enabled = getattr(sys, "_is_gil_enabled", lambda: True)
+    return {
+        "python": sys.version,
+        "implementation": platform.python_implementation(),
+        "gil": is_gil_enabled(),
+    }
+
+
+def emit(name: str, results: list[dict[str, Any]], output: Path | None = None) -> None:
+    report = json.dumps({"benchmark": name, "environment": environment(), "results": results}, indent=2)
+    if output is None:
+        print(report)
+    else:
+        output.write_text(report + "\n")
+
+
+def run_threads(n_threads: int, target: Callable[[], None]) -> float:
+    barrier = threading.Barrier(n_threads + 1)
+
+    def worker() -> None:
+        barrier.wait()
+        target()
+
+    threads = [threading.Thread(target=worker) for _ in range(n_threads)]
+    for thread in threads:
+        thread.start()
+
+    barrier.wait()
+    start = time.perf_counter()
+    for thread in threads:
+        thread.join()
+    return time.perf_counter() - start
+
+
+def percentiles(samples: list[float], *points: float) -> dict[str, float]:
+    if len(samples) < 2:
+        return {f"p{point:g}": samples[0] if samples else 0.0 for point in points}
+    quantiles = statistics.quantiles(samples, n=1000, method="inclusive")
+    return {f"p{point:g}": quantiles[min(int(point * 10) - 1, len(quantiles) - 1)] for point in points}
+
+
+def time_call(func: Callable[[], object], iterations: int, repeat: int) -> float:
+    # Best of several rounds, in nanoseconds per call; the minimum is the least disturbed by other processes
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(iterations):
+            func()
+        best = min(best, time.perf_counter() - start)
+    return best / iterations * 1e9
+
+
+async def atime_call(func: Callable[[], Awaitable[object]], iterations: int, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(iterations):
+            await func()
+        best = min(best, time.perf_counter() - start)
+    return best / iterations * 1e9
+
+
+def compare(name: str, measured: float, baseline: float) -> dict[str, Any]:
+    return {
+        "name": name,
+        "ns_per_op": measured,
+        "baseline_ns_per_op": baseline,
+        "overhead_ns": measured - baseline,
+        "ratio": measured / baseline if baseline else None,
+    }
@@ -0,0 +1,204 @@
+import asyncio
+import contextlib
+import inspect
+from collections.abc import AsyncIterator, Callable, Iterator
+from typing import Any
+
+import laima
+from benchmarks.common import atime_call, compare, emit, parse_args, time_call
+from laima.utils.context import Context
+
+PARAMETER_COUNTS = (0, 1, 5, 20)
+
+
+class Client:
+    pass
+
+
+class Service:
+    def __init__(self, client: Client) -> None:
+        self.client = client
+
+
+def create_client() -> Client:
+    return Client()
+
+
+def with_parameters(func: Callable[..., Any], count: int) -> Callable[..., Any]:
+    # Parameters are annotated with binding names, so any number of dependencies can be declared without classes
+    func.__signature__ = inspect.Signature(  # type: ignore[attr-defined]
+        [
+            inspect.Parameter(f"dep{i}", inspect.Parameter.POSITIONAL_OR_KEYWORD, annotation=f"dep{i}")
+            for i in range(count)
+        ],
+    )
+    return func
+
+
+def targets() -> dict[str, Callable[..., Any]]:
+    def sync_function(*args: Any, **kwargs: Any) -> None:
+        pass
+
+    async def async_function(*args: Any, **kwargs: Any) -> None:
+        pass
+
+    def sync_generator(*args: Any, **kwargs: Any) -> Iterator[tuple]:
+        yield args, kwargs
+
+    async def async_generator(*args: Any, **kwargs: Any) -> AsyncIterator[tuple]:
+        yield args, kwargs
+
+    return {
+        "sync": sync_function,
+        "async": async_function,
+        "generator": sync_generator,
+        "async_generator": async_generator,
+    }
+
+
+def consume(kind: str, func: Callable[..., Any], *args: Any) -> Callable[[], Any]:
+    if kind in ("sync", "async"):
+        return lambda: func(*args)
+    if kind == "generator":
+        return lambda: list(func(*args))
+
+    async def drain() -> None:
+        async for _ in func(*args):
+            pass
+
+    return drain
+
+
+def bench_inject(iterations: int, repeat: int) -> list[dict[str, Any]]:
+    container = laima.Container()
+    for i in range(max(PARAMETER_COUNTS)):
+        provider = laima.singleton(create_client, container=container, bind_to=f"dep{i}")
+        provider()
+    values = [Client() for _ in range(max(PARAMETER_COUNTS))]
+
+    results = []
+    for count in PARAMETER_COUNTS:
+        for kind, target in targets().items():
+            injected = laima.inject(container=container)(with_parameters(target, count))
+            direct = consume(kind, target, *values[:count])
+            call = consume(kind, injected)
+
+            if kind.startswith("async"):
+                measured = asyncio.run(atime_call(call, iterations, repeat))
+                baseline = asyncio.run(atime_call(direct, iterations, repeat))
+            else:
+                measured = time_call(call, iterations, repeat)
+                baseline = time_call(direct, iterations, repeat)
+            results.append(compare(f"inject/{kind}/{count}", measured, baseline))
+
+    container.reset()
+    return results
+
+
+def bench_providers(iterations: int, repeat: int) -> list[dict[str, Any]]:
+    container = laima.Container()
+    singleton = laima.singleton(create_client, container=container, bind_to="singleton")
+    scoped = laima.scoped(create_client, container=container, bind_to="scoped")
+    transient = laima.transient(create_client, container=container, bind_to="transient")
+    baseline = time_call(create_client, iterations, repeat)
+
+    def singleton_cold() -> None:
+        singleton.reset()
+        singleton()
+
+    def scoped_cold() -> None:
+        with laima.inject(container=container, reuse_context=False):
+            scoped()
+
+    singleton()
+    results = [
+        compare("singleton/cold", time_call(singleton_cold, iterations, repeat), baseline),
+        compare("singleton/warm", time_call(singleton, iterations, repeat), baseline),
+        compare("scoped/cold", time_call(scoped_cold, iterations, repeat), baseline),
+    ]
+    with laima.inject(container=container):
+        scoped()
+        results.append(compare("scoped/warm", time_call(scoped, iterations, repeat), baseline))
+    # A transient object is never cached, so every resolution creates it
+    results.append(compare("transient", time_call(transient, iterations, repeat), baseline))
+
+    container.reset()
+    return results
+
+
+def bench_class_wrapper(iterations: int, repeat: int) -> list[dict[str, Any]]:
+    container = laima.Container()
+    laima.singleton(Client, container=container)
+    client = container.get(Client)
+    client()
+
+    class InjectedService(Service):
+        pass
+
+    service = laima.transient(InjectedService, container=container)
+    instance = Client()
+
+    results = [
+        compare(
+            "class_wrapper",
+            time_call(lambda: service(), iterations, repeat),  # type: ignore[call-arg]
+            time_call(lambda: Service(instance), iterations, repeat),
+        ),
+    ]
+    container.reset()
+    return results
+
+
+def bench_context(iterations: int, repeat: int) -> list[dict[str, Any]]:
+    container = laima.Container()
+
+    def manager() -> None:
+        with laima.inject(container=container, reuse_context=False):
+            pass
+
+    def raw() -> None:
+        Context().close()
+
+    def nullcontext() -> None:
+        with contextlib.nullcontext():
+            pass
+
+    baseline = time_call(nullcontext, iterations, repeat)
+    return [
+        compare("context/inject", time_call(manager, iterations, repeat), baseline),
+        compare("context/raw", time_call(raw, iterations, repeat), baseline),
+    ]
+
+
+def bench_container_get(iterations: int, repeat: int) -> list[dict[str, Any]]:
+    container = laima.Container()
+    laima.transient(create_client, container=container, bind_to=Client)
+    registry = dict(container.registry)
+
+    return [
+        compare(
+            "container/get",
+            time_call(lambda: container.get(Client), iterations, repeat),
+            time_call(lambda: registry[Client], iterations, repeat),
+        ),
+    ]
+
+
+def main() -> None:
+    args = parse_args(
+        "Measure the overhead of laima hot paths against direct calls",
+        iterations=20_000,
+        repeat=5,
+    )
+    results = [
+        *bench_inject(args.iterations, args.repeat),
+        *bench_providers(args.iterations, args.repeat),
+        *bench_class_wrapper(args.iterations, args.repeat),
+        *bench_context(args.iterations, args.repeat),
+        *bench_container_get(args.iterations, args.repeat),
+    ]
+    emit("hot_paths", results, args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+import asyncio
+import threading
+import time
+import tracemalloc
+from typing import Any
+
+from benchmarks.common import emit, parse_args, percentiles
+from laima.utils.lock import Lock
+
+
+def bench_uncontended(iterations: int) -> dict[str, Any]:
+    lock = Lock()
+
+    start = time.perf_counter()
+    for _ in range(iterations):
+        with lock:
+            pass
+    sync_elapsed = time.perf_counter() - start
+
+    async def run() -> float:
+        start = time.perf_counter()
+        for _ in range(iterations):
+            async with lock:
+                pass
+        return time.perf_counter() - start
+
+    async_elapsed = asyncio.run(run())
+    return {
+        "name": "uncontended",
+        "sync_ns_per_op": sync_elapsed / iterations * 1e9,
+        "async_ns_per_op": async_elapsed / iterations * 1e9,
+    }
+
+
+def bench_memory(n_locks: int) -> dict[str, Any]:
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    locks = [Lock() for _ in range(n_locks)]
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del locks
+    return {
+        "name": "memory",
+        "locks": n_locks,
+        "bytes_per_lock": (after - before) / n_locks,
+    }
+
+
+def bench_mixed(n_threads: int, n_tasks: int, iterations: int) -> dict[str, Any]:
+    lock = Lock()
+    stop = threading.Event()
+    thread_acquisitions = 0
+
+    def thread_worker() -> None:
+        nonlocal thread_acquisitions
+        while not stop.is_set():
+            with lock:
+                thread_acquisitions += 1
+                time.sleep(0.0001)
+            time.sleep(0)
+
+    async def task_worker(latencies: list[float]) -> None:
+        for _ in range(iterations):
+            start = time.perf_counter()
+            async with lock:
+                latencies.append(time.perf_counter() - start)
+                await asyncio.sleep(0)
+
+    async def loop_lag(lags: list[float], done: asyncio.Event) -> None:
+        while not done.is_set():
+            start = time.perf_counter()
+            await asyncio.sleep(0.001)
+            lags.append(time.perf_counter() - start - 0.001)
+
+    async def run() -> tuple[list[float], list[float], float]:
+        latencies: list[float] = []
+        lags: list[float] = []
+        done = asyncio.Event()
+        monitor = asyncio.create_task(loop_lag(lags, done))
+        start = time.perf_counter()
+        await asyncio.gather(*(task_worker(latencies) for _ in range(n_tasks)))
+        elapsed = time.perf_counter() - start
+        done.set()
+        await monitor
+        return latencies, lags, elapsed
+
+    threads = [threading.Thread(target=thread_worker) for _ in range(n_threads)]
+    for thread in threads:
+        thread.start()
+    latencies, lags, elapsed = asyncio.run(run())
+    stop.set()
+    for thread in threads:
+        thread.join()
+
+    return {
+        "name": "mixed",
+        "threads": n_threads,
+        "tasks": n_tasks,
+        "seconds": elapsed,
+        "task_acquisitions_per_second": len(latencies) / elapsed,
+        "thread_acquisitions_per_second": thread_acquisitions / elapsed,
+        "task_acquire_latency": percentiles(latencies, 50, 99, 99.9),
+        "loop_lag": {**percentiles(lags, 50, 99, 99.9), "max": max(lags, default=0.0)},
+    }
+
+
+def main() -> None:
+    args = parse_args(
+        "Measure the hybrid thread/asyncio lock under mixed contention",
+        threads=4,
+        tasks=100,
+        iterations=100,
+        uncontended=1_000_000,
+        locks=10_000,
+    )
+    results = [
+        bench_uncontended(args.uncontended),
+        bench_memory(args.locks),
+        bench_mixed(args.threads, args.tasks, args.iterations),
+    ]
+    emit("lock_contention", results, args.output)
+
+
+if __name__ == "__main__":
+    main()
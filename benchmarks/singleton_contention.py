@@ -0,0 +1,72 @@
+import asyncio
+import time
+from typing import Any
+
+import laima
+from benchmarks.common import emit, parse_args, run_threads
+
+
+class Client:
+    pass
+
+
+def create_client() -> Client:
+    return Client()
+
+
+def bench_threads(provider: laima.Singleton[Client], n_threads: int, iterations: int) -> dict[str, Any]:
+    def target() -> None:
+        for _ in range(iterations):
+            provider.provide()
+
+    elapsed = run_threads(n_threads, target)
+    total = n_threads * iterations
+    return {
+        "name": "threads",
+        "threads": n_threads,
+        "resolutions": total,
+        "seconds": elapsed,
+        "resolutions_per_second": total / elapsed,
+    }
+
+
+async def bench_tasks(provider: laima.Singleton[Client], n_tasks: int, iterations: int) -> dict[str, Any]:
+    async def target() -> None:
+        for _ in range(iterations):
+            await provider.aprovide()
+            await asyncio.sleep(0)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(target() for _ in range(n_tasks)))
+    elapsed = time.perf_counter() - start
+    total = n_tasks * iterations
+    return {
+        "name": "tasks",
+        "tasks": n_tasks,
+        "resolutions": total,
+        "seconds": elapsed,
+        "resolutions_per_second": total / elapsed,
+    }
+
+
+def main() -> None:
+    args = parse_args(
+        "Resolve an initialized singleton from many threads and asyncio tasks at once",
+        threads=32,
+        tasks=1000,
+        iterations=10_000,
+    )
+    provider = laima.singleton(create_client, container=laima.Container())
+    provider()
+
+    results = [
+        bench_threads(provider, 1, args.iterations),
+        bench_threads(provider, args.threads, args.iterations),
+        asyncio.run(bench_tasks(provider, args.tasks, max(args.iterations // 100, 1))),
+    ]
+    provider.reset()
+    emit("singleton_contention", results, args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,201 @@
+import asyncio
+import itertools
+import threading
+import time
+from collections.abc import AsyncIterator, Iterator
+from typing import Any
+
+import laima
+from benchmarks.common import emit, parse_args, percentiles
+
+# Modelled on examples/chatbot: a singleton database with teardown, a scoped session opened from it, transient
+# repositories sharing the session and an endpoint resolving all of them per request
+
+
+class Database:
+    def __init__(self) -> None:
+        self.closed = False
+
+
+class Session:
+    def __init__(self, serial: int, database: Database) -> None:
+        self.serial = serial
+        self.database = database
+        self.closed = False
+
+
+class Client:
+    def __init__(self) -> None:
+        self.closed = False
+
+
+class Repository:
+    def __init__(self, session: Session) -> None:
+        self.session = session
+
+
+class Harness:
+    def __init__(self) -> None:
+        self.container = laima.Container()
+        self.serials = itertools.count()
+        self.claims: dict[int, int] = {}
+        self.violations: list[str] = []
+        self.thread_latencies: list[float] = []
+        self.task_latencies: list[float] = []
+        self.lock = threading.Lock()
+        self.setup()
+
+    def setup(self) -> None:
+        container = self.container
+
+        def get_database() -> Iterator[Database]:
+            database = Database()
+            yield database
+            database.closed = True
+
+        def get_session(database: Database) -> Iterator[Session]:
+            with self.lock:
+                serial = next(self.serials)
+            session = Session(serial, database)
+            yield session
+            session.closed = True
+
+        async def get_client() -> AsyncIterator[Client]:
+            client = Client()
+            yield client
+            await asyncio.sleep(0)
+            client.closed = True
+
+        self.database = laima.singleton(get_database, container=container, bind_to=Database)
+        laima.scoped(get_session, container=container, bind_to=Session)
+        laima.scoped(get_client, container=container, bind_to=Client)
+        laima.transient(Repository, container=container)
+
+        @laima.inject(container=container, reuse_context=False)
+        def nested(session: Session) -> Session:
+            return session
+
+        @laima.inject(container=container)
+        def handle(request: int, repository: Repository, session: Session) -> tuple[Session, Session]:
+            self.claim(request, session)
+            if repository.session is not session:
+                self.violations.append(f"request {request}: repository got a different session")
+            return session, nested()
+
+        @laima.inject(container=container)
+        async def ahandle(
+            request: int,
+            repository: Repository,
+            session: Session,
+            client: Client,
+        ) -> tuple[Session, Client]:
+            self.claim(request, session)
+            await asyncio.sleep(0)
+            if repository.session is not session:
+                self.violations.append(f"request {request}: repository got a different session")
+            return session, client
+
+        self.handle = handle
+        self.ahandle = ahandle
+
+    def claim(self, request: int, session: Session) -> None:
+        owner = self.claims.setdefault(session.serial, request)
+        if owner != request:
+            self.violations.append(f"session {session.serial} leaked from request {owner} to {request}")
+
+    def request(self, request: int) -> None:
+        start = time.perf_counter()
+        session, inner = self.handle(request)
+        elapsed = time.perf_counter() - start
+
+        if inner is session:
+            self.violations.append(f"request {request}: nested scope reused the outer session")
+        if not (session.closed and inner.closed):
+            self.violations.append(f"request {request}: session was not torn down")
+        self.thread_latencies.append(elapsed)
+
+    async def arequest(self, request: int) -> None:
+        start = time.perf_counter()
+        session, client = await self.ahandle(request)
+        elapsed = time.perf_counter() - start
+
+        if not (session.closed and client.closed):
+            self.violations.append(f"request {request}: session was not torn down")
+        self.task_latencies.append(elapsed)
+
+
+def run(harness: Harness, n_threads: int, n_tasks: int, requests: int, reset_interval: float) -> dict[str, Any]:
+    requests_ids = itertools.count()
+    stop = threading.Event()
+    resets = 0
+
+    def thread_worker() -> None:
+        for _ in range(requests):
+            harness.request(next(requests_ids))
+
+    async def task_worker() -> None:
+        for _ in range(requests):
+            await harness.arequest(next(requests_ids))
+
+    def resetter() -> None:
+        nonlocal resets
+        while not stop.wait(reset_interval):
+            harness.database.reset()
+            resets += 1
+
+    threads = [threading.Thread(target=thread_worker) for _ in range(n_threads)]
+    reset_thread = threading.Thread(target=resetter)
+
+    async def tasks() -> None:
+        await asyncio.gather(*(task_worker() for _ in range(n_tasks)))
+
+    start = time.perf_counter()
+    reset_thread.start()
+    for thread in threads:
+        thread.start()
+    asyncio.run(tasks())
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    stop.set()
+    reset_thread.join()
+
+    total = (n_threads + n_tasks) * requests
+    return {
+        "name": "mixed",
+        "threads": n_threads,
+        "tasks": n_tasks,
+        "requests": total,
+        "resets": resets,
+        "seconds": elapsed,
+        "requests_per_second": total / elapsed,
+        "violations": len(harness.violations),
+        # Task latencies include waiting for the event loop, which all tasks share
+        "thread_latency_us": _micro(percentiles(harness.thread_latencies, 50, 99, 99.9)),
+        "task_latency_us": _micro(percentiles(harness.task_latencies, 50, 99, 99.9)),
+    }
+
+
+def _micro(values: dict[str, float]) -> dict[str, float]:
+    return {key: value * 1e6 for key, value in values.items()}
+
+
+def main() -> None:
+    args = parse_args(
+        "Resolve scoped and singleton dependencies from many threads and asyncio tasks at once",
+        threads=64,
+        tasks=10_000,
+        requests=20,
+        reset_interval_ms=50,
+    )
+    harness = Harness()
+    result = run(harness, args.threads, args.tasks, args.requests, args.reset_interval_ms / 1000)
+    harness.container.reset()
+    emit("stress", [result], args.output)
+
+    if harness.violations:
+        raise SystemExit("\n".join(harness.violations[:20]))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+import os
+from collections.abc import Callable
+from typing import Any
+
+import laima
+from benchmarks.common import emit, parse_args, run_threads
+
+
+class Client:
+    pass
+
+
+def create_client() -> Client:
+    return Client()
+
+
+def thread_counts(max_threads: int) -> list[int]:
+    counts = [1]
+    while counts[-1] * 2 <= max_threads:
+        counts.append(counts[-1] * 2)
+    if counts[-1] != max_threads:
+        counts.append(max_threads)
+    return counts
+
+
+def workloads(container: laima.Container) -> dict[str, Callable[[int], None]]:
+    singleton = laima.singleton(create_client, container=container, bind_to="singleton")
+    scoped = laima.scoped(create_client, container=container, bind_to="scoped")
+    transient = laima.transient(create_client, container=container, bind_to="transient")
+    singleton()
+
+    def resolve_singleton(iterations: int) -> None:
+        for _ in range(iterations):
+            singleton()
+
+    # Every thread works in its own context, so only the provider itself is shared
+    def resolve_scoped(iterations: int) -> None:
+        with laima.inject(container=container):
+            for _ in range(iterations):
+                scoped()
+
+    def resolve_transient(iterations: int) -> None:
+        for _ in range(iterations):
+            transient()
+
+    return {"singleton": resolve_singleton, "scoped": resolve_scoped, "transient": resolve_transient}
+
+
+def bench(name: str, workload: Callable[[int], None], counts: list[int], iterations: int) -> list[dict[str, Any]]:
+    results = []
+    single = 0.0
+    for n_threads in counts:
+        elapsed = run_threads(n_threads, lambda: workload(iterations))
+        throughput = n_threads * iterations / elapsed
+        single = single or throughput
+        results.append(
+            {
+                "name": name,
+                "threads": n_threads,
+                "resolutions_per_second": throughput,
+                "speedup": throughput / single,
+                # 1.0 is linear scaling; with the GIL enabled it drops as 1 / threads
+                "efficiency": throughput / single / n_threads,
+            },
+        )
+    return results
+
+
+def main() -> None:
+    args = parse_args(
+        "Measure how resolution throughput scales with the number of threads",
+        max_threads=os.cpu_count() or 1,
+        iterations=100_000,
+    )
+    container = laima.Container()
+    counts = thread_counts(args.max_threads)
+
+    results = []
+    for name, workload in workloads(container).items():
+        results.extend(bench(name, workload, counts, args.iterations))
+    container.reset()
+    emit("thread_scaling", results, args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+import gc
+import resource
+import time
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Any
+
+import laima
+from benchmarks.common import emit, parse_args
+
+
+class Payload:
+    def __init__(self) -> None:
+        self.buffer = bytearray(256)
+
+
+def create_payload() -> Payload:
+    return Payload()
+
+
+def create_managed_payload() -> Iterator[Payload]:
+    yield Payload()
+
+
+def rss_kib() -> int:
+    # Current resident set size; ru_maxrss only ever grows, so read statm where available
+    try:
+        statm = Path("/proc/self/statm").read_text()
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return int(statm.split()[1]) * resource.getpagesize() // 1024
+
+
+def bench_resolutions(name: str, provider: laima.Transient[Any], iterations: int, samples: int) -> dict[str, Any]:
+    gc.collect()
+    rss = [rss_kib()]
+    step = max(iterations // samples, 1)
+
+    start = time.perf_counter()
+    with laima.inject(container=laima.Container()):
+        for i in range(1, iterations + 1):
+            provider.provide()
+            if i % step == 0:
+                rss.append(rss_kib())
+    elapsed = time.perf_counter() - start
+
+    return {
+        "name": name,
+        "resolutions": iterations,
+        "seconds": elapsed,
+        "rss_kib": rss,
+        "rss_growth_kib": rss[-1] - rss[0],
+    }
+
+
+def main() -> None:
+    args = parse_args(
+        "Measure resident memory while resolving transients inside a single long-lived context",
+        iterations=1_000_000,
+        managed_iterations=100_000,
+        samples=10,
+    )
+    results = [
+        bench_resolutions("plain", laima.Transient(create_payload), args.iterations, args.samples),
+        # Generator-backed transients have a teardown and are kept until the context closes
+        bench_resolutions("generator", laima.Transient(create_managed_payload), args.managed_iterations, args.samples),
+    ]
+    emit("transient_memory", results, args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -5,6 +5,7 @@ import laima
 
 if __name__ == "__main__":
     setup(repository="postgres")  # Options: in_memory, postgres
+    laima.warmup_container()
 
     print(chat_endpoint("1234", "Hello world!"))
     print()
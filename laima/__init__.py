@@ -1,32 +1,67 @@
-from laima.container import Container, areset_container, bind, get, reset_container, unbind, unbind_all
+from laima.container import (
+    Container,
+    areset_container,
+    awarmup_container,
+    bind,
+    freeze_container,
+    get,
+    reset_container,
+    unbind,
+    unbind_all,
+    warmup_container,
+)
 from laima.context import inject
+from laima.providers.keyed import Keyed, keyed
+from laima.providers.loop_singleton import LoopSingleton, loop_singleton
+from laima.providers.pooled import Pooled, pooled
 from laima.providers.provider import Provider
+from laima.providers.refreshing import Refreshing, refreshing
 from laima.providers.scoped import Scoped, scoped
 from laima.providers.singleton import Singleton, singleton
+from laima.providers.thread_singleton import ThreadSingleton, thread_singleton
 from laima.providers.transient import Transient, transient
 from laima.utils.discover import discover
+from laima.utils.executor import ContextExecutor, bootstrap, submit
+from laima.utils.lazy import Lazy
 
 __version__ = "0.1.0"
 
 __all__ = [
     "Container",
+    "ContextExecutor",
+    "Keyed",
+    "Lazy",
+    "LoopSingleton",
+    "Pooled",
     "Provider",
+    "Refreshing",
     "Scoped",
     "Singleton",
+    "ThreadSingleton",
     "Transient",
     "__version__",
     "areset_container",
+    "awarmup_container",
     "bind",
+    "bootstrap",
     "context",
     "discover",
     "exc",
+    "freeze_container",
     "get",
     "inject",
+    "keyed",
+    "loop_singleton",
+    "pooled",
+    "refreshing",
     "reset_container",
     "scoped",
     "singleton",
+    "submit",
+    "thread_singleton",
     "transient",
     "unbind",
     "unbind_all",
     "utils",
+    "warmup_container",
 ]
@@ -1,24 +1,133 @@
 import asyncio
+import threading
+import time
+import warnings
+from collections.abc import Callable, Mapping
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
+from contextvars import copy_context
+from dataclasses import dataclass
+from types import MappingProxyType
 from typing import Any, TypeVar, overload
 
 from laima.exc import LaimaError
 from laima.providers.provider import Provider
+from laima.utils import fork
+from laima.utils.graph import topological_levels
 from laima.utils.lock import Lock
+from laima.utils.metrics import ProviderMetrics, to_prometheus
+from laima.utils.offload import OFFLOAD_TEARDOWN
+from laima.utils.trace import Trace, Tracer
 
 T = TypeVar("T")
 
 
+@dataclass(frozen=True)
+class TeardownReport:
+    provider: Provider
+    duration: float
+    timed_out: bool = False
+    error: BaseException | None = None
+
+
 class Container:
     def __init__(self) -> None:
         self._lock = Lock()
+        # Copy-on-write snapshot; it is never mutated after being published so reads need no lock
         self._registry: dict[type | str, Provider] = {}
+        self._version = 0
+        self._frozen = False
+        self._ready: Future[None] = Future()
+        self._metrics: dict[Provider, ProviderMetrics] | None = None
+        self._tracer: Tracer | None = None
+        fork.register(self)
 
     def __str__(self) -> str:
         return f"{self.__class__.__qualname__}({self._registry})"
 
     @property
-    def registry(self) -> dict[type | str, Provider]:
-        return self._registry.copy()
+    def registry(self) -> Mapping[type | str, Provider]:
+        return MappingProxyType(self._registry)
+
+    @property
+    def version(self) -> int:
+        return self._version
+
+    @property
+    def frozen(self) -> bool:
+        return self._frozen
+
+    @property
+    def ready(self) -> Future[None]:
+        return self._ready
+
+    def after_fork(self) -> None:
+        self._lock = Lock()
+
+    @property
+    def metrics_enabled(self) -> bool:
+        return self._metrics is not None
+
+    @property
+    def tracer(self) -> Tracer | None:
+        return self._tracer
+
+    def enable_metrics(self) -> None:
+        with self._lock:
+            if self._metrics is None:
+                self._metrics = {}
+                self._instrument_all()
+
+    def disable_metrics(self) -> None:
+        with self._lock:
+            for provider, metrics in (self._metrics or {}).items():
+                provider.uninstrument(metrics)
+            self._metrics = None
+
+    def stats(self) -> dict[str, dict[str, Any]]:
+        return {metrics.name: metrics.to_dict() for metrics in (self._metrics or {}).values()}
+
+    def export_prometheus(self, *, prefix: str = "laima") -> str:
+        return to_prometheus(list((self._metrics or {}).values()), prefix=prefix)
+
+    def enable_tracing(
+        self,
+        *,
+        sample_rate: float = 1.0,
+        on_trace: Callable[[Trace], None] | None = None,
+        max_traces: int = 100,
+    ) -> Tracer:
+        with self._lock:
+            if self._tracer is None:
+                self._tracer = Tracer(sample_rate=sample_rate, on_trace=on_trace, max_traces=max_traces)
+                self._instrument_all()
+            return self._tracer
+
+    def disable_tracing(self) -> None:
+        with self._lock:
+            if self._tracer is not None:
+                self._tracer.detach()
+            self._tracer = None
+
+    def _instrument_all(self) -> None:
+        for key, provider in self._registry.items():
+            self._instrument(key, provider)
+
+    def _instrument(self, key: type | str, provider: Provider) -> None:
+        name = key if isinstance(key, str) else f"{key.__module__}:{key.__qualname__}"
+        if self._metrics is not None and provider not in self._metrics:
+            metrics = ProviderMetrics(name)
+            provider.instrument(metrics)
+            self._metrics[provider] = metrics
+        if self._tracer is not None:
+            self._tracer.attach(name, provider)
+
+    # Bindings stay read-only for good, so injection plans built afterwards are final and skip the registry version
+    # check on every call; instrumentation and teardown are unaffected
+    def freeze(self) -> None:
+        with self._lock:
+            self._frozen = True
+            # Plans built before are rebuilt once, this time as final ones
+            self._publish(self._registry)
 
     @overload
     def get(self, obj: type | str) -> Provider:
@@ -44,30 +153,167 @@ class Container:
         override: bool = False,
     ) -> None:
         with self._lock:
+            self._check_frozen()
             if not override and to in self._registry:
                 raise LaimaError(f"Cannot bind to '{to}' because it already bound")
 
-            if isinstance(obj, Provider):
-                self._registry[to] = obj
-            else:
-                self._registry[to] = self.get(obj)
+            provider = obj if isinstance(obj, Provider) else self.get(obj)
+            self._instrument(to, provider)
+            self._publish({**self._registry, to: provider})
 
     def unbind(self, obj: type | str) -> None:
         with self._lock:
-            self._registry.pop(obj, None)
+            self._check_frozen()
+            registry = self._registry.copy()
+            registry.pop(obj, None)
+            self._publish(registry)
 
     def unbind_all(self) -> None:
         with self._lock:
-            self._registry.clear()
+            self._check_frozen()
+            self._publish({})
+
+    def _check_frozen(self) -> None:
+        if self._frozen:
+            raise LaimaError(f"{self.__class__.__qualname__} is frozen and its bindings cannot be changed")
+
+    def _publish(self, registry: dict[type | str, Provider]) -> None:
+        # The registry has to be swapped before the version is bumped, see `InjectionPlan.build`
+        self._registry = registry
+        self._version += 1
+
+    def warmup(self, *, max_workers: int | None = None) -> None:
+        ready = self._prepare_ready()
+        try:
+            levels = topological_levels(self._registry.values())
+            with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="laima-warmup") as executor:
+                for level in levels:
+                    futures = [
+                        executor.submit(copy_context().run, provider.warmup)
+                        for provider in level
+                        if not provider.is_async
+                    ]
+                    for future in futures:
+                        future.result()
+        except BaseException as exc:
+            ready.set_exception(exc)
+            raise
+
+        # Asynchronous providers need an event loop, so the container only becomes ready with `awarmup`
+        if skipped := sum(provider.is_async for provider in self._registry.values()):
+            warnings.warn(f"{skipped} asynchronous provider(s) were not warmed up; use `awarmup`", stacklevel=2)
+            return
+        ready.set_result(None)
 
-    def reset(self) -> None:
+    async def awarmup(self, *, executor: Executor | None = None) -> None:
+        ready = self._prepare_ready()
+        try:
+            loop = asyncio.get_running_loop()
+            for level in topological_levels(self._registry.values()):
+                await asyncio.gather(
+                    *(
+                        provider.awarmup()
+                        if provider.is_async
+                        else loop.run_in_executor(executor, copy_context().run, provider.warmup)
+                        for provider in level
+                    ),
+                )
+        except BaseException as exc:
+            ready.set_exception(exc)
+            raise
+
+        ready.set_result(None)
+
+    def _prepare_ready(self) -> Future[None]:
+        if self._ready.done():
+            self._ready = Future()
+        return self._ready
+
+    def reset(self, *, provider_timeout: float | None = None) -> list[TeardownReport]:
+        reports: list[TeardownReport] = []
+        owns_loop = _owns_loop()
         with self._lock:
-            for provider in self._registry.values():
-                provider.reset()
+            self._prepare_ready()
+            # Dependents are torn down before their dependencies; providers within a level run in parallel
+            for level in reversed(topological_levels(self._registry.values())):
+                # Teardown threads would wait on the caller's event loop, which is blocked by this call; on its own
+                # thread loop-bound providers leave such instances to `areset` instead
+                inline = [provider for provider in level if owns_loop and provider.loop_bound]
+                spawned = [provider for provider in level if provider not in inline]
+                if len(spawned) == 1 and provider_timeout is None:
+                    inline, spawned = level, []
 
-    async def areset(self) -> None:
+                futures = [(provider, _spawn_teardown(provider)) for provider in spawned]
+                reports.extend(_teardown(provider) for provider in inline)
+                for provider, future in futures:
+                    try:
+                        reports.append(future.result(timeout=provider_timeout))
+                    except TimeoutError:
+                        reports.append(_timeout_report(provider, provider_timeout))
+
+        return reports
+
+    async def areset(self, *, provider_timeout: float | None = None) -> list[TeardownReport]:
+        reports = []
         async with self._lock:
-            await asyncio.gather(*(provider.areset() for provider in self._registry.values()))
+            self._prepare_ready()
+            for level in reversed(topological_levels(self._registry.values())):
+                reports.extend(await asyncio.gather(*(_ateardown(provider, provider_timeout) for provider in level)))
+
+        return reports
+
+
+def _owns_loop() -> bool:
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return False
+    return True
+
+
+def _teardown(provider: Provider) -> TeardownReport:
+    start = time.perf_counter()
+    try:
+        provider.reset()
+    except Exception as exc:
+        warnings.warn(f"{provider} reset with error: {exc}", stacklevel=2)
+        return TeardownReport(provider=provider, duration=time.perf_counter() - start, error=exc)
+    return TeardownReport(provider=provider, duration=time.perf_counter() - start)
+
+
+def _spawn_teardown(provider: Provider) -> Future[TeardownReport]:
+    future: Future[TeardownReport] = Future()
+
+    def run() -> None:
+        # Whatever escapes the teardown has to reach the waiting caller, which would otherwise wait forever
+        try:
+            future.set_result(_teardown(provider))
+        except BaseException as exc:
+            future.set_exception(exc)
+
+    # Daemon threads, so that a hanging teardown cannot block the interpreter from exiting
+    thread = threading.Thread(target=copy_context().run, args=(run,), name="laima-reset", daemon=True)
+    thread.start()
+    return future
+
+
+async def _ateardown(provider: Provider, provider_timeout: float | None) -> TeardownReport:
+    # Each teardown runs as its own task, so the flag stays within it
+    OFFLOAD_TEARDOWN.set(True)
+    start = time.perf_counter()
+    try:
+        await asyncio.wait_for(provider.areset(), timeout=provider_timeout)
+    except TimeoutError:
+        return _timeout_report(provider, provider_timeout)
+    except Exception as exc:
+        warnings.warn(f"{provider} reset with error: {exc}", stacklevel=2)
+        return TeardownReport(provider=provider, duration=time.perf_counter() - start, error=exc)
+    return TeardownReport(provider=provider, duration=time.perf_counter() - start)
+
+
+def _timeout_report(provider: Provider, timeout: float | None) -> TeardownReport:
+    warnings.warn(f"{provider} reset timed out after {timeout} seconds", stacklevel=2)
+    return TeardownReport(provider=provider, duration=timeout or 0.0, timed_out=True)
 
 
 LAIMA_MAIN_CONTAINER = Container()
@@ -76,5 +322,8 @@ get = LAIMA_MAIN_CONTAINER.get
 bind = LAIMA_MAIN_CONTAINER.bind
 unbind = LAIMA_MAIN_CONTAINER.unbind
 unbind_all = LAIMA_MAIN_CONTAINER.unbind_all
+freeze_container = LAIMA_MAIN_CONTAINER.freeze
 reset_container = LAIMA_MAIN_CONTAINER.reset
 areset_container = LAIMA_MAIN_CONTAINER.areset
+warmup_container = LAIMA_MAIN_CONTAINER.warmup
+awarmup_container = LAIMA_MAIN_CONTAINER.awarmup
@@ -2,27 +2,45 @@ import asyncio
 import functools
 import inspect
 from collections.abc import Awaitable, Callable
-from contextvars import ContextVar, Token
 from types import TracebackType
-from typing import Annotated, Any, ParamSpec, TypeVar, get_args, get_origin, overload
+from typing import TYPE_CHECKING, Any, ParamSpec, TypeVar, overload
 
 from laima.container import LAIMA_MAIN_CONTAINER, Container
-from laima.exc import LaimaError, LaimaTypeError
+from laima.exc import LaimaError
 from laima.providers.provider import Provider
-from laima.utils.context import Context
+from laima.utils.compiler import compile_wrapper
+from laima.utils.context import CONTEXT, Context
+from laima.utils.plan import InjectionPlan
+from laima.utils.structured import SCOPE, TaskTracker, track
+from laima.utils.trace import TRACE, Span, Tracer
+
+if TYPE_CHECKING:
+    from contextvars import Token
 
 T = TypeVar("T")
 P = ParamSpec("P")
 
-CONTEXT: ContextVar[Context | None] = ContextVar("CONTEXT", default=None)
-
-
 class ContextManager:
-    def __init__(self, container: Container, *, reuse_context: bool = True) -> None:
+    def __init__(
+        self,
+        container: Container,
+        *,
+        reuse_context: bool = True,
+        compile: bool = False,
+        lazy: bool = False,
+        structured: bool = False,
+        name: str = "inject",
+    ) -> None:
         self._container = container
         self._reuse_context = reuse_context
+        self._compile = compile
+        self._lazy = lazy
+        self._structured = structured
+        self._name = name
         self._ctx: Context | None = None
         self._token: Token | None = None
+        self._trace: tuple[Tracer, Span, Token] | None = None
+        self._scope: tuple[TaskTracker, object, Token] | None = None
 
     @overload
     def __call__(self, func: Callable[P, Awaitable[T]]) -> Callable[..., Awaitable[T]]:
@@ -40,99 +58,97 @@ class ContextManager:
             raise LaimaError("Decorator `@laima.inject` cannot be used on Provider")
 
         signature = inspect.signature(func)
-
-        def prepare_arguments(
-            *args: Any,
-            **kwargs: Any,
-        ) -> tuple[inspect.BoundArguments, dict[str, Provider]]:
-            bound_params = signature.bind_partial(*args, **kwargs)
-            providers = {}
-            for param in signature.parameters.values():
-                if param.name in bound_params.arguments or param.default is not param.empty:
-                    continue
-                if provider := self._container.get(param.annotation, default=None):
-                    providers[param.name] = provider
-                elif get_origin(param.annotation) is Annotated:
-                    annot_args = get_args(param.annotation)
-                    if len(annot_args) == 2:
-                        _, annot_meta = annot_args
-                        if (
-                            (callable(annot_meta) or isinstance(annot_meta, (str, Provider)))
-                            and (provider := self._container.get(annot_meta, default=None))
-                        ):
-                            providers[param.name] = provider
-
-                if param.name not in providers:
-                    raise LaimaTypeError(f"{func.__qualname__} missing a required argument: '{param.name}'")
-
-            return bound_params, providers
+        name = func.__qualname__
+        plan: InjectionPlan | None = None
+
+        def get_plan() -> InjectionPlan:
+            nonlocal plan
+            if plan is not None and plan.final:
+                return plan
+            if plan is None or plan.version != self._container.version:
+                plan = InjectionPlan.build(func, signature, self._container, lazy=self._lazy)
+            return plan
+
+        if self._compile:
+            context_manager = functools.partial(
+                ContextManager,
+                container=self._container,
+                reuse_context=self._reuse_context,
+                structured=self._structured,
+                name=func.__qualname__,
+            )
+            compiled = functools.wraps(func)(compile_wrapper(func, signature, get_plan, context_manager))
+            compiled.__laima_inject__ = True  # type: ignore[attr-defined]
+            compiled.__laima_plan__ = get_plan  # type: ignore[attr-defined]
+            return compiled
 
         @functools.wraps(func)
         def sync_function(*args: Any, **kwargs: Any) -> Any:
-            bound_params, providers = prepare_arguments(*args, **kwargs)
-
-            with ContextManager(container=self._container, reuse_context=self._reuse_context):
-                for name, provider in providers.items():
-                    bound_params.arguments[name] = provider.provide()
+            current_plan = get_plan()
+            missing = current_plan.missing(args, kwargs)
 
-                signature.bind(*bound_params.args, **bound_params.kwargs)
-                return func(*bound_params.args, **bound_params.kwargs)
+            with self._new(name):
+                values = [provider.provide() for _, provider in missing]
+                args, kwargs = current_plan.apply(args, kwargs, missing, values)
+                return func(*args, **kwargs)
 
         @functools.wraps(func)
         async def async_function(*args: Any, **kwargs: Any) -> Any:
-            bound_params, providers = prepare_arguments(*args, **kwargs)
-
-            async with ContextManager(container=self._container, reuse_context=self._reuse_context):
-                values = await asyncio.gather(*(provider.aprovide() for provider in providers.values()))
-                for name, value in zip(providers, values, strict=True):
-                    bound_params.arguments[name] = value
+            current_plan = get_plan()
+            missing = current_plan.missing(args, kwargs)
 
-                signature.bind(*bound_params.args, **bound_params.kwargs)
-                return await func(*bound_params.args, **bound_params.kwargs)
+            async with self._new(name):
+                values = await asyncio.gather(*(provider.aprovide() for _, provider in missing))
+                args, kwargs = current_plan.apply(args, kwargs, missing, values)
+                return await func(*args, **kwargs)
 
         @functools.wraps(func)
         def sync_generator(*args: Any, **kwargs: Any) -> Any:
-            bound_params, providers = prepare_arguments(*args, **kwargs)
+            current_plan = get_plan()
+            missing = current_plan.missing(args, kwargs)
 
-            with ContextManager(container=self._container, reuse_context=self._reuse_context):
-                for name, provider in providers.items():
-                    bound_params.arguments[name] = provider.provide()
-
-                signature.bind(*bound_params.args, **bound_params.kwargs)
-                yield from func(*bound_params.args, **bound_params.kwargs)
+            with self._new(name):
+                values = [provider.provide() for _, provider in missing]
+                args, kwargs = current_plan.apply(args, kwargs, missing, values)
+                yield from func(*args, **kwargs)
 
         @functools.wraps(func)
         async def async_generator(*args: Any, **kwargs: Any) -> Any:
-            bound_params, providers = prepare_arguments(*args, **kwargs)
-
-            async with ContextManager(container=self._container, reuse_context=self._reuse_context):
-                values = await asyncio.gather(*(provider.aprovide() for provider in providers.values()))
-                for name, value in zip(providers, values, strict=True):
-                    bound_params.arguments[name] = value
+            current_plan = get_plan()
+            missing = current_plan.missing(args, kwargs)
 
-                signature.bind(*bound_params.args, **bound_params.kwargs)
-                async for result in func(*bound_params.args, **bound_params.kwargs):
+            async with self._new(name):
+                values = await asyncio.gather(*(provider.aprovide() for _, provider in missing))
+                args, kwargs = current_plan.apply(args, kwargs, missing, values)
+                async for result in func(*args, **kwargs):
                     yield result
 
         if inspect.iscoroutinefunction(func):
-            async_function.__laima_inject__ = True  # type: ignore[attr-defined]
-            return async_function
-
-        if inspect.isasyncgenfunction(func):
-            async_generator.__laima_inject__ = True  # type: ignore[attr-defined]
-            return async_generator
-
-        if inspect.isgeneratorfunction(func):
-            sync_generator.__laima_inject__ = True  # type: ignore[attr-defined]
-            return sync_generator
-
-        sync_function.__laima_inject__ = True  # type: ignore[attr-defined]
-        return sync_function
+            wrapper: Any = async_function
+        elif inspect.isasyncgenfunction(func):
+            wrapper = async_generator
+        elif inspect.isgeneratorfunction(func):
+            wrapper = sync_generator
+        else:
+            wrapper = sync_function
+
+        wrapper.__laima_inject__ = True
+        wrapper.__laima_plan__ = get_plan
+        return wrapper
+
+    def _new(self, name: str) -> "ContextManager":
+        return ContextManager(
+            container=self._container,
+            reuse_context=self._reuse_context,
+            structured=self._structured,
+            name=name,
+        )
 
     def __enter__(self) -> None:
         if not (self._reuse_context and CONTEXT.get()):
             self._ctx = Context()
             self._token = CONTEXT.set(self._ctx)
+        self._start_trace()
 
     def __exit__(
         self,
@@ -144,11 +160,18 @@ class ContextManager:
             self._ctx.close()
         if self._token:
             CONTEXT.reset(self._token)
+        self._finish_trace()
 
     async def __aenter__(self) -> None:
         if not (self._reuse_context and CONTEXT.get()):
             self._ctx = Context()
             self._token = CONTEXT.set(self._ctx)
+        # Threads have no tasks to track, so structured scopes only apply to async blocks; a block reusing its
+        # caller's context still waits for the tasks it created itself before returning
+        if self._structured:
+            tracker, scope = track()
+            self._scope = (tracker, scope, SCOPE.set(scope))
+        self._start_trace()
 
     async def __aexit__(
         self,
@@ -156,10 +179,33 @@ class ContextManager:
         exc_val: BaseException | None,
         exc_tb: TracebackType | None,
     ) -> None:
-        if self._ctx:
-            await self._ctx.aclose()
+        try:
+            if self._scope is not None:
+                tracker, scope, scope_token = self._scope
+                try:
+                    await tracker.wait(scope)
+                finally:
+                    SCOPE.reset(scope_token)
+        finally:
+            if self._ctx:
+                await self._ctx.aclose()
         if self._token:
             CONTEXT.reset(self._token)
+        self._finish_trace()
+
+    # Only calls opening a new context are sampled, injections reusing it are recorded as part of their trace
+    def _start_trace(self) -> None:
+        tracer = self._container.tracer
+        if tracer is None or self._ctx is None or TRACE.get() is not None:
+            return
+        if (span := tracer.start(self._name)) is not None:
+            self._trace = (tracer, span, TRACE.set(span))
+
+    def _finish_trace(self) -> None:
+        if self._trace is not None:
+            tracer, span, token = self._trace
+            TRACE.reset(token)
+            tracer.finish(span)
 
 
 @overload
@@ -168,7 +214,14 @@ def inject(func: Callable[P, T]) -> Callable[..., T]:
 
 
 @overload
-def inject(*, container: Container | None = None, reuse_context: bool = True) -> ContextManager:
+def inject(
+    *,
+    container: Container | None = None,
+    reuse_context: bool = True,
+    compile: bool = False,
+    lazy: bool = False,
+    structured: bool = False,
+) -> ContextManager:
     pass
 
 
@@ -177,10 +230,16 @@ def inject(
     *,
     container: Container | None = None,
     reuse_context: bool = True,
+    compile: bool = False,
+    lazy: bool = False,
+    structured: bool = False,
 ) -> Any:
     context_manager = ContextManager(
         reuse_context=reuse_context,
         container=container or LAIMA_MAIN_CONTAINER,
+        compile=compile,
+        lazy=lazy,
+        structured=structured,
     )
 
     if func is None:
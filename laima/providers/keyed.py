@@ -0,0 +1,453 @@
+import asyncio
+import math
+import threading
+import time
+import warnings
+from collections import OrderedDict
+from collections.abc import AsyncIterator, Awaitable, Callable, Hashable, Iterator
+from concurrent.futures import Future
+from functools import partial
+from typing import Any, ClassVar, TypeVar, overload
+
+from laima.container import Container
+from laima.context import CONTEXT
+from laima.exc import LaimaAsyncError, LaimaError
+from laima.providers.provider import Provider
+from laima.utils.context import Context
+from laima.utils.empty import EMPTY
+from laima.utils.fork import abandon
+from laima.utils.futures import wait_shared
+from laima.utils.keyed import KeyedData, KeyedStats, make_key
+from laima.utils.object import Object
+from laima.utils.offload import Offload
+from laima.utils.refresh import Generation
+from laima.utils.status import Status
+from laima.utils.wrappers import provider_wrapper
+
+T = TypeVar("T")
+TypeT = TypeVar("TypeT", bound=type)
+
+
+class Keyed(Provider[T]):
+    accepts_arguments: ClassVar[bool] = True
+
+    def __init__(
+        self,
+        func: Callable[..., T],
+        *,
+        max_size: int = 128,
+        ttl: float | None = None,
+        offload: Offload = False,
+    ) -> None:
+        if max_size < 1 or (ttl is not None and ttl <= 0):
+            raise LaimaError(f"Invalid keyed cache settings: max_size={max_size}, ttl={ttl}")
+
+        super().__init__(
+            func=func,
+            offload=offload,
+        )
+        self._options.update(max_size=max_size, ttl=ttl)
+        self._max_size = max_size
+        self._ttl = ttl
+        # Least recently used first; a pending future coalesces concurrent creation of the same key
+        self._entries: OrderedDict[Hashable, Future[Generation[T]]] = OrderedDict()
+        self._mutex = threading.Lock()
+        self._tasks: set[asyncio.Task[None]] = set()
+        # The event loop each asynchronous creation runs on, which a synchronous caller must not block
+        self._loops: dict[Future[Generation[T]], asyncio.AbstractEventLoop] = {}
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+
+    @property
+    def stats(self) -> KeyedStats:
+        with self._mutex:
+            return KeyedStats(
+                max_size=self._max_size,
+                size=len(self._entries),
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                expirations=self._expirations,
+            )
+
+    def __call__(self, *args: Any, **kwargs: Any) -> T:
+        if self._is_async:
+            coroutine = self.aprovide(*args, **kwargs)
+            coroutine.__qualname__ = self._func.__qualname__
+            return coroutine  # type: ignore[return-value]
+
+        return self.provide(*args, **kwargs)
+
+    def provide(self, *args: Any, **kwargs: Any) -> T:
+        key = make_key(args, kwargs)
+        ctx = CONTEXT.get()
+        if ctx is not None and (data := ctx.get(self)) is not None and key in data.generations:
+            return data.generations[key].obj.get()  # type: ignore[no-any-return]
+
+        while True:
+            pending, created, retired = self._lookup(key)
+            _close_retired(retired)
+            if created:
+                self._settle(key, pending, partial(self._build, args, kwargs))
+            elif self._blocks_loop(pending):
+                raise LaimaError(f"{self} creation of {key} is in progress on this event loop; use `aprovide()`")
+            generation = pending.result()
+
+            if ctx is None:
+                # Untracked callers may find the instance evicted and closed right after reading it
+                instance = generation.obj.instance
+                if instance is not EMPTY:
+                    return instance  # type: ignore[return-value]
+                continue
+            if generation.acquire():
+                break
+
+        return self._pin(ctx, key, generation)
+
+    async def aprovide(self, *args: Any, **kwargs: Any) -> T:
+        key = make_key(args, kwargs)
+        ctx = CONTEXT.get()
+        if ctx is not None and (data := ctx.get(self)) is not None and key in data.generations:
+            return data.generations[key].obj.get()  # type: ignore[no-any-return]
+
+        while True:
+            pending, created, retired = self._lookup(key)
+            for old in retired:
+                await old.aclose()
+            if created:
+                # Creation runs as its own task so that a cancelled caller does not abort it for the others
+                loop = asyncio.get_running_loop()
+                task = loop.create_task(self._asettle(key, pending, args, kwargs))
+                self._loops[pending] = loop
+                self._tasks.add(task)
+                task.add_done_callback(self._tasks.discard)
+            generation = await wait_shared(pending)
+
+            if ctx is None:
+                instance = generation.obj.instance
+                if instance is not EMPTY:
+                    return instance  # type: ignore[return-value]
+                continue
+            if generation.acquire():
+                break
+
+        return self._pin(ctx, key, generation)
+
+    def after_fork(self) -> None:
+        super().after_fork()
+        abandon(self._entries)
+        self._entries = OrderedDict()
+        self._mutex = threading.Lock()
+        self._tasks = set()
+        self._loops = {}
+
+    def reset(self) -> None:
+        _close_retired(self._take_all())
+        self._status = Status.IDLE
+
+    async def areset(self) -> None:
+        for old in self._take_all():
+            await old.aclose()
+        self._status = Status.IDLE
+
+    def _lookup(self, key: Hashable) -> tuple[Future[Generation[T]], bool, list[Generation[T]]]:
+        retired = []
+        with self._mutex:
+            pending = self._entries.get(key)
+            if pending is not None and self._is_expired(pending):
+                del self._entries[key]
+                retired.append(pending.result())
+                self._expirations += 1
+                pending = None
+
+            if pending is not None:
+                self._entries.move_to_end(key)
+                self._hits += 1
+                return pending, False, self._retire(retired)
+
+            pending = Future()
+            self._entries[key] = pending
+            self._misses += 1
+            retired.extend(self._evict())
+            return pending, True, self._retire(retired)
+
+    def _is_expired(self, pending: Future[Generation[T]]) -> bool:
+        if not pending.done() or pending.exception() is not None:
+            return False
+        return time.monotonic() >= pending.result().expires_at
+
+    def _evict(self) -> list[Generation[T]]:
+        evicted = []
+        overflow = len(self._entries) - self._max_size
+        # Instances still being created cannot be evicted, so the cache may briefly exceed `max_size`
+        for key, pending in list(self._entries.items()):
+            if overflow <= 0:
+                break
+            if pending.done():
+                del self._entries[key]
+                evicted.append(pending.result())
+                self._evictions += 1
+                overflow -= 1
+        return evicted
+
+    @staticmethod
+    def _retire(generations: list[Generation[T]]) -> list[Generation[T]]:
+        # Instances pinned by open contexts are closed by the last of them instead
+        return [generation for generation in generations if generation.retire()]
+
+    def _settle(self, key: Hashable, pending: Future[Generation[T]], build: Callable[[], Generation[T]]) -> None:
+        try:
+            generation = build()
+        except BaseException as exc:
+            self._fail(key, pending, exc)
+            raise
+        self._mark(Status.RUNNING)
+        pending.set_result(generation)
+        if self._is_taken(key, pending):
+            _close_retired(self._retire([generation]))
+
+    async def _asettle(
+        self,
+        key: Hashable,
+        pending: Future[Generation[T]],
+        args: tuple[Any, ...],
+        kwargs: dict[str, Any],
+    ) -> None:
+        try:
+            generation = await self._abuild(args, kwargs)
+        except asyncio.CancelledError:
+            self._fail(key, pending, LaimaError(f"{self} creation of {key} was cancelled"))
+            raise
+        except BaseException as exc:
+            self._fail(key, pending, exc)
+        else:
+            self._mark(Status.RUNNING)
+            pending.set_result(generation)
+            if self._is_taken(key, pending) and generation.retire():
+                await generation.aclose()
+        finally:
+            self._loops.pop(pending, None)
+
+    # A reset swaps out entries still being created, so their creator retires the result instead; `retire` only
+    # hands the generation out for closing once if the reset did get to it
+    def _is_taken(self, key: Hashable, pending: Future[Generation[T]]) -> bool:
+        with self._mutex:
+            return self._entries.get(key) is not pending
+
+    def _blocks_loop(self, pending: Future[Generation[T]]) -> bool:
+        loop = self._loops.get(pending)
+        if loop is None or pending.done():
+            return False
+        try:
+            return asyncio.get_running_loop() is loop
+        except RuntimeError:
+            return False
+
+    def _fail(self, key: Hashable, pending: Future[Generation[T]], exc: BaseException) -> None:
+        # The failed entry is dropped, so that the next caller of the key retries
+        with self._mutex:
+            if self._entries.get(key) is pending:
+                del self._entries[key]
+        self._mark(Status.CORRUPTED)
+        pending.set_exception(exc)
+
+    def _pin(self, ctx: Context, key: Hashable, generation: Generation[T]) -> T:
+        data = ctx.setdefault(self, KeyedData)
+        pinned = data.generations.setdefault(key, generation)
+        if pinned is not generation and generation.release():
+            generation.close()
+        return pinned.obj.get()
+
+    def _take_all(self) -> list[Generation[T]]:
+        with self._mutex:
+            entries, self._entries = self._entries, OrderedDict()
+        done = [pending.result() for pending in entries.values() if pending.done() and pending.exception() is None]
+        return self._retire(done)
+
+    def _build(self, args: tuple[Any, ...], kwargs: dict[str, Any]) -> Generation[T]:
+        ctx: Context = Context()
+        token = CONTEXT.set(ctx)
+        try:
+            obj = Object.create(self._func(*args, **kwargs), offload=self._offload)
+        except BaseException:
+            ctx.close()
+            raise
+        finally:
+            CONTEXT.reset(token)
+        return self._generation(obj, ctx)
+
+    async def _abuild(self, args: tuple[Any, ...], kwargs: dict[str, Any]) -> Generation[T]:
+        ctx: Context = Context()
+        token = CONTEXT.set(ctx)
+        try:
+            result = await self._acall(*args, **kwargs)
+            obj = await Object.acreate(result, offload=self._offload)
+        except BaseException:
+            await ctx.aclose()
+            raise
+        finally:
+            CONTEXT.reset(token)
+        return self._generation(obj, ctx)
+
+    def _generation(self, obj: Object[T], ctx: Context) -> Generation[T]:
+        now = time.monotonic()
+        expires_at = now + self._ttl if self._ttl is not None else math.inf
+        return Generation(obj=obj, ctx=ctx, number=0, created_at=now, expires_at=expires_at)
+
+
+def _close_retired(generations: list[Generation[Any]]) -> None:
+    for generation in generations:
+        try:
+            generation.close()
+        except LaimaAsyncError:
+            warnings.warn(f"{generation.obj} has to be closed asynchronously and was dropped without teardown")
+
+
+@overload
+def keyed(func: TypeT) -> TypeT:  # type: ignore[overload-overlap]
+    pass
+
+
+@overload
+def keyed(func: Callable[..., AsyncIterator[T]]) -> Keyed[Awaitable[T]]:
+    pass
+
+
+@overload
+def keyed(func: Callable[..., Iterator[T]]) -> Keyed[T]:
+    pass
+
+
+@overload
+def keyed(func: Callable[..., T]) -> Keyed[T]:
+    pass
+
+
+@overload
+def keyed(
+    *,
+    bind_to: type | str | None = None,
+    container: Container | None = None,
+    offload: Offload = False,
+    max_size: int = 128,
+    ttl: float | None = None,
+) -> Callable[[TypeT], TypeT]:
+    pass
+
+
+@overload
+def keyed(  # type: ignore[overload-cannot-match]
+    *,
+    bind_to: type | str | None = None,
+    container: Container | None = None,
+    offload: Offload = False,
+    max_size: int = 128,
+    ttl: float | None = None,
+) -> Callable[[Callable[..., AsyncIterator[T]]], Keyed[Awaitable[T]]]:
+    pass
+
+
+@overload
+def keyed(  # type: ignore[overload-cannot-match]
+    *,
+    bind_to: type | str | None = None,
+    container: Container | None = None,
+    offload: Offload = False,
+    max_size: int = 128,
+    ttl: float | None = None,
+) -> Callable[[Callable[..., Iterator[T]]], Keyed[T]]:
+    pass
+
+
+@overload
+def keyed(  # type: ignore[overload-cannot-match]
+    *,
+    bind_to: type | str | None = None,
+    container: Container | None = None,
+    offload: Offload = False,
+    max_size: int = 128,
+    ttl: float | None = None,
+) -> Callable[[Callable[..., T]], Keyed[T]]:
+    pass
+
+
+@overload
+def keyed(  # type: ignore[overload-overlap]
+    func: TypeT,
+    *,
+    bind_to: type | str | None = None,
+    container: Container | None = None,
+    offload: Offload = False,
+    override: bool = False,
+    max_size: int = 128,
+    ttl: float | None = None,
+) -> TypeT:
+    pass
+
+
+@overload
+def keyed(
+    func: Callable[..., AsyncIterator[T]],
+    *,
+    bind_to: type | str | None = None,
+    container: Container | None = None,
+    offload: Offload = False,
+    override: bool = False,
+    max_size: int = 128,
+    ttl: float | None = None,
+) -> Keyed[Awaitable[T]]:
+    pass
+
+
+@overload
+def keyed(
+    func: Callable[..., Iterator[T]],
+    *,
+    bind_to: type | str | None = None,
+    container: Container | None = None,
+    offload: Offload = False,
+    override: bool = False,
+    max_size: int = 128,
+    ttl: float | None = None,
+) -> Keyed[T]:
+    pass
+
+
+@overload
+def keyed(
+    func: Callable[..., T],
+    *,
+    bind_to: type | str | None = None,
+    container: Container | None = None,
+    offload: Offload = False,
+    override: bool = False,
+    max_size: int = 128,
+    ttl: float | None = None,
+) -> Keyed[T]:
+    pass
+
+
+def keyed(
+    func: Any = None,
+    *,
+    bind_to: type | str | None = None,
+    container: Container | None = None,
+    offload: Offload = False,
+    override: bool = False,
+    max_size: int = 128,
+    ttl: float | None = None,
+) -> Any:
+    return provider_wrapper(
+        provider_cls=Keyed,
+        func=func,
+        bind_to=bind_to,
+        container=container,
+        override=override,
+        options={
+            "max_size": max_size,
+            "ttl": ttl,
+            "offload": offload,
+        },
+    )
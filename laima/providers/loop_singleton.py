@@ -0,0 +1,308 @@
+import asyncio
+import threading
+import warnings
+from collections.abc import AsyncIterator, Awaitable, Callable, Iterator
+from typing import Any, ClassVar, TypeVar, overload
+
+from laima.container import Container
+from laima.context import CONTEXT
+from laima.exc import LaimaAsyncError, LaimaError
+from laima.providers.provider import Provider
+from laima.utils.context import Context
+from laima.utils.empty import EMPTY
+from laima.utils.fork import abandon
+from laima.utils.local import Instance, defer, raise_errors
+from laima.utils.object import Object
+from laima.utils.offload import Offload
+from laima.utils.status import Status
+from laima.utils.wrappers import provider_wrapper
+
+T = TypeVar("T")
+TypeT = TypeVar("TypeT", bound=type)
+
+
+class LoopSingleton(Provider[T]):
+    loop_bound: ClassVar[bool] = True
+
+    def __init__(self, func: Callable[..., T], *, offload: Offload = False) -> None:
+        super().__init__(
+            func=func,
+            offload=offload,
+        )
+        # Read without a lock; only creation of a loop's instance takes `_instances_lock`
+        self._instances: dict[asyncio.AbstractEventLoop, Instance[T]] = {}
+        self._loop_locks: dict[asyncio.AbstractEventLoop, asyncio.Lock] = {}
+        self._instances_lock = threading.Lock()
+        # Instances of the running loop left over by a sync `reset` called on it
+        self._deferred: list[tuple[asyncio.AbstractEventLoop, Instance[T]]] = []
+
+    def provide(self) -> T:
+        loop = _running_loop()
+        instance = self._instances.get(loop)
+        if instance is not None and instance.obj.instance is not EMPTY:
+            return instance.obj.instance  # type: ignore[return-value]
+
+        # Nothing else can run on the loop while the instance is created synchronously, but an asynchronous creation
+        # may be suspended half-way; whichever registers first is kept
+        ctx: Context = Context()
+        token = CONTEXT.set(ctx)
+        try:
+            obj = Object.create(self._func(), offload=self._offload)
+        except Exception:
+            self._mark(Status.CORRUPTED)
+            ctx.close()
+            raise
+        finally:
+            CONTEXT.reset(token)
+        instance = Instance(obj, ctx)
+        if (current := self._register(loop, instance)) is not instance:
+            instance.close()
+
+        return current.obj.get()
+
+    async def aprovide(self) -> T:
+        loop = asyncio.get_running_loop()
+        instance = self._instances.get(loop)
+        if instance is not None and instance.obj.instance is not EMPTY:
+            return instance.obj.instance  # type: ignore[return-value]
+
+        async with self._loop_lock(loop):
+            instance = self._instances.get(loop)
+            if instance is None or instance.obj.instance is EMPTY:
+                ctx: Context = Context()
+                token = CONTEXT.set(ctx)
+                try:
+                    obj = await Object.acreate(await self._acall(), offload=self._offload)
+                except Exception:
+                    self._mark(Status.CORRUPTED)
+                    await ctx.aclose()
+                    raise
+                finally:
+                    CONTEXT.reset(token)
+                created = Instance(obj, ctx)
+                if (instance := self._register(loop, created)) is not created:
+                    await created.aclose()
+
+            return instance.obj.get()
+
+    def after_fork(self) -> None:
+        super().after_fork()
+        abandon(self._instances)
+        self._instances = {}
+        self._loop_locks = {}
+        self._instances_lock = threading.Lock()
+        self._deferred = []
+
+    def reset(self) -> None:
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+
+        errors = []
+        deferred = []
+        for loop, instance in self._take_instances():
+            try:
+                if loop.is_closed():
+                    _close(instance)
+                elif loop is running:
+                    # The running loop cannot be blocked on from inside itself
+                    if instance.is_async:
+                        deferred.append((loop, instance))
+                        continue
+                    instance.close()
+                elif loop.is_running():
+                    # Loop-bound objects have to be torn down on their own loop
+                    asyncio.run_coroutine_threadsafe(instance.aclose(), loop).result()
+                else:
+                    loop.run_until_complete(instance.aclose())
+            except Exception as exc:
+                errors.append(exc)
+
+        with self._instances_lock:
+            self._deferred.extend(deferred)
+        defer(self, deferred)
+        self._status = Status.IDLE
+        raise_errors(self, errors)
+
+    async def areset(self) -> None:
+        running = asyncio.get_running_loop()
+        errors = []
+        for loop, instance in self._take_instances():
+            try:
+                if loop is not running and loop.is_running():
+                    await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(instance.aclose(), loop))
+                elif loop.is_closed():
+                    _close(instance)
+                else:
+                    await instance.aclose()
+            except Exception as exc:
+                errors.append(exc)
+        self._status = Status.IDLE
+        raise_errors(self, errors)
+
+    def _loop_lock(self, loop: asyncio.AbstractEventLoop) -> asyncio.Lock:
+        if (lock := self._loop_locks.get(loop)) is None:
+            with self._instances_lock:
+                lock = self._loop_locks.setdefault(loop, asyncio.Lock())
+        return lock
+
+    def _register(self, loop: asyncio.AbstractEventLoop, instance: Instance[T]) -> Instance[T]:
+        with self._instances_lock:
+            current = self._instances.get(loop)
+            if current is not None and current.obj.instance is not EMPTY:
+                return current
+            # Copy-on-write, so that lock-free readers never see a dictionary being resized
+            instances = {key: value for key, value in self._instances.items() if not key.is_closed()}
+            instances[loop] = instance
+            self._instances = instances
+            self._loop_locks = {key: value for key, value in self._loop_locks.items() if key in instances}
+        self._mark(Status.RUNNING)
+        return instance
+
+    def _take_instances(self) -> list[tuple[asyncio.AbstractEventLoop, Instance[T]]]:
+        with self._instances_lock:
+            instances, self._instances = self._instances, {}
+            deferred, self._deferred = self._deferred, []
+            self._loop_locks = {}
+        return [*deferred, *instances.items()]
+
+
+def _running_loop() -> asyncio.AbstractEventLoop:
+    try:
+        return asyncio.get_running_loop()
+    except RuntimeError:
+        raise LaimaError("Loop singleton has to be resolved inside a running event loop") from None
+
+
+def _close(instance: Instance[Any]) -> None:
+    try:
+        instance.close()
+    except LaimaAsyncError:
+        warnings.warn(f"{instance.obj} belongs to a closed event loop and could not be torn down")
+
+
+@overload
+def loop_singleton(func: TypeT) -> TypeT:  # type: ignore[overload-overlap]
+    pass
+
+
+@overload
+def loop_singleton(func: Callable[..., AsyncIterator[T]]) -> LoopSingleton[Awaitable[T]]:
+    pass
+
+
+@overload
+def loop_singleton(func: Callable[..., Iterator[T]]) -> LoopSingleton[T]:
+    pass
+
+
+@overload
+def loop_singleton(func: Callable[..., T]) -> LoopSingleton[T]:
+    pass
+
+
+@overload
+def loop_singleton(
+    *,
+    bind_to: type | str | None = None,
+    container: Container | None = None,
+    offload: Offload = False,
+) -> Callable[[TypeT], TypeT]:
+    pass
+
+
+@overload
+def loop_singleton(  # type: ignore[overload-cannot-match]
+    *,
+    bind_to: type | str | None = None,
+    container: Container | None = None,
+    offload: Offload = False,
+) -> Callable[[Callable[..., AsyncIterator[T]]], LoopSingleton[Awaitable[T]]]:
+    pass
+
+
+@overload
+def loop_singleton(  # type: ignore[overload-cannot-match]
+    *,
+    bind_to: type | str | None = None,
+    container: Container | None = None,
+    offload: Offload = False,
+) -> Callable[[Callable[..., Iterator[T]]], LoopSingleton[T]]:
+    pass
+
+
+@overload
+def loop_singleton(  # type: ignore[overload-cannot-match]
+    *,
+    bind_to: type | str | None = None,
+    container: Container | None = None,
+    offload: Offload = False,
+) -> Callable[[Callable[..., T]], LoopSingleton[T]]:
+    pass
+
+
+@overload
+def loop_singleton(  # type: ignore[overload-overlap]
+    func: TypeT,
+    *,
+    bind_to: type | str | None = None,
+    container: Container | None = None,
+    offload: Offload = False,
+    override: bool = False,
+) -> TypeT:
+    pass
+
+
+@overload
+def loop_singleton(
+    func: Callable[..., AsyncIterator[T]],
+    *,
+    bind_to: type | str | None = None,
+    container: Container | None = None,
+    offload: Offload = False,
+    override: bool = False,
+) -> LoopSingleton[Awaitable[T]]:
+    pass
+
+
+@overload
+def loop_singleton(
+    func: Callable[..., Iterator[T]],
+    *,
+    bind_to: type | str | None = None,
+    container: Container | None = None,
+    offload: Offload = False,
+    override: bool = False,
+) -> LoopSingleton[T]:
+    pass
+
+
+@overload
+def loop_singleton(
+    func: Callable[..., T],
+    *,
+    bind_to: type | str | None = None,
+    container: Container | None = None,
+    offload: Offload = False,
+    override: bool = False,
+) -> LoopSingleton[T]:
+    pass
+
+
+def loop_singleton(
+    func: Any = None,
+    *,
+    bind_to: type | str | None = None,
+    container: Container | None = None,
+    offload: Offload = False,
+    override: bool = False,
+) -> Any:
+    return provider_wrapper(
+        provider_cls=LoopSingleton,
+        func=func,
+        bind_to=bind_to,
+        container=container,
+        override=override,
+        options={"offload": offload},
+    )
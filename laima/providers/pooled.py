@@ -0,0 +1,329 @@
+from collections.abc import AsyncIterator, Awaitable, Callable, Iterator
+from typing import Any, TypeVar, overload
+
+from laima.container import Container
+from laima.context import CONTEXT
+from laima.exc import LaimaError
+from laima.providers.provider import Provider
+from laima.utils.context import Context
+from laima.utils.fork import abandon
+from laima.utils.object import Object
+from laima.utils.offload import Offload
+from laima.utils.pool import Lease, Pool, PooledData, PoolStats
+from laima.utils.status import Status
+from laima.utils.wrappers import provider_wrapper
+
+T = TypeVar("T")
+TypeT = TypeVar("TypeT", bound=type)
+
+
+class Pooled(Provider[T]):
+    def __init__(
+        self,
+        func: Callable[..., T],
+        *,
+        max_size: int = 10,
+        min_size: int = 0,
+        timeout: float | None = None,
+        validate: Callable[[T], bool] | None = None,
+        offload: Offload = False,
+    ) -> None:
+        super().__init__(
+            func=func,
+            offload=offload,
+        )
+        self._options.update(max_size=max_size, min_size=min_size, timeout=timeout, validate=validate)
+        self._pool: Pool[T] = Pool(max_size=max_size, min_size=min_size)
+        self._timeout = timeout
+        self._validate = validate
+
+    @property
+    def stats(self) -> PoolStats:
+        return self._pool.stats()
+
+    def provide(self) -> T:
+        ctx = CONTEXT.get()
+
+        if ctx is None:
+            self._mark(Status.CORRUPTED)
+            raise LaimaError("Pooled provider has to be called in context block")
+
+        data = ctx.setdefault(self, self._new_data)
+
+        if data.lease is None:
+            with data.lock:
+                if data.lease is None:
+                    data.lease = self._checkout()
+
+        self._mark(Status.RUNNING)
+        return data.lease.obj.get()
+
+    async def aprovide(self) -> T:
+        ctx = CONTEXT.get()
+
+        if ctx is None:
+            self._mark(Status.CORRUPTED)
+            raise LaimaError("Pooled provider has to be called in context block")
+
+        data = ctx.setdefault(self, self._new_data)
+
+        if data.lease is None:
+            async with data.lock:
+                if data.lease is None:
+                    data.lease = await self._acheckout()
+
+        self._mark(Status.RUNNING)
+        return data.lease.obj.get()
+
+    def after_fork(self) -> None:
+        super().after_fork()
+        # Pooled objects are connection-like and never shared with the parent; leases handed out before the fork
+        # belong to the old pool and are dropped together with it
+        abandon(self._pool)
+        self._pool = Pool(max_size=self._options["max_size"], min_size=self._options["min_size"])
+
+    def warmup(self) -> None:
+        leases = [self._checkout() for _ in range(self._pool.min_size)]
+        for lease in leases:
+            self._pool.release(lease)
+
+    async def awarmup(self) -> None:
+        leases = [await self._acheckout() for _ in range(self._pool.min_size)]
+        for lease in leases:
+            self._pool.release(lease)
+
+    def reset(self) -> None:
+        for lease in self._pool.clear():
+            lease.close()
+        self._status = Status.IDLE
+
+    async def areset(self) -> None:
+        for lease in self._pool.clear():
+            await lease.aclose()
+        self._status = Status.IDLE
+
+    def _new_data(self) -> PooledData[T]:
+        return PooledData(pool=self._pool, lock=self._new_lock())
+
+    def _checkout(self) -> Lease[T]:
+        while True:
+            lease = self._pool.acquire(self._timeout)
+            if lease is None:
+                return self._create()
+            if self._is_valid(lease):
+                return lease
+            self._pool.discard()
+            lease.close()
+
+    async def _acheckout(self) -> Lease[T]:
+        while True:
+            lease = await self._pool.aacquire(self._timeout)
+            if lease is None:
+                return await self._acreate()
+            if self._is_valid(lease):
+                return lease
+            self._pool.discard()
+            await lease.aclose()
+
+    def _create(self) -> Lease[T]:
+        # Pooled objects outlive the context they are created in, so they get their own one like singletons
+        ctx: Context = Context()
+        token = CONTEXT.set(ctx)
+        try:
+            obj = Object.create(self._func(), offload=self._offload)
+        except BaseException:
+            self._pool.discard()
+            ctx.close()
+            raise
+        finally:
+            CONTEXT.reset(token)
+        return self._pool.lease(obj, ctx)
+
+    async def _acreate(self) -> Lease[T]:
+        ctx: Context = Context()
+        token = CONTEXT.set(ctx)
+        try:
+            obj = await Object.acreate(await self._acall(), offload=self._offload)
+        except BaseException:
+            self._pool.discard()
+            await ctx.aclose()
+            raise
+        finally:
+            CONTEXT.reset(token)
+        return self._pool.lease(obj, ctx)
+
+    def _is_valid(self, lease: Lease[T]) -> bool:
+        if self._validate is None:
+            return True
+        try:
+            return self._validate(lease.obj.get())
+        except Exception:
+            return False
+
+
+@overload
+def pooled(func: TypeT) -> TypeT:  # type: ignore[overload-overlap]
+    pass
+
+
+@overload
+def pooled(func: Callable[..., AsyncIterator[T]]) -> Pooled[Awaitable[T]]:
+    pass
+
+
+@overload
+def pooled(func: Callable[..., Iterator[T]]) -> Pooled[T]:
+    pass
+
+
+@overload
+def pooled(func: Callable[..., T]) -> Pooled[T]:
+    pass
+
+
+@overload
+def pooled(
+    *,
+    bind_to: type | str | None = None,
+    container: Container | None = None,
+    offload: Offload = False,
+    max_size: int = 10,
+    min_size: int = 0,
+    timeout: float | None = None,
+    validate: Callable[[Any], bool] | None = None,
+) -> Callable[[TypeT], TypeT]:
+    pass
+
+
+@overload
+def pooled(  # type: ignore[overload-cannot-match]
+    *,
+    bind_to: type | str | None = None,
+    container: Container | None = None,
+    offload: Offload = False,
+    max_size: int = 10,
+    min_size: int = 0,
+    timeout: float | None = None,
+    validate: Callable[[Any], bool] | None = None,
+) -> Callable[[Callable[..., AsyncIterator[T]]], Pooled[Awaitable[T]]]:
+    pass
+
+
+@overload
+def pooled(  # type: ignore[overload-cannot-match]
+    *,
+    bind_to: type | str | None = None,
+    container: Container | None = None,
+    offload: Offload = False,
+    max_size: int = 10,
+    min_size: int = 0,
+    timeout: float | None = None,
+    validate: Callable[[Any], bool] | None = None,
+) -> Callable[[Callable[..., Iterator[T]]], Pooled[T]]:
+    pass
+
+
+@overload
+def pooled(  # type: ignore[overload-cannot-match]
+    *,
+    bind_to: type | str | None = None,
+    container: Container | None = None,
+    offload: Offload = False,
+    max_size: int = 10,
+    min_size: int = 0,
+    timeout: float | None = None,
+    validate: Callable[[Any], bool] | None = None,
+) -> Callable[[Callable[..., T]], Pooled[T]]:
+    pass
+
+
+@overload
+def pooled(  # type: ignore[overload-overlap]
+    func: TypeT,
+    *,
+    bind_to: type | str | None = None,
+    container: Container | None = None,
+    offload: Offload = False,
+    override: bool = False,
+    max_size: int = 10,
+    min_size: int = 0,
+    timeout: float | None = None,
+    validate: Callable[[Any], bool] | None = None,
+) -> TypeT:
+    pass
+
+
+@overload
+def pooled(
+    func: Callable[..., AsyncIterator[T]],
+    *,
+    bind_to: type | str | None = None,
+    container: Container | None = None,
+    offload: Offload = False,
+    override: bool = False,
+    max_size: int = 10,
+    min_size: int = 0,
+    timeout: float | None = None,
+    validate: Callable[[Any], bool] | None = None,
+) -> Pooled[Awaitable[T]]:
+    pass
+
+
+@overload
+def pooled(
+    func: Callable[..., Iterator[T]],
+    *,
+    bind_to: type | str | None = None,
+    container: Container | None = None,
+    offload: Offload = False,
+    override: bool = False,
+    max_size: int = 10,
+    min_size: int = 0,
+    timeout: float | None = None,
+    validate: Callable[[Any], bool] | None = None,
+) -> Pooled[T]:
+    pass
+
+
+@overload
+def pooled(
+    func: Callable[..., T],
+    *,
+    bind_to: type | str | None = None,
+    container: Container | None = None,
+    offload: Offload = False,
+    override: bool = False,
+    max_size: int = 10,
+    min_size: int = 0,
+    timeout: float | None = None,
+    validate: Callable[[Any], bool] | None = None,
+) -> Pooled[T]:
+    pass
+
+
+def pooled(
+    func: Any = None,
+    *,
+    bind_to: type | str | None = None,
+    container: Container | None = None,
+    offload: Offload = False,
+    override: bool = False,
+    max_size: int = 10,
+    min_size: int = 0,
+    timeout: float | None = None,
+    validate: Callable[[Any], bool] | None = None,
+) -> Any:
+    return provider_wrapper(
+        provider_cls=Pooled,
+        func=func,
+        bind_to=bind_to,
+        container=container,
+        override=override,
+        options={
+            "max_size": max_size,
+            "min_size": min_size,
+            "timeout": timeout,
+            "validate": validate,
+            "offload": offload,
+        },
+    )
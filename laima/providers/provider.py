@@ -1,19 +1,29 @@
 import inspect
 import secrets
+import weakref
 from abc import ABC, abstractmethod
 from collections.abc import Callable
 from functools import partial
-from typing import Any, Generic, Self, TypeVar
+from typing import Any, ClassVar, Generic, Self, TypeVar
 
 from laima.exc import LaimaTypeError
+from laima.utils import fork
+from laima.utils.instrument import Instrument
 from laima.utils.lock import Lock
+from laima.utils.offload import Offload, run_sync
+from laima.utils.slots import SLOTS
 from laima.utils.status import Status
 
 T = TypeVar("T")
 
 
 class Provider(Generic[T], ABC):
-    def __init__(self, func: Callable[..., T]) -> None:
+    # Whether calls may pass arguments on to the factory, see `ClassNewWrapper`
+    accepts_arguments: ClassVar[bool] = False
+    # Whether instances are torn down on the event loop they were created on, see `Container.reset`
+    loop_bound: ClassVar[bool] = False
+
+    def __init__(self, func: Callable[..., T], *, offload: Offload = False) -> None:
         self._func = func
         self._is_generator = (
             inspect.isgeneratorfunction(func)
@@ -24,14 +34,34 @@ class Provider(Generic[T], ABC):
             or inspect.isasyncgenfunction(func)
         )
         self._attr_name: str | None = None
+        # Offloading only applies to sync factories, coroutines already run on the loop without blocking it
+        self._offload = False if self._is_async else offload
+        self._options: dict[str, Any] = {"offload": offload}
         self._lock = Lock()
+        self._instruments: tuple[Instrument, ...] = ()
+        self._plain: tuple[Callable[..., T], Lock] | None = None
         self._status = Status.IDLE
         self._id = secrets.token_hex(4)
+        self._slot = SLOTS.allocate()
+        weakref.finalize(self, SLOTS.release, self._slot)
+        fork.register(self)
 
     @property
     def status(self) -> Status:
         return self._status
 
+    @property
+    def slot(self) -> int:
+        return self._slot
+
+    @property
+    def func(self) -> Callable[..., T]:
+        return self._func
+
+    @property
+    def is_async(self) -> bool:
+        return self._is_async
+
     def __repr__(self) -> str:
         return f"{self.__class__.__qualname__}[{self._id}]({self._func})"
 
@@ -64,7 +94,7 @@ class Provider(Generic[T], ABC):
             if self._attr_name not in cache:
                 func = partial(self._func, instance)
                 func.__qualname__ = self._func.__qualname__  # type: ignore[attr-defined]
-                provider = self.__class__(func)
+                provider = self.__class__(func, **self._options)
                 try:
                     cache[self._attr_name] = provider
                 except TypeError:
@@ -86,6 +116,14 @@ class Provider(Generic[T], ABC):
 
         return self.provide()
 
+    # Resolutions only read the status once it is set, so they do not keep writing to memory shared by all threads
+    def _mark(self, status: Status) -> None:
+        if self._status is not status:
+            self._status = status
+
+    async def _acall(self, *args: Any, **kwargs: Any) -> Any:
+        return await run_sync(self._offload, partial(self._func, *args, **kwargs))
+
     @abstractmethod
     def provide(self) -> T:
         pass
@@ -94,6 +132,57 @@ class Provider(Generic[T], ABC):
     async def aprovide(self) -> T:
         pass
 
+    def warmup(self) -> None:
+        pass
+
+    async def awarmup(self) -> None:
+        pass
+
+    # Locks created per context, e.g. the one of `ScopedData`, are wrapped by instruments the same as `_lock`
+    def _new_lock(self) -> Lock:
+        lock = Lock()
+        for instrument in self._instruments:
+            lock = instrument.wrap_lock(lock)
+        return lock
+
+    def after_fork(self) -> None:
+        # A lock held by another thread at fork time would never be released in the child
+        self._lock = Lock()
+        if self._plain is not None:
+            self._plain = (self._plain[0], self._lock)
+            self._rewire(self._instruments)
+
+    # Instruments are swapped in on the instance, so that an uninstrumented provider runs the plain class methods
+    def instrument(self, instrument: Instrument) -> None:
+        if instrument not in self._instruments:
+            self._rewire((*self._instruments, instrument))
+
+    def uninstrument(self, instrument: Instrument) -> None:
+        if instrument in self._instruments:
+            self._rewire(tuple(item for item in self._instruments if item is not instrument))
+
+    def _rewire(self, instruments: tuple[Instrument, ...]) -> None:
+        if self._plain is None:
+            self._plain = (self._func, self._lock)
+        func, lock = self._plain
+
+        vars(self).pop("provide", None)
+        vars(self).pop("aprovide", None)
+        provide, aprovide = self.provide, self.aprovide
+        for instrument in instruments:
+            func = instrument.wrap_factory(func, is_generator=self._is_generator, is_async=self._is_async)
+            lock = instrument.wrap_lock(lock)
+            provide = instrument.wrap_provide(provide)
+            aprovide = instrument.wrap_aprovide(aprovide)
+
+        self._func, self._lock = func, lock
+        self._instruments = instruments
+        if instruments:
+            self.provide = provide  # type: ignore[method-assign]
+            self.aprovide = aprovide  # type: ignore[method-assign]
+        else:
+            self._plain = None
+
     def reset(self) -> None:
         self._status = Status.IDLE
 
@@ -0,0 +1,451 @@
+import asyncio
+import itertools
+import threading
+import time
+import warnings
+from collections.abc import AsyncIterator, Awaitable, Callable, Iterator
+from contextvars import copy_context
+from functools import partial
+from typing import Any, TypeVar, overload
+
+from laima.container import Container
+from laima.context import CONTEXT
+from laima.exc import LaimaError
+from laima.providers.provider import Provider
+from laima.utils.context import Context
+from laima.utils.empty import EMPTY
+from laima.utils.fork import abandon
+from laima.utils.object import Object
+from laima.utils.offload import Offload
+from laima.utils.refresh import Generation, RefreshingData, RefreshStats
+from laima.utils.status import Status
+from laima.utils.wrappers import provider_wrapper
+
+T = TypeVar("T")
+TypeT = TypeVar("TypeT", bound=type)
+
+
+class Refreshing(Provider[T]):
+    def __init__(
+        self,
+        func: Callable[..., T],
+        *,
+        ttl: float = 60.0,
+        retry_interval: float = 1.0,
+        offload: Offload = False,
+    ) -> None:
+        if ttl <= 0 or retry_interval <= 0:
+            raise LaimaError(f"Invalid refresh timing: ttl={ttl}, retry_interval={retry_interval}")
+
+        super().__init__(
+            func=func,
+            offload=offload,
+        )
+        self._options.update(ttl=ttl, retry_interval=retry_interval)
+        self._ttl = ttl
+        self._retry_interval = retry_interval
+        self._current: Generation[T] | None = None
+        self._numbers = itertools.count(1)
+        # Bumped by reset, so that a refresh started before it never installs its result
+        self._epoch = 0
+        self._state_lock = threading.Lock()
+        self._refreshing = False
+        self._task: asyncio.Task[None] | None = None
+        self._refreshes = 0
+        self._failures = 0
+        self._last_duration = 0.0
+        self._max_duration = 0.0
+        self._total_duration = 0.0
+        self._last_error: str | None = None
+
+    @property
+    def stats(self) -> RefreshStats:
+        current = self._current
+        with self._state_lock:
+            return RefreshStats(
+                generation=current.number if current is not None else 0,
+                age=time.monotonic() - current.created_at if current is not None else None,
+                refreshes=self._refreshes,
+                failures=self._failures,
+                last_duration=self._last_duration,
+                max_duration=self._max_duration,
+                total_duration=self._total_duration,
+                last_error=self._last_error,
+            )
+
+    def provide(self) -> T:
+        ctx = CONTEXT.get()
+        if ctx is not None and (data := ctx.get(self)) is not None:
+            return data.generation.obj.get()  # type: ignore[no-any-return]
+
+        while True:
+            generation = self._current
+            if generation is None:
+                generation = self._initialize()
+            elif self._is_due(generation):
+                self._start_refresh()
+
+            if ctx is None:
+                # Untracked callers may find the generation retired and closed right after reading it
+                instance = generation.obj.instance
+                if instance is not EMPTY:
+                    return instance  # type: ignore[return-value]
+                continue
+            # A context keeps the generation it has seen first, which also delays its teardown until it is closed
+            if generation.acquire():
+                break
+
+        data = ctx.setdefault(self, partial(RefreshingData, generation))
+        if data.generation is not generation and generation.release():
+            generation.close()
+        return data.generation.obj.get()  # type: ignore[no-any-return]
+
+    async def aprovide(self) -> T:
+        ctx = CONTEXT.get()
+        if ctx is not None and (data := ctx.get(self)) is not None:
+            return data.generation.obj.get()  # type: ignore[no-any-return]
+
+        while True:
+            generation = self._current
+            if generation is None:
+                generation = await self._ainitialize()
+            elif self._is_due(generation):
+                self._astart_refresh()
+
+            if ctx is None:
+                instance = generation.obj.instance
+                if instance is not EMPTY:
+                    return instance  # type: ignore[return-value]
+                continue
+            if generation.acquire():
+                break
+
+        data = ctx.setdefault(self, partial(RefreshingData, generation))
+        if data.generation is not generation and generation.release():
+            await generation.aclose()
+        return data.generation.obj.get()  # type: ignore[no-any-return]
+
+    def warmup(self) -> None:
+        self._initialize()
+
+    async def awarmup(self) -> None:
+        await self._ainitialize()
+
+    def refresh(self) -> None:
+        self._refresh(self._epoch)
+
+    async def arefresh(self) -> None:
+        await self._arefresh(self._epoch)
+
+    def after_fork(self) -> None:
+        super().after_fork()
+        abandon(self._current)
+        self._current = None
+        self._state_lock = threading.Lock()
+        self._refreshing = False
+        self._task = None
+
+    def reset(self) -> None:
+        retired = self._retire_current()
+        if retired is not None:
+            retired.close()
+        self._status = Status.IDLE
+
+    async def areset(self) -> None:
+        retired = self._retire_current()
+        if retired is not None:
+            await retired.aclose()
+        self._status = Status.IDLE
+
+    def _is_due(self, generation: Generation[T]) -> bool:
+        return not self._refreshing and time.monotonic() >= generation.expires_at
+
+    def _claim_refresh(self) -> int | None:
+        with self._state_lock:
+            if self._refreshing:
+                return None
+            self._refreshing = True
+            return self._epoch
+
+    def _start_refresh(self) -> None:
+        if (epoch := self._claim_refresh()) is None:
+            return
+        target = partial(self._refresh, epoch, claimed=True)
+        thread = threading.Thread(target=copy_context().run, args=(target,), daemon=True)
+        thread.start()
+
+    def _astart_refresh(self) -> None:
+        if (epoch := self._claim_refresh()) is None:
+            return
+        self._task = asyncio.get_running_loop().create_task(self._arefresh(epoch, claimed=True))
+
+    def _initialize(self) -> Generation[T]:
+        with self._lock:
+            if self._current is None:
+                try:
+                    self._current = self._build()
+                except Exception:
+                    self._mark(Status.CORRUPTED)
+                    raise
+                self._mark(Status.RUNNING)
+            return self._current
+
+    async def _ainitialize(self) -> Generation[T]:
+        async with self._lock:
+            if self._current is None:
+                try:
+                    self._current = await self._abuild()
+                except Exception:
+                    self._mark(Status.CORRUPTED)
+                    raise
+                self._mark(Status.RUNNING)
+            return self._current
+
+    def _refresh(self, epoch: int, *, claimed: bool = False) -> None:
+        start = time.monotonic()
+        try:
+            generation = self._build()
+        except Exception as exc:
+            self._record_failure(exc, claimed=claimed)
+            return
+
+        retired = self._install(generation, epoch, time.monotonic() - start, claimed=claimed)
+        if retired is not None:
+            retired.close()
+
+    async def _arefresh(self, epoch: int, *, claimed: bool = False) -> None:
+        start = time.monotonic()
+        try:
+            generation = await self._abuild()
+        except Exception as exc:
+            self._record_failure(exc, claimed=claimed)
+            return
+
+        retired = self._install(generation, epoch, time.monotonic() - start, claimed=claimed)
+        if retired is not None:
+            await retired.aclose()
+
+    def _install(
+        self,
+        generation: Generation[T],
+        epoch: int,
+        duration: float,
+        *,
+        claimed: bool,
+    ) -> Generation[T] | None:
+        with self._state_lock:
+            if claimed:
+                self._refreshing = False
+                self._task = None
+            if epoch != self._epoch:
+                # The provider has been reset meanwhile, the new generation is not needed anymore
+                generation.retire()
+                return generation
+
+            old, self._current = self._current, generation
+            self._refreshes += 1
+            self._last_duration = duration
+            self._max_duration = max(self._max_duration, duration)
+            self._total_duration += duration
+            self._last_error = None
+
+        self._mark(Status.RUNNING)
+        if old is not None and old.retire():
+            return old
+        return None
+
+    def _record_failure(self, exc: Exception, *, claimed: bool) -> None:
+        with self._state_lock:
+            if claimed:
+                self._refreshing = False
+                self._task = None
+            self._failures += 1
+            self._last_error = repr(exc)
+            # The current generation is served until a retry succeeds
+            if self._current is not None:
+                self._current.expires_at = time.monotonic() + self._retry_interval
+        warnings.warn(f"{self} refresh failed: {exc!r}")
+
+    def _retire_current(self) -> Generation[T] | None:
+        with self._state_lock:
+            self._epoch += 1
+            current, self._current = self._current, None
+        if current is not None and current.retire():
+            return current
+        return None
+
+    def _build(self) -> Generation[T]:
+        ctx: Context = Context()
+        token = CONTEXT.set(ctx)
+        try:
+            obj = Object.create(self._func(), offload=self._offload)
+        except BaseException:
+            ctx.close()
+            raise
+        finally:
+            CONTEXT.reset(token)
+        return self._generation(obj, ctx)
+
+    async def _abuild(self) -> Generation[T]:
+        ctx: Context = Context()
+        token = CONTEXT.set(ctx)
+        try:
+            obj = await Object.acreate(await self._acall(), offload=self._offload)
+        except BaseException:
+            await ctx.aclose()
+            raise
+        finally:
+            CONTEXT.reset(token)
+        return self._generation(obj, ctx)
+
+    def _generation(self, obj: Object[T], ctx: Context) -> Generation[T]:
+        now = time.monotonic()
+        return Generation(obj=obj, ctx=ctx, number=next(self._numbers), created_at=now, expires_at=now + self._ttl)
+
+
+@overload
+def refreshing(func: TypeT) -> TypeT:  # type: ignore[overload-overlap]
+    pass
+
+
+@overload
+def refreshing(func: Callable[..., AsyncIterator[T]]) -> Refreshing[Awaitable[T]]:
+    pass
+
+
+@overload
+def refreshing(func: Callable[..., Iterator[T]]) -> Refreshing[T]:
+    pass
+
+
+@overload
+def refreshing(func: Callable[..., T]) -> Refreshing[T]:
+    pass
+
+
+@overload
+def refreshing(
+    *,
+    bind_to: type | str | None = None,
+    container: Container | None = None,
+    offload: Offload = False,
+    ttl: float = 60.0,
+    retry_interval: float = 1.0,
+) -> Callable[[TypeT], TypeT]:
+    pass
+
+
+@overload
+def refreshing(  # type: ignore[overload-cannot-match]
+    *,
+    bind_to: type | str | None = None,
+    container: Container | None = None,
+    offload: Offload = False,
+    ttl: float = 60.0,
+    retry_interval: float = 1.0,
+) -> Callable[[Callable[..., AsyncIterator[T]]], Refreshing[Awaitable[T]]]:
+    pass
+
+
+@overload
+def refreshing(  # type: ignore[overload-cannot-match]
+    *,
+    bind_to: type | str | None = None,
+    container: Container | None = None,
+    offload: Offload = False,
+    ttl: float = 60.0,
+    retry_interval: float = 1.0,
+) -> Callable[[Callable[..., Iterator[T]]], Refreshing[T]]:
+    pass
+
+
+@overload
+def refreshing(  # type: ignore[overload-cannot-match]
+    *,
+    bind_to: type | str | None = None,
+    container: Container | None = None,
+    offload: Offload = False,
+    ttl: float = 60.0,
+    retry_interval: float = 1.0,
+) -> Callable[[Callable[..., T]], Refreshing[T]]:
+    pass
+
+
+@overload
+def refreshing(  # type: ignore[overload-overlap]
+    func: TypeT,
+    *,
+    bind_to: type | str | None = None,
+    container: Container | None = None,
+    offload: Offload = False,
+    override: bool = False,
+    ttl: float = 60.0,
+    retry_interval: float = 1.0,
+) -> TypeT:
+    pass
+
+
+@overload
+def refreshing(
+    func: Callable[..., AsyncIterator[T]],
+    *,
+    bind_to: type | str | None = None,
+    container: Container | None = None,
+    offload: Offload = False,
+    override: bool = False,
+    ttl: float = 60.0,
+    retry_interval: float = 1.0,
+) -> Refreshing[Awaitable[T]]:
+    pass
+
+
+@overload
+def refreshing(
+    func: Callable[..., Iterator[T]],
+    *,
+    bind_to: type | str | None = None,
+    container: Container | None = None,
+    offload: Offload = False,
+    override: bool = False,
+    ttl: float = 60.0,
+    retry_interval: float = 1.0,
+) -> Refreshing[T]:
+    pass
+
+
+@overload
+def refreshing(
+    func: Callable[..., T],
+    *,
+    bind_to: type | str | None = None,
+    container: Container | None = None,
+    offload: Offload = False,
+    override: bool = False,
+    ttl: float = 60.0,
+    retry_interval: float = 1.0,
+) -> Refreshing[T]:
+    pass
+
+
+def refreshing(
+    func: Any = None,
+    *,
+    bind_to: type | str | None = None,
+    container: Container | None = None,
+    offload: Offload = False,
+    override: bool = False,
+    ttl: float = 60.0,
+    retry_interval: float = 1.0,
+) -> Any:
+    return provider_wrapper(
+        provider_cls=Refreshing,
+        func=func,
+        bind_to=bind_to,
+        container=container,
+        override=override,
+        options={
+            "ttl": ttl,
+            "retry_interval": retry_interval,
+            "offload": offload,
+        },
+    )
@@ -6,6 +6,7 @@ from laima.context import CONTEXT
 from laima.exc import LaimaError
 from laima.providers.provider import Provider
 from laima.utils.object import Object, ScopedData
+from laima.utils.offload import Offload
 from laima.utils.status import Status
 from laima.utils.wrappers import provider_wrapper
 
@@ -19,49 +20,45 @@ class Scoped(Provider[T]):
 
         if ctx is None:
             if self._is_generator:
-                self._status = Status.CORRUPTED
+                self._mark(Status.CORRUPTED)
                 raise LaimaError("Scoped generator has to be called in context block")
 
-            self._status = Status.RUNNING
+            self._mark(Status.RUNNING)
             return self._func()
 
-        with ctx.lock:
-            if self in ctx:
-                data = ctx[self]
-            else:
-                data = ScopedData()
-                ctx[self] = data
+        data = ctx.setdefault(self, self._new_data if self._instruments else ScopedData)
 
-        with data.lock:
-            if data.obj is None:
-                result = self._func()
-                data.obj = Object.create(result)
+        # The object is only published once it is fully created, so a set one can be read without the lock
+        if data.obj is None:
+            with data.lock:
+                if data.obj is None:
+                    result = self._func()
+                    data.obj = Object.create(result, offload=self._offload)
 
-        self._status = Status.RUNNING
+        self._mark(Status.RUNNING)
         return data.obj.get()
 
     async def aprovide(self) -> T:
         ctx = CONTEXT.get()
 
         if ctx is None:
-            self._status = Status.CORRUPTED
+            self._mark(Status.CORRUPTED)
             raise LaimaError("Scoped provider has to be called in context block")
 
-        async with ctx.lock:
-            if self in ctx:
-                data = ctx[self]
-            else:
-                data = ScopedData()
-                ctx[self] = data
+        data = ctx.setdefault(self, self._new_data if self._instruments else ScopedData)
 
-        async with data.lock:
-            if data.obj is None:
-                result = self._func()
-                data.obj = await Object.acreate(result)
+        if data.obj is None:
+            async with data.lock:
+                if data.obj is None:
+                    result = await self._acall()
+                    data.obj = await Object.acreate(result, offload=self._offload)
 
-        self._status = Status.RUNNING
+        self._mark(Status.RUNNING)
         return data.obj.get()
 
+    def _new_data(self) -> ScopedData[T]:
+        return ScopedData(lock=self._new_lock())
+
 
 @overload
 def scoped(func: TypeT) -> TypeT:  # type: ignore[overload-overlap]
@@ -88,6 +85,7 @@ def scoped(
     *,
     bind_to: type | str | None = None,
     container: Container | None = None,
+    offload: Offload = False,
 ) -> Callable[[TypeT], TypeT]:
     pass
 
@@ -97,6 +95,7 @@ def scoped(  # type: ignore[overload-cannot-match]
     *,
     bind_to: type | str | None = None,
     container: Container | None = None,
+    offload: Offload = False,
 ) -> Callable[[Callable[..., AsyncIterator[T]]], Scoped[Awaitable[T]]]:
     pass
 
@@ -106,6 +105,7 @@ def scoped(  # type: ignore[overload-cannot-match]
     *,
     bind_to: type | str | None = None,
     container: Container | None = None,
+    offload: Offload = False,
 ) -> Callable[[Callable[..., Iterator[T]]], Scoped[T]]:
     pass
 
@@ -115,6 +115,7 @@ def scoped(  # type: ignore[overload-cannot-match]
     *,
     bind_to: type | str | None = None,
     container: Container | None = None,
+    offload: Offload = False,
 ) -> Callable[[Callable[..., T]], Scoped[T]]:
     pass
 
@@ -125,6 +126,7 @@ def scoped(  # type: ignore[overload-overlap]
     *,
     bind_to: type | str | None = None,
     container: Container | None = None,
+    offload: Offload = False,
     override: bool = False,
 ) -> TypeT:
     pass
@@ -136,6 +138,7 @@ def scoped(
     *,
     bind_to: type | str | None = None,
     container: Container | None = None,
+    offload: Offload = False,
     override: bool = False,
 ) -> Scoped[Awaitable[T]]:
     pass
@@ -147,6 +150,7 @@ def scoped(
     *,
     bind_to: type | str | None = None,
     container: Container | None = None,
+    offload: Offload = False,
     override: bool = False,
 ) -> Scoped[T]:
     pass
@@ -158,6 +162,7 @@ def scoped(
     *,
     bind_to: type | str | None = None,
     container: Container | None = None,
+    offload: Offload = False,
     override: bool = False,
 ) -> Scoped[T]:
     pass
@@ -168,6 +173,7 @@ def scoped(
     *,
     bind_to: type | str | None = None,
     container: Container | None = None,
+    offload: Offload = False,
     override: bool = False,
 ) -> Any:
     return provider_wrapper(
@@ -176,4 +182,5 @@ def scoped(
         bind_to=bind_to,
         container=container,
         override=override,
+        options={"offload": offload},
     )
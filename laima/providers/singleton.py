@@ -1,12 +1,20 @@
+import asyncio
+import threading
 import warnings
 from collections.abc import AsyncIterator, Awaitable, Callable, Iterator
+from concurrent.futures import Future
 from typing import Any, TypeVar, overload
 
 from laima.container import Container
 from laima.context import CONTEXT
+from laima.exc import LaimaError
 from laima.providers.provider import Provider
 from laima.utils.context import Context
+from laima.utils.empty import EMPTY
+from laima.utils.fork import ForkPolicy, abandon
+from laima.utils.futures import wait_shared
 from laima.utils.object import Object
+from laima.utils.offload import Offload
 from laima.utils.status import Status
 from laima.utils.wrappers import provider_wrapper
 
@@ -15,77 +23,146 @@ TypeT = TypeVar("TypeT", bound=type)
 
 
 class Singleton(Provider[T]):
-    def __init__(self, func: Callable[..., T]) -> None:
+    def __init__(self, func: Callable[..., T], *, offload: Offload = False, fork: ForkPolicy = "share") -> None:
         super().__init__(
             func=func,
+            offload=offload,
         )
+        self._options.update(fork=fork)
+        self._fork = fork
         self._obj: Object | None = None
         self._ctx: Context | None = None
+        self._flight_lock = threading.Lock()
+        self._pending: Future[T] | None = None
+        self._task: asyncio.Task[None] | None = None
 
     def __del__(self) -> None:
         if self._obj is not None:
             warnings.warn(f"{self} is still running")
 
     def provide(self) -> T:
+        obj = self._obj
+        if obj is not None and obj.instance is not EMPTY:
+            return obj.instance  # type: ignore[return-value]
+
         with self._lock:
             if self._obj is None:
                 self._ctx = Context()
                 token = CONTEXT.set(self._ctx)
                 try:
                     result = self._func()
-                    self._obj = Object.create(result)
+                    self._obj = Object.create(result, offload=self._offload)
                 except Exception:
-                    self._status = Status.CORRUPTED
+                    self._mark(Status.CORRUPTED)
                     raise
                 else:
-                    self._status = Status.CORRUPTED
+                    self._mark(Status.RUNNING)
                 finally:
                     CONTEXT.reset(token)
 
-        return self._obj.get()
+            return self._obj.get()
 
     async def aprovide(self) -> T:
-        async with self._lock:
-            if self._obj is None:
-                self._ctx = Context()
-                token = CONTEXT.set(self._ctx)
-                try:
-                    result = self._func()
-                    self._obj = await Object.acreate(result)
-                except Exception:
-                    self._status = Status.CORRUPTED
-                    raise
-                else:
-                    self._status = Status.CORRUPTED
-                finally:
-                    CONTEXT.reset(token)
+        obj = self._obj
+        if obj is not None and obj.instance is not EMPTY:
+            return obj.instance  # type: ignore[return-value]
+
+        # All concurrent callers share one initialization, which runs as its own task so that cancelling
+        # any of them does not abort it
+        with self._flight_lock:
+            pending = self._pending
+            if pending is None:
+                pending = self._pending = Future()
+                self._task = asyncio.get_running_loop().create_task(self._initialize(pending))
+
+        return await wait_shared(pending)
+
+    async def _initialize(self, pending: Future[T]) -> None:
+        try:
+            async with self._lock:
+                if self._obj is None:
+                    ctx: Context = Context()
+                    token = CONTEXT.set(ctx)
+                    try:
+                        result = await self._acall()
+                        self._obj = await Object.acreate(result, offload=self._offload)
+                    except BaseException:
+                        self._mark(Status.CORRUPTED)
+                        await ctx.aclose()
+                        raise
+                    else:
+                        self._ctx = ctx
+                        self._mark(Status.RUNNING)
+                    finally:
+                        CONTEXT.reset(token)
+
+                instance = self._obj.get()
+        except asyncio.CancelledError:
+            self._settle(pending, error=LaimaError(f"{self} initialization was cancelled"))
+            raise
+        except BaseException as exc:
+            self._settle(pending, error=exc)
+        else:
+            self._settle(pending, instance=instance)
+
+    def _settle(self, pending: Future[T], *, instance: Any = None, error: BaseException | None = None) -> None:
+        # Clear the in-flight initialization first, so that the next caller after a failure starts a new one
+        with self._flight_lock:
+            self._pending = None
+            self._task = None
+
+        if error is None:
+            pending.set_result(instance)
+        else:
+            pending.set_exception(error)
+
+    def after_fork(self) -> None:
+        super().after_fork()
+        self._flight_lock = threading.Lock()
+        self._pending = None
+        self._task = None
+
+        if self._fork == "reinit":
+            # The instance belongs to the parent, so it is dropped without teardown and lazily created again
+            abandon(self._obj, self._ctx)
+            self._obj = None
+            self._ctx = None
+            self._status = Status.IDLE
 
-        return self._obj.get()
+    def warmup(self) -> None:
+        self.provide()
+
+    async def awarmup(self) -> None:
+        await self.aprovide()
 
     def reset(self) -> None:
         with self._lock:
-            if self._obj is not None:
-                self._obj.close()
-                self._obj = None
+            # Unpublish the instance first so that the lock-free path never returns an object being closed
+            obj, self._obj = self._obj, None
+            ctx, self._ctx = self._ctx, None
+
+            if obj is not None:
+                obj.close()
 
-            if self._ctx is not None:
-                self._ctx.close()
-                self._ctx = None
+            if ctx is not None:
+                ctx.close()
 
             self._status = Status.IDLE
 
     async def areset(self) -> None:
         async with self._lock:
-            if self._obj is not None:
-                await self._obj.aclose()
-                self._obj = None
+            obj, self._obj = self._obj, None
+            ctx, self._ctx = self._ctx, None
 
-            if self._ctx is not None:
-                await self._ctx.aclose()
-                self._ctx = None
+            if obj is not None:
+                await obj.aclose()
+
+            if ctx is not None:
+                await ctx.aclose()
 
             self._status = Status.IDLE
 
+
 @overload
 def singleton(func: TypeT) -> TypeT:  # type: ignore[overload-overlap]
     pass
@@ -111,6 +188,8 @@ def singleton(
     *,
     bind_to: type | str | None = None,
     container: Container | None = None,
+    offload: Offload = False,
+    fork: ForkPolicy = "share",
 ) -> Callable[[TypeT], TypeT]:
     pass
 
@@ -120,6 +199,8 @@ def singleton(  # type: ignore[overload-cannot-match]
     *,
     bind_to: type | str | None = None,
     container: Container | None = None,
+    offload: Offload = False,
+    fork: ForkPolicy = "share",
 ) -> Callable[[Callable[..., AsyncIterator[T]]], Singleton[Awaitable[T]]]:
     pass
 
@@ -129,6 +210,8 @@ def singleton(  # type: ignore[overload-cannot-match]
     *,
     bind_to: type | str | None = None,
     container: Container | None = None,
+    offload: Offload = False,
+    fork: ForkPolicy = "share",
 ) -> Callable[[Callable[..., Iterator[T]]], Singleton[T]]:
     pass
 
@@ -138,6 +221,8 @@ def singleton(  # type: ignore[overload-cannot-match]
     *,
     bind_to: type | str | None = None,
     container: Container | None = None,
+    offload: Offload = False,
+    fork: ForkPolicy = "share",
 ) -> Callable[[Callable[..., T]], Singleton[T]]:
     pass
 
@@ -148,6 +233,8 @@ def singleton(  # type: ignore[overload-overlap]
     *,
     bind_to: type | str | None = None,
     container: Container | None = None,
+    offload: Offload = False,
+    fork: ForkPolicy = "share",
     override: bool = False,
 ) -> TypeT:
     pass
@@ -159,6 +246,8 @@ def singleton(
     *,
     bind_to: type | str | None = None,
     container: Container | None = None,
+    offload: Offload = False,
+    fork: ForkPolicy = "share",
     override: bool = False,
 ) -> Singleton[Awaitable[T]]:
     pass
@@ -170,6 +259,8 @@ def singleton(
     *,
     bind_to: type | str | None = None,
     container: Container | None = None,
+    offload: Offload = False,
+    fork: ForkPolicy = "share",
     override: bool = False,
 ) -> Singleton[T]:
     pass
@@ -181,6 +272,8 @@ def singleton(
     *,
     bind_to: type | str | None = None,
     container: Container | None = None,
+    offload: Offload = False,
+    fork: ForkPolicy = "share",
     override: bool = False,
 ) -> Singleton[T]:
     pass
@@ -191,6 +284,8 @@ def singleton(
     *,
     bind_to: type | str | None = None,
     container: Container | None = None,
+    offload: Offload = False,
+    fork: ForkPolicy = "share",
     override: bool = False,
 ) -> Any:
     return provider_wrapper(
@@ -199,4 +294,5 @@ def singleton(
         bind_to=bind_to,
         container=container,
         override=override,
+        options={"offload": offload, "fork": fork},
     )
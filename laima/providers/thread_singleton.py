@@ -0,0 +1,288 @@
+import itertools
+import threading
+import weakref
+from collections.abc import AsyncIterator, Awaitable, Callable, Iterator
+from typing import Any, TypeVar, overload
+
+from laima.container import Container
+from laima.context import CONTEXT
+from laima.providers.provider import Provider
+from laima.utils.context import Context
+from laima.utils.empty import EMPTY
+from laima.utils.fork import abandon
+from laima.utils.local import Instance, ThreadSlot, defer, raise_errors
+from laima.utils.lock import Lock
+from laima.utils.object import Object
+from laima.utils.offload import Offload
+from laima.utils.status import Status
+from laima.utils.wrappers import provider_wrapper
+
+T = TypeVar("T")
+TypeT = TypeVar("TypeT", bound=type)
+
+
+class ThreadSingleton(Provider[T]):
+    def __init__(self, func: Callable[..., T], *, offload: Offload = False) -> None:
+        super().__init__(
+            func=func,
+            offload=offload,
+        )
+        self._local = threading.local()
+        self._keys = itertools.count()
+        # Every thread's instance is also registered here, so that reset can reach the ones of other threads
+        self._instances: dict[int, Instance[T]] = {}
+        self._instances_lock = threading.Lock()
+        # Instances with an asynchronous teardown left over by a sync `reset`
+        self._deferred: list[Instance[T]] = []
+        self._epoch = 0
+
+    def provide(self) -> T:
+        slot = self._thread_slot()
+        obj = slot.obj
+        if obj is not None and slot.epoch == self._epoch and obj.instance is not EMPTY:
+            return obj.instance  # type: ignore[return-value]
+
+        with slot.lock:
+            if not self._is_current(slot):
+                ctx: Context = Context()
+                token = CONTEXT.set(ctx)
+                try:
+                    slot.obj = Object.create(self._func(), offload=self._offload)
+                except Exception:
+                    self._mark(Status.CORRUPTED)
+                    ctx.close()
+                    raise
+                finally:
+                    CONTEXT.reset(token)
+                self._register(slot, Instance(slot.obj, ctx))
+
+            return slot.obj.get()  # type: ignore[union-attr]
+
+    async def aprovide(self) -> T:
+        slot = self._thread_slot()
+        obj = slot.obj
+        if obj is not None and slot.epoch == self._epoch and obj.instance is not EMPTY:
+            return obj.instance  # type: ignore[return-value]
+
+        # Only tasks of the same thread ever wait on this lock
+        async with slot.lock:
+            if not self._is_current(slot):
+                ctx: Context = Context()
+                token = CONTEXT.set(ctx)
+                try:
+                    slot.obj = await Object.acreate(await self._acall(), offload=self._offload)
+                except Exception:
+                    self._mark(Status.CORRUPTED)
+                    await ctx.aclose()
+                    raise
+                finally:
+                    CONTEXT.reset(token)
+                self._register(slot, Instance(slot.obj, ctx))
+
+            return slot.obj.get()  # type: ignore[union-attr]
+
+    def after_fork(self) -> None:
+        super().after_fork()
+        # Only the forking thread survives, and its instance belongs to the parent
+        abandon(self._local, self._instances)
+        self._local = threading.local()
+        self._instances = {}
+        self._instances_lock = threading.Lock()
+        self._deferred = []
+
+    def reset(self) -> None:
+        # Thread-affine objects cannot be handed over to their own threads, so they are closed by the caller
+        errors = []
+        deferred = []
+        for instance in self._take_instances():
+            if instance.is_async:
+                deferred.append(instance)
+                continue
+            try:
+                instance.close()
+            except Exception as exc:
+                errors.append(exc)
+
+        with self._instances_lock:
+            self._deferred.extend(deferred)
+        defer(self, deferred)
+        self._status = Status.IDLE
+        raise_errors(self, errors)
+
+    async def areset(self) -> None:
+        errors = []
+        for instance in self._take_instances():
+            try:
+                await instance.aclose()
+            except Exception as exc:
+                errors.append(exc)
+        self._status = Status.IDLE
+        raise_errors(self, errors)
+
+    def _is_current(self, slot: ThreadSlot[T]) -> bool:
+        return slot.obj is not None and slot.epoch == self._epoch and slot.obj.instance is not EMPTY
+
+    def _thread_slot(self) -> ThreadSlot[T]:
+        try:
+            return self._local.slot  # type: ignore[no-any-return]
+        except AttributeError:
+            slot: ThreadSlot[T] = ThreadSlot(lock=Lock(), key=next(self._keys))
+            self._local.slot = slot
+            # Runs once the thread exits and its locals are released
+            weakref.finalize(slot, _release, weakref.WeakMethod(self._discard), slot.key)
+            return slot
+
+    def _register(self, slot: ThreadSlot[T], instance: Instance[T]) -> None:
+        with self._instances_lock:
+            # Registered into the current epoch even if a reset ran meanwhile, as the next reset reaches it from here
+            slot.epoch = self._epoch
+            self._instances[slot.key] = instance
+        self._mark(Status.RUNNING)
+
+    def _discard(self, key: int) -> None:
+        with self._instances_lock:
+            instance = self._instances.get(key)
+            # Asynchronous teardown cannot run here, so such instances are left to `areset`
+            if instance is None or instance.is_async:
+                return
+            del self._instances[key]
+        instance.close()
+
+    def _take_instances(self) -> list[Instance[T]]:
+        with self._instances_lock:
+            self._epoch += 1
+            instances = [*self._deferred, *self._instances.values()]
+            self._instances.clear()
+            self._deferred = []
+        return instances
+
+
+def _release(discard: weakref.WeakMethod, key: int) -> None:
+    if (method := discard()) is not None:
+        method(key)
+
+
+@overload
+def thread_singleton(func: TypeT) -> TypeT:  # type: ignore[overload-overlap]
+    pass
+
+
+@overload
+def thread_singleton(func: Callable[..., AsyncIterator[T]]) -> ThreadSingleton[Awaitable[T]]:
+    pass
+
+
+@overload
+def thread_singleton(func: Callable[..., Iterator[T]]) -> ThreadSingleton[T]:
+    pass
+
+
+@overload
+def thread_singleton(func: Callable[..., T]) -> ThreadSingleton[T]:
+    pass
+
+
+@overload
+def thread_singleton(
+    *,
+    bind_to: type | str | None = None,
+    container: Container | None = None,
+    offload: Offload = False,
+) -> Callable[[TypeT], TypeT]:
+    pass
+
+
+@overload
+def thread_singleton(  # type: ignore[overload-cannot-match]
+    *,
+    bind_to: type | str | None = None,
+    container: Container | None = None,
+    offload: Offload = False,
+) -> Callable[[Callable[..., AsyncIterator[T]]], ThreadSingleton[Awaitable[T]]]:
+    pass
+
+
+@overload
+def thread_singleton(  # type: ignore[overload-cannot-match]
+    *,
+    bind_to: type | str | None = None,
+    container: Container | None = None,
+    offload: Offload = False,
+) -> Callable[[Callable[..., Iterator[T]]], ThreadSingleton[T]]:
+    pass
+
+
+@overload
+def thread_singleton(  # type: ignore[overload-cannot-match]
+    *,
+    bind_to: type | str | None = None,
+    container: Container | None = None,
+    offload: Offload = False,
+) -> Callable[[Callable[..., T]], ThreadSingleton[T]]:
+    pass
+
+
+@overload
+def thread_singleton(  # type: ignore[overload-overlap]
+    func: TypeT,
+    *,
+    bind_to: type | str | None = None,
+    container: Container | None = None,
+    offload: Offload = False,
+    override: bool = False,
+) -> TypeT:
+    pass
+
+
+@overload
+def thread_singleton(
+    func: Callable[..., AsyncIterator[T]],
+    *,
+    bind_to: type | str | None = None,
+    container: Container | None = None,
+    offload: Offload = False,
+    override: bool = False,
+) -> ThreadSingleton[Awaitable[T]]:
+    pass
+
+
+@overload
+def thread_singleton(
+    func: Callable[..., Iterator[T]],
+    *,
+    bind_to: type | str | None = None,
+    container: Container | None = None,
+    offload: Offload = False,
+    override: bool = False,
+) -> ThreadSingleton[T]:
+    pass
+
+
+@overload
+def thread_singleton(
+    func: Callable[..., T],
+    *,
+    bind_to: type | str | None = None,
+    container: Container | None = None,
+    offload: Offload = False,
+    override: bool = False,
+) -> ThreadSingleton[T]:
+    pass
+
+
+def thread_singleton(
+    func: Any = None,
+    *,
+    bind_to: type | str | None = None,
+    container: Container | None = None,
+    offload: Offload = False,
+    override: bool = False,
+) -> Any:
+    return provider_wrapper(
+        provider_cls=ThreadSingleton,
+        func=func,
+        bind_to=bind_to,
+        container=container,
+        override=override,
+        options={"offload": offload},
+    )
@@ -6,6 +6,7 @@ from laima.context import CONTEXT
 from laima.exc import LaimaError
 from laima.providers.provider import Provider
 from laima.utils.object import Object, TransientData
+from laima.utils.offload import Offload
 from laima.utils.status import Status
 from laima.utils.wrappers import provider_wrapper
 
@@ -16,53 +17,47 @@ TypeT = TypeVar("TypeT", bound=type)
 
 class Transient(Provider[T]):
     def provide(self) -> T:
+        # Only generator objects have a teardown; anything else is handed over without being tracked by the context
+        if not self._is_generator:
+            self._mark(Status.RUNNING)
+            return self._func()
+
         ctx = CONTEXT.get()
 
         if ctx is None:
-            if self._is_generator:
-                self._status = Status.CORRUPTED
-                raise LaimaError("Transient generator has to be called in context block")
-
-            self._status = Status.RUNNING
-            return self._func()
+            self._mark(Status.CORRUPTED)
+            raise LaimaError("Transient generator has to be called in context block")
 
-        with ctx.lock:
-            if self in ctx:
-                data = ctx[self]
-            else:
-                data = TransientData()
-                ctx[self] = data
+        data = ctx.setdefault(self, TransientData)
 
         result = self._func()
-        obj = Object.create(result)
+        obj = Object.create(result, offload=self._offload)
         data.append(obj)
 
-        self._status = Status.RUNNING
+        self._mark(Status.RUNNING)
         return obj.get()
 
     async def aprovide(self) -> T:
+        if not self._is_generator:
+            self._mark(Status.RUNNING)
+            result = await self._acall()
+            if isinstance(result, Awaitable):
+                return await result
+            return result
+
         ctx = CONTEXT.get()
 
         if ctx is None:
-            if self._is_generator:
-                self._status = Status.CORRUPTED
-                raise LaimaError("Transient generator has to be called in context block")
-
-            self._status = Status.RUNNING
-            return self._func()
+            self._mark(Status.CORRUPTED)
+            raise LaimaError("Transient generator has to be called in context block")
 
-        async with ctx.lock:
-            if self in ctx:
-                data = ctx[self]
-            else:
-                data = TransientData()
-                ctx[self] = data
+        data = ctx.setdefault(self, TransientData)
 
-        result = self._func()
-        obj = await Object.acreate(result)
+        result = await self._acall()
+        obj = await Object.acreate(result, offload=self._offload)
         data.append(obj)
 
-        self._status = Status.RUNNING
+        self._mark(Status.RUNNING)
         return obj.get()
 
 
@@ -91,6 +86,7 @@ def transient(
     *,
     bind_to: type | str | None = None,
     container: Container | None = None,
+    offload: Offload = False,
 ) -> Callable[[TypeT], TypeT]:
     pass
 
@@ -100,6 +96,7 @@ def transient(  # type: ignore[overload-cannot-match]
     *,
     bind_to: type | str | None = None,
     container: Container | None = None,
+    offload: Offload = False,
 ) -> Callable[[Callable[..., AsyncIterator[T]]], Transient[Awaitable[T]]]:
     pass
 
@@ -109,6 +106,7 @@ def transient(  # type: ignore[overload-cannot-match]
     *,
     bind_to: type | str | None = None,
     container: Container | None = None,
+    offload: Offload = False,
 ) -> Callable[[Callable[..., Iterator[T]]], Transient[T]]:
     pass
 
@@ -118,6 +116,7 @@ def transient(  # type: ignore[overload-cannot-match]
     *,
     bind_to: type | str | None = None,
     container: Container | None = None,
+    offload: Offload = False,
 ) -> Callable[[Callable[..., T]], Transient[T]]:
     pass
 
@@ -128,6 +127,7 @@ def transient(  # type: ignore[overload-overlap]
     *,
     bind_to: type | str | None = None,
     container: Container | None = None,
+    offload: Offload = False,
     override: bool = False,
 ) -> TypeT:
     pass
@@ -139,6 +139,7 @@ def transient(
     *,
     bind_to: type | str | None = None,
     container: Container | None = None,
+    offload: Offload = False,
     override: bool = False,
 ) -> Transient[Awaitable[T]]:
     pass
@@ -150,6 +151,7 @@ def transient(
     *,
     bind_to: type | str | None = None,
     container: Container | None = None,
+    offload: Offload = False,
     override: bool = False,
 ) -> Transient[T]:
     pass
@@ -161,6 +163,7 @@ def transient(
     *,
     bind_to: type | str | None = None,
     container: Container | None = None,
+    offload: Offload = False,
     override: bool = False,
 ) -> Transient[T]:
     pass
@@ -171,6 +174,7 @@ def transient(
     *,
     bind_to: type | str | None = None,
     container: Container | None = None,
+    offload: Offload = False,
     override: bool = False,
 ) -> Any:
     return provider_wrapper(
@@ -179,4 +183,5 @@ def transient(
         bind_to=bind_to,
         container=container,
         override=override,
+        options={"offload": offload},
     )
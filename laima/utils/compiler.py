@@ -0,0 +1,110 @@
+import inspect
+from collections.abc import Callable
+from typing import Any
+
+from laima.exc import LaimaError, LaimaTypeError
+from laima.utils.empty import EMPTY
+from laima.utils.plan import InjectionPlan
+
+PREFIX = "_laima_"
+
+
+def compile_wrapper(
+    func: Callable,
+    signature: inspect.Signature,
+    get_plan: Callable[[], InjectionPlan],
+    context_manager: Callable[[], Any],
+) -> Callable:
+    if any(name.startswith(PREFIX) for name in signature.parameters):
+        raise LaimaError(f"Cannot compile {func.__qualname__}; parameter names starting with '{PREFIX}' are reserved")
+
+    namespace: dict[str, Any] = {
+        f"{PREFIX}func": func,
+        f"{PREFIX}get_plan": get_plan,
+        f"{PREFIX}context_manager": context_manager,
+        f"{PREFIX}missing": EMPTY,
+        f"{PREFIX}missing_argument": _missing_argument(func),
+    }
+    params, call_args, injectable = _render_parameters(signature, namespace)
+    is_async = inspect.iscoroutinefunction(func) or inspect.isasyncgenfunction(func)
+
+    body = [f"{PREFIX}providers = {PREFIX}get_plan().providers"]
+    for index, name in enumerate(injectable):
+        body.append(f"if {name} is {PREFIX}missing and {PREFIX}providers[{index}] is None:")
+        body.append(f"    raise {PREFIX}missing_argument('{name}')")
+
+    body.append(f"{'async ' if is_async else ''}with {PREFIX}context_manager():")
+    provide = "await {}.aprovide()" if is_async else "{}.provide()"
+    for index, name in enumerate(injectable):
+        body.append(f"    if {name} is {PREFIX}missing:")
+        body.append(f"        {name} = {provide.format(f'{PREFIX}providers[{index}]')}")
+
+    call = f"{PREFIX}func({', '.join(call_args)})"
+    if inspect.iscoroutinefunction(func):
+        body.append(f"    return await {call}")
+    elif inspect.isasyncgenfunction(func):
+        body.append(f"    async for {PREFIX}item in {call}:")
+        body.append(f"        yield {PREFIX}item")
+    elif inspect.isgeneratorfunction(func):
+        body.append(f"    yield from {call}")
+    else:
+        body.append(f"    return {call}")
+
+    source = "\n".join(
+        [
+            f"{'async ' if is_async else ''}def {PREFIX}wrapper({', '.join(params)}):",
+            *(f"    {line}" for line in body),
+        ],
+    )
+    code = compile(source, f"<laima compiled {func.__qualname__}>", "exec")
+    exec(code, namespace)  # noqa: S102
+    return namespace[f"{PREFIX}wrapper"]
+
+
+def _render_parameters(
+    signature: inspect.Signature,
+    namespace: dict[str, Any],
+) -> tuple[list[str], list[str], list[str]]:
+    params: list[str] = []
+    call_args: list[str] = []
+    injectable: list[str] = []
+    positional_only = False
+    keyword_only = False
+    for index, param in enumerate(signature.parameters.values()):
+        name = param.name
+        if positional_only and param.kind is not param.POSITIONAL_ONLY:
+            params.append("/")
+        positional_only = param.kind is param.POSITIONAL_ONLY
+
+        if param.kind is param.VAR_POSITIONAL:
+            keyword_only = True
+            params.append(f"*{name}")
+            call_args.append(f"*{name}")
+        elif param.kind is param.VAR_KEYWORD:
+            params.append(f"**{name}")
+            call_args.append(f"**{name}")
+        else:
+            if param.kind is param.KEYWORD_ONLY and not keyword_only:
+                keyword_only = True
+                params.append("*")
+
+            if param.default is param.empty:
+                params.append(f"{name}={PREFIX}missing")
+                injectable.append(name)
+            else:
+                namespace[f"{PREFIX}default_{index}"] = param.default
+                params.append(f"{name}={PREFIX}default_{index}")
+
+            call_args.append(f"{name}={name}" if param.kind is param.KEYWORD_ONLY else name)
+
+    if positional_only:
+        params.append("/")
+
+    return params, call_args, injectable
+
+
+def _missing_argument(func: Callable) -> Callable[[str], LaimaTypeError]:
+    def missing_argument(name: str) -> LaimaTypeError:
+        return LaimaTypeError(f"{func.__qualname__} missing a required argument: '{name}'")
+
+    return missing_argument
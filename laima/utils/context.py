@@ -1,35 +1,92 @@
 import asyncio
+import os
+import threading
+from collections.abc import Callable
+from contextvars import ContextVar
 from typing import Generic, TypeVar
 
 from laima.providers.provider import Provider
-from laima.utils.lock import Lock
 from laima.utils.object import Data
 
 TData = TypeVar("TData", bound=Data)
 
+# Guards lazy creation of context locks; only taken by the first provider stored in a context
+_LOCKS_LOCK = threading.Lock()
+
 
 class Context(Generic[TData]):
+    __slots__ = ("_closed", "_data", "_lock", "_owners")
+
     def __init__(self) -> None:
-        self._lock = Lock()
-        self._data: dict[Provider, TData] = {}
+        # Everything is allocated on first store, so contexts that never see a scoped provider stay empty
+        self._data: list[TData | None] | None = None
+        self._owners: list[Provider] | None = None
+        self._lock: threading.Lock | None = None
+        self._closed = False
 
     @property
-    def lock(self) -> Lock:
-        return self._lock
+    def closed(self) -> bool:
+        return self._closed
 
-    def __setitem__(self, provider: Provider, value: TData) -> None:
-        self._data[provider] = value
+    def get(self, provider: Provider) -> TData | None:
+        data = self._data
+        slot = provider.slot
+        if data is None or slot >= len(data):
+            return None
+        return data[slot]
 
-    def __getitem__(self, provider: Provider) -> TData:
-        return self._data[provider]
+    def setdefault(self, provider: Provider, factory: Callable[[], TData]) -> TData:
+        if (value := self.get(provider)) is not None:
+            return value
 
-    def __contains__(self, provider: Provider) -> bool:
-        return provider in self._data
+        with self._get_lock():
+            if (value := self.get(provider)) is None:
+                value = factory()
+                self._store(provider, value)
+            return value
 
     def close(self) -> None:
-        for val in self._data.values():
+        self._closed = True
+        for val in self._values():
             val.close()
 
     async def aclose(self) -> None:
-        await asyncio.gather(*(val.aclose() for val in self._data.values()))
+        self._closed = True
+        await asyncio.gather(*(val.aclose() for val in self._values()))
+
+    def _get_lock(self) -> threading.Lock:
+        if self._lock is None:
+            with _LOCKS_LOCK:
+                if self._lock is None:
+                    self._lock = threading.Lock()
+        return self._lock
+
+    def _store(self, provider: Provider, value: TData) -> None:
+        if self._data is None or self._owners is None:
+            self._data = []
+            self._owners = []
+
+        slot = provider.slot
+        if slot >= len(self._data):
+            self._data.extend([None] * (slot + 1 - len(self._data)))
+        self._data[slot] = value
+        # Owners keep their providers, and therefore their slots, alive for as long as the context is
+        self._owners.append(provider)
+
+    def _values(self) -> list[TData]:
+        if self._data is None or self._owners is None:
+            return []
+        data = self._data
+        return [data[provider.slot] for provider in self._owners]  # type: ignore[misc]
+
+
+def _reinit_locks_lock() -> None:
+    global _LOCKS_LOCK  # noqa: PLW0603
+    _LOCKS_LOCK = threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reinit_locks_lock)
+
 
+CONTEXT: ContextVar[Context | None] = ContextVar("CONTEXT", default=None)
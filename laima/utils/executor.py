@@ -0,0 +1,50 @@
+from collections.abc import Callable
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from contextvars import copy_context
+from functools import partial
+from multiprocessing.util import Finalize
+from typing import Any, ParamSpec, TypeVar
+
+from laima.container import LAIMA_MAIN_CONTAINER, Container
+from laima.exc import LaimaError
+
+T = TypeVar("T")
+P = ParamSpec("P")
+
+PROCESS_POOL_ERROR = "Scopes cannot be carried into other processes, bootstrap the workers with `laima.bootstrap`"
+
+
+# The worker resolves against the scope of the submitting call, so that call has to outlive the work it fans out;
+# scoped objects are closed together with it
+def submit(executor: Executor, fn: Callable[P, T], /, *args: P.args, **kwargs: P.kwargs) -> Future[T]:
+    if isinstance(executor, ProcessPoolExecutor):
+        raise LaimaError(PROCESS_POOL_ERROR)
+    return executor.submit(copy_context().run, partial(fn, *args, **kwargs))
+
+
+class ContextExecutor(Executor):
+    def __init__(self, executor: Executor) -> None:
+        if isinstance(executor, ProcessPoolExecutor):
+            raise LaimaError(PROCESS_POOL_ERROR)
+        self._executor = executor
+
+    @property
+    def executor(self) -> Executor:
+        return self._executor
+
+    def submit(self, fn: Callable[..., T], /, *args: Any, **kwargs: Any) -> Future[T]:
+        return self._executor.submit(copy_context().run, fn, *args, **kwargs)
+
+    def shutdown(self, wait: bool = True, *, cancel_futures: bool = False) -> None:  # noqa: FBT001, FBT002
+        self._executor.shutdown(wait=wait, cancel_futures=cancel_futures)
+
+
+# Meant as the `initializer` of a process pool, so bindings are set up and warmed once per worker instead of once
+# per task. `setup` has to be picklable, e.g. a module level function, and may return the container it bound to;
+# both arguments are positional so that they can be passed as `initargs`.
+def bootstrap(setup: Callable[[], Container | None], warmup: bool = True) -> None:  # noqa: FBT001, FBT002
+    container = setup() or LAIMA_MAIN_CONTAINER
+    if warmup:
+        container.warmup()
+    # Workers exit without running `atexit` hooks, finalizers are the last code multiprocessing runs in them
+    Finalize(None, container.reset, exitpriority=0)
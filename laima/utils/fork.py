@@ -0,0 +1,33 @@
+import os
+import weakref
+from typing import Any, Literal, Protocol
+
+ForkPolicy = Literal["share", "reinit"]
+
+
+class ForkAware(Protocol):
+    def after_fork(self) -> None:
+        pass
+
+
+_OBJECTS: weakref.WeakSet[ForkAware] = weakref.WeakSet()
+# Objects dropped in a forked child belong to the parent; keeping them referenced prevents the garbage collector
+# from running their teardown, which would close resources the parent still uses
+_ABANDONED: list[Any] = []
+
+
+def register(obj: ForkAware) -> None:
+    _OBJECTS.add(obj)
+
+
+def abandon(*objs: Any) -> None:
+    _ABANDONED.extend(obj for obj in objs if obj is not None)
+
+
+def _after_fork_in_child() -> None:
+    for obj in list(_OBJECTS):
+        obj.after_fork()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_after_fork_in_child)
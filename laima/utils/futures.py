@@ -0,0 +1,30 @@
+import asyncio
+import contextlib
+from concurrent.futures import Future
+from functools import partial
+from typing import TypeVar
+
+T = TypeVar("T")
+
+
+async def wait_shared(pending: Future[T]) -> T:
+    # Unlike `wrap_future`, a cancelled waiter leaves the shared future untouched
+    loop = asyncio.get_running_loop()
+    waiter: asyncio.Future[T] = loop.create_future()
+    pending.add_done_callback(partial(_relay, loop, waiter))
+    return await waiter
+
+
+def _relay(loop: asyncio.AbstractEventLoop, waiter: asyncio.Future[T], pending: Future[T]) -> None:
+    # The waiter's event loop may have been closed in the meantime
+    with contextlib.suppress(RuntimeError):
+        loop.call_soon_threadsafe(_resolve, waiter, pending)
+
+
+def _resolve(waiter: asyncio.Future[T], pending: Future[T]) -> None:
+    if waiter.done():
+        return
+    if (error := pending.exception()) is not None:
+        waiter.set_exception(error)
+    else:
+        waiter.set_result(pending.result())
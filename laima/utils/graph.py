@@ -0,0 +1,40 @@
+from collections.abc import Iterable
+
+from laima.exc import LaimaError
+from laima.providers.provider import Provider
+from laima.utils.lazy import LazyProvider
+
+
+def dependencies(provider: Provider) -> list[Provider]:
+    get_plan = getattr(provider.func, "__laima_plan__", None)
+    if get_plan is None:
+        return []
+    return [
+        param.provider.provider if isinstance(param.provider, LazyProvider) else param.provider
+        for param in get_plan().parameters
+        if param.provider is not None
+    ]
+
+
+def topological_levels(providers: Iterable[Provider]) -> list[list[Provider]]:
+    nodes = list(dict.fromkeys(providers))
+    known = set(nodes)
+    pending = {
+        provider: {dep for dep in dependencies(provider) if dep in known and dep is not provider}
+        for provider in nodes
+    }
+
+    levels = []
+    while pending:
+        level = [provider for provider, deps in pending.items() if not deps]
+        if not level:
+            cycle = ", ".join(repr(provider) for provider in pending)
+            raise LaimaError(f"Cannot order providers with circular dependencies: {cycle}")
+
+        for provider in level:
+            del pending[provider]
+        for deps in pending.values():
+            deps.difference_update(level)
+        levels.append(level)
+
+    return levels
@@ -0,0 +1,22 @@
+from collections.abc import Callable, Coroutine
+from typing import Any, TypeVar
+
+from laima.utils.lock import Lock
+
+T = TypeVar("T")
+
+
+# Hooks applied by `Provider.instrument`; each one receives the result of the previous instrument and passes
+# everything through unchanged by default
+class Instrument:
+    def wrap_provide(self, provide: Callable[..., T]) -> Callable[..., T]:
+        return provide
+
+    def wrap_aprovide(self, aprovide: Callable[..., Coroutine[Any, Any, T]]) -> Callable[..., Coroutine[Any, Any, T]]:
+        return aprovide
+
+    def wrap_factory(self, func: Callable[..., Any], *, is_generator: bool, is_async: bool) -> Callable[..., Any]:  # noqa: ARG002
+        return func
+
+    def wrap_lock(self, lock: Lock) -> Lock:
+        return lock
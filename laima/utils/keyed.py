@@ -0,0 +1,61 @@
+from collections.abc import Hashable
+from dataclasses import dataclass, field
+from typing import Any, TypeVar
+
+from laima.exc import LaimaTypeError
+from laima.utils.object import Data
+from laima.utils.refresh import Generation
+
+T = TypeVar("T")
+
+
+def make_key(args: tuple[Any, ...], kwargs: dict[str, Any]) -> Hashable:
+    try:
+        # Always the same shape, so that positional arguments can never spell out the key of keyword ones
+        key = (args, frozenset(kwargs.items()))
+        hash(key)
+    except TypeError:
+        raise LaimaTypeError(f"Keyed provider arguments have to be hashable: {args}, {kwargs}") from None
+    return key
+
+
+# Every key a context has resolved pins its instance until the context is closed, the same as `RefreshingData`
+@dataclass
+class KeyedData(Data[T]):
+    generations: dict[Hashable, Generation[T]] = field(default_factory=dict)
+
+    def close(self) -> None:
+        for generation in self.generations.values():
+            if generation.release():
+                generation.close()
+
+    async def aclose(self) -> None:
+        for generation in self.generations.values():
+            if generation.release():
+                await generation.aclose()
+
+
+@dataclass(frozen=True)
+class KeyedStats:
+    max_size: int
+    size: int
+    hits: int
+    misses: int
+    evictions: int
+    expirations: int
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def to_dict(self) -> dict[str, float]:
+        return {
+            "max_size": self.max_size,
+            "size": self.size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hit_rate,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
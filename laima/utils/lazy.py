@@ -0,0 +1,115 @@
+from collections.abc import Generator, Iterator
+from typing import Any, Generic, TypeVar
+
+from laima.exc import LaimaAsyncError, LaimaError
+from laima.providers.provider import Provider
+from laima.utils.context import CONTEXT, Context
+from laima.utils.empty import EMPTY
+from laima.utils.lock import Lock
+
+T = TypeVar("T")
+
+
+# Forwards attribute access, `await` and the common special methods below to the dependency; any other special
+# method, and `isinstance` checks, act on the proxy itself
+class Lazy(Generic[T]):
+    __slots__ = ("_laima_ctx", "_laima_lock", "_laima_provider", "_laima_value")
+
+    def __init__(self, provider: Provider[T], ctx: Context | None) -> None:
+        self._laima_provider = provider
+        self._laima_ctx = ctx
+        self._laima_lock = Lock()
+        self._laima_value: Any = EMPTY
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._laima_resolve(), name)
+
+    def __await__(self) -> Generator[Any, None, T]:
+        return self._laima_aresolve().__await__()
+
+    def __call__(self, *args: Any, **kwargs: Any) -> Any:
+        return self._laima_resolve()(*args, **kwargs)  # type: ignore[operator]
+
+    def __len__(self) -> int:
+        return len(self._laima_resolve())  # type: ignore[arg-type]
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self._laima_resolve())  # type: ignore[call-overload]
+
+    def __contains__(self, item: object) -> bool:
+        return item in self._laima_resolve()  # type: ignore[operator]
+
+    def __getitem__(self, key: Any) -> Any:
+        return self._laima_resolve()[key]  # type: ignore[index]
+
+    def __bool__(self) -> bool:
+        return bool(self._laima_resolve())
+
+    def __eq__(self, other: object) -> bool:
+        return self._laima_resolve() == other
+
+    def __ne__(self, other: object) -> bool:
+        return self._laima_resolve() != other
+
+    def __hash__(self) -> int:
+        return hash(self._laima_resolve())
+
+    def __str__(self) -> str:
+        return str(self._laima_resolve())
+
+    def __repr__(self) -> str:
+        state = "unresolved" if self._laima_value is EMPTY else repr(self._laima_value)
+        return f"Lazy[{self._laima_provider!r}]({state})"
+
+    def _laima_resolve(self) -> T:
+        if self._laima_value is not EMPTY:
+            return self._laima_value
+        if self._laima_provider.is_async:
+            raise LaimaAsyncError(f"{self._laima_provider!r} is asynchronous; use `await` to resolve it")
+
+        with self._laima_lock:
+            if self._laima_value is EMPTY:
+                # Resolve within the context the proxy was injected in, so the object is closed together with it
+                token = CONTEXT.set(self._laima_check_ctx())
+                try:
+                    self._laima_value = self._laima_provider.provide()
+                finally:
+                    CONTEXT.reset(token)
+            return self._laima_value
+
+    async def _laima_aresolve(self) -> T:
+        if self._laima_value is not EMPTY:
+            return self._laima_value
+
+        async with self._laima_lock:
+            if self._laima_value is EMPTY:
+                token = CONTEXT.set(self._laima_check_ctx())
+                try:
+                    self._laima_value = await self._laima_provider.aprovide()
+                finally:
+                    CONTEXT.reset(token)
+            return self._laima_value
+
+    def _laima_check_ctx(self) -> Context | None:
+        if self._laima_ctx is not None and self._laima_ctx.closed:
+            raise LaimaError(f"{self._laima_provider!r} cannot be resolved after its injection scope has exited")
+        return self._laima_ctx
+
+
+class LazyProvider(Provider[Lazy[T]]):
+    def __init__(self, provider: Provider[T]) -> None:
+        super().__init__(func=provider.func)  # type: ignore[arg-type]
+        self._provider = provider
+
+    @property
+    def provider(self) -> Provider[T]:
+        return self._provider
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__qualname__}({self._provider!r})"
+
+    def provide(self) -> Lazy[T]:
+        return Lazy(self._provider, CONTEXT.get())
+
+    async def aprovide(self) -> Lazy[T]:
+        return Lazy(self._provider, CONTEXT.get())
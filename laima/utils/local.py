@@ -0,0 +1,50 @@
+import warnings
+from collections.abc import AsyncIterator
+from dataclasses import dataclass
+from typing import Any, Generic, TypeVar
+
+from laima.utils.context import Context
+from laima.utils.lock import Lock
+from laima.utils.object import Object
+
+T = TypeVar("T")
+
+
+@dataclass
+class Instance(Generic[T]):
+    obj: Object[T]
+    ctx: Context
+
+    @property
+    def is_async(self) -> bool:
+        return isinstance(self.obj.object, AsyncIterator)
+
+    def close(self) -> None:
+        self.obj.close()
+        self.ctx.close()
+
+    async def aclose(self) -> None:
+        await self.obj.aclose()
+        await self.ctx.aclose()
+
+
+# Lives in a `threading.local`; once the thread exits it is collected, which lets its provider drop the instance
+@dataclass
+class ThreadSlot(Generic[T]):
+    lock: Lock
+    key: int
+    obj: Object[T] | None = None
+    # The provider's reset epoch the object belongs to; a reset bumps it, which invalidates every thread's object
+    epoch: int = 0
+
+
+def defer(owner: Any, instances: list[Any]) -> None:
+    if instances:
+        warnings.warn(
+            f"{owner} has {len(instances)} instance(s) with an asynchronous teardown, which are closed by `areset`",
+        )
+
+
+def raise_errors(owner: Any, errors: list[Exception]) -> None:
+    if errors:
+        raise ExceptionGroup(f"{owner} reset with errors", errors)
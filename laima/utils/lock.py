@@ -1,18 +1,19 @@
 import asyncio
+import os
 import threading
+from collections import deque
 from types import TracebackType
 
+# Guards lazy creation of waiter queues; only taken by async acquirers hitting a contended lock
+_WAITERS_LOCK = threading.Lock()
+
 
 class Lock:
+    __slots__ = ("_thread_lock", "_waiters")
+
     def __init__(self) -> None:
         self._thread_lock = threading.Lock()
-        self._thread_data = threading.local()
-
-    @property
-    def _async_lock(self) -> asyncio.Lock:
-        if not hasattr(self._thread_data, "async_lock"):
-            self._thread_data.async_lock = asyncio.Lock()
-        return self._thread_data.async_lock
+        self._waiters: deque[asyncio.Future[None]] | None = None
 
     def __enter__(self) -> None:
         self.acquire()
@@ -34,18 +35,80 @@ class Lock:
         exc_val: BaseException | None,
         exc_tb: TracebackType | None,
     ) -> None:
-        await self.arelease()
+        self.release()
+
+    def locked(self) -> bool:
+        return self._thread_lock.locked()
 
     def acquire(self) -> None:
         self._thread_lock.acquire()
 
     async def aacquire(self) -> None:
-        await self._async_lock.acquire()
-        self._thread_lock.acquire()
+        if self._thread_lock.acquire(blocking=False):
+            return
+
+        waiters = self._get_waiters()
+        waiter = asyncio.get_running_loop().create_future()
+        waiters.append(waiter)
+
+        # Retry after enqueueing, otherwise a release between the first attempt and the append is lost
+        if self._thread_lock.acquire(blocking=False):
+            self._remove(waiter)
+            return
+
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if not self._remove(waiter):
+                # Ownership has already been handed over to this waiter, pass it on
+                self.release()
+            raise
 
     def release(self) -> None:
+        waiters = self._waiters
+        while waiters:
+            try:
+                waiter = waiters.popleft()
+            except IndexError:
+                break
+
+            # Hand the ownership over directly so that threads cannot starve async waiters
+            try:
+                waiter.get_loop().call_soon_threadsafe(_wake, waiter)
+            except RuntimeError:
+                # The waiter's event loop has been closed
+                continue
+            return
+
         self._thread_lock.release()
 
     async def arelease(self) -> None:
-        self._async_lock.release()
-        self._thread_lock.release()
+        self.release()
+
+    def _get_waiters(self) -> deque[asyncio.Future[None]]:
+        if self._waiters is None:
+            with _WAITERS_LOCK:
+                if self._waiters is None:
+                    self._waiters = deque()
+        return self._waiters
+
+    def _remove(self, waiter: asyncio.Future[None]) -> bool:
+        try:
+            self._waiters.remove(waiter)  # type: ignore[union-attr]
+        except ValueError:
+            return False
+        return True
+
+
+def _reinit_waiters_lock() -> None:
+    global _WAITERS_LOCK  # noqa: PLW0603
+    _WAITERS_LOCK = threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reinit_waiters_lock)
+
+
+def _wake(waiter: asyncio.Future[None]) -> None:
+    if not waiter.done():
+        waiter.set_result(None)
@@ -0,0 +1,257 @@
+import functools
+import threading
+import time
+from collections.abc import AsyncIterator, Awaitable, Callable, Coroutine, Iterator
+from typing import Any, TypeVar
+
+from laima.utils import fork
+from laima.utils.instrument import Instrument
+from laima.utils.lock import Lock
+
+T = TypeVar("T")
+
+# Upper bounds in seconds, the same as the default buckets of the Prometheus client libraries
+BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class Histogram:
+    __slots__ = ("_counts", "_mutex", "_sum")
+
+    def __init__(self) -> None:
+        self._mutex = threading.Lock()
+        self._counts = [0] * (len(BUCKETS) + 1)
+        self._sum = 0.0
+
+    def after_fork(self) -> None:
+        self._mutex = threading.Lock()
+
+    @property
+    def count(self) -> int:
+        return sum(self._counts)
+
+    def observe(self, value: float) -> None:
+        index = next((i for i, bound in enumerate(BUCKETS) if value <= bound), len(BUCKETS))
+        with self._mutex:
+            self._counts[index] += 1
+            self._sum += value
+
+    def to_dict(self) -> dict[str, Any]:
+        with self._mutex:
+            counts = list(self._counts)
+            total = self._sum
+
+        cumulative = 0
+        buckets = {}
+        for bound, count in zip((*BUCKETS, float("inf")), counts, strict=True):
+            cumulative += count
+            buckets[str(bound)] = cumulative
+        return {"count": cumulative, "sum": total, "buckets": buckets}
+
+
+class ProviderMetrics(Instrument):
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self._mutex = threading.Lock()
+        self._resolutions = 0
+        self._creations = 0
+        self._live = 0
+        self.resolution = Histogram()
+        self.creation = Histogram()
+        self.teardown = Histogram()
+        # Waits for the provider lock and for the per-context locks of scoped and pooled providers
+        self.lock_wait = Histogram()
+        fork.register(self)
+
+    @property
+    def resolutions(self) -> int:
+        return self._resolutions
+
+    @property
+    def creations(self) -> int:
+        return self._creations
+
+    @property
+    def cache_hits(self) -> int:
+        # Warmups and background refreshes create objects outside of any resolution
+        return max(self._resolutions - self._creations, 0)
+
+    # Only objects of generator factories are counted, plain objects have no teardown that would end their lifetime
+    @property
+    def live(self) -> int:
+        return self._live
+
+    def after_fork(self) -> None:
+        # A mutex held by another thread at fork time would never be released in the child
+        self._mutex = threading.Lock()
+        for histogram in (self.resolution, self.creation, self.teardown, self.lock_wait):
+            histogram.after_fork()
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "resolutions": self.resolutions,
+            "creations": self.creations,
+            "cache_hits": self.cache_hits,
+            "live": self.live,
+            "resolution_seconds": self.resolution.to_dict(),
+            "creation_seconds": self.creation.to_dict(),
+            "teardown_seconds": self.teardown.to_dict(),
+            "lock_wait_seconds": self.lock_wait.to_dict(),
+        }
+
+    def wrap_provide(self, provide: Callable[..., T]) -> Callable[..., T]:
+        @functools.wraps(provide)
+        def wrapper(*args: Any, **kwargs: Any) -> T:
+            start = time.perf_counter()
+            try:
+                return provide(*args, **kwargs)
+            finally:
+                self._resolved(time.perf_counter() - start)
+
+        return wrapper
+
+    def wrap_aprovide(self, aprovide: Callable[..., Coroutine[Any, Any, T]]) -> Callable[..., Coroutine[Any, Any, T]]:
+        @functools.wraps(aprovide)
+        async def wrapper(*args: Any, **kwargs: Any) -> T:
+            start = time.perf_counter()
+            try:
+                return await aprovide(*args, **kwargs)
+            finally:
+                self._resolved(time.perf_counter() - start)
+
+        return wrapper
+
+    def wrap_lock(self, lock: Lock) -> Lock:
+        return MeteredLock(lock, self.lock_wait)
+
+    # Creation is measured until the instance exists: for generator factories that is their first `yield`,
+    # everything after it is teardown
+    def wrap_factory(self, func: Callable[..., Any], *, is_generator: bool, is_async: bool) -> Callable[..., Any]:
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            start = time.perf_counter()
+            result = func(*args, **kwargs)
+            if is_generator:
+                return self._metered_async_generator(result) if is_async else self._metered_generator(result)
+            if is_async:
+                return self._metered_coroutine(result)
+            self._created(time.perf_counter() - start, tracked=False)
+            return result
+
+        return wrapper
+
+    def _metered_generator(self, gen: Iterator[T]) -> Iterator[T]:
+        start = time.perf_counter()
+        try:
+            instance = next(gen)
+        except StopIteration:
+            return
+        self._created(time.perf_counter() - start, tracked=True)
+        yield instance
+
+        start = time.perf_counter()
+        try:
+            next(gen, None)
+        finally:
+            self._torn_down(time.perf_counter() - start)
+
+    async def _metered_async_generator(self, gen: AsyncIterator[T]) -> AsyncIterator[T]:
+        start = time.perf_counter()
+        try:
+            instance = await anext(gen)
+        except StopAsyncIteration:
+            return
+        self._created(time.perf_counter() - start, tracked=True)
+        yield instance
+
+        start = time.perf_counter()
+        try:
+            await anext(gen, None)
+        finally:
+            self._torn_down(time.perf_counter() - start)
+
+    async def _metered_coroutine(self, coroutine: Awaitable[T]) -> T:
+        start = time.perf_counter()
+        result = await coroutine
+        self._created(time.perf_counter() - start, tracked=False)
+        return result
+
+    def _resolved(self, duration: float) -> None:
+        with self._mutex:
+            self._resolutions += 1
+        self.resolution.observe(duration)
+
+    def _created(self, duration: float, *, tracked: bool) -> None:
+        with self._mutex:
+            self._creations += 1
+            self._live += tracked
+        self.creation.observe(duration)
+
+    def _torn_down(self, duration: float) -> None:
+        with self._mutex:
+            self._live -= 1
+        self.teardown.observe(duration)
+
+
+# Shares the state of the wrapped lock, so swapping it in while the provider is in use never lets two owners in
+class MeteredLock(Lock):
+    __slots__ = ("_histogram", "_inner")
+
+    def __init__(self, inner: Lock, histogram: Histogram) -> None:
+        self._inner = inner
+        self._histogram = histogram
+
+    @property
+    def inner(self) -> Lock:
+        return self._inner
+
+    def locked(self) -> bool:
+        return self._inner.locked()
+
+    def acquire(self) -> None:
+        start = time.perf_counter()
+        self._inner.acquire()
+        self._histogram.observe(time.perf_counter() - start)
+
+    async def aacquire(self) -> None:
+        start = time.perf_counter()
+        await self._inner.aacquire()
+        self._histogram.observe(time.perf_counter() - start)
+
+    def release(self) -> None:
+        self._inner.release()
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def to_prometheus(metrics: list[ProviderMetrics], *, prefix: str = "laima") -> str:
+    lines = []
+    counters = [
+        ("resolutions_total", "counter", "Resolutions per provider", lambda m: m.resolutions),
+        ("creations_total", "counter", "Objects created by the provider factory", lambda m: m.creations),
+        ("cache_hits_total", "counter", "Resolutions served without creating an object", lambda m: m.cache_hits),
+        ("live_objects", "gauge", "Objects of generator factories whose teardown has not run yet", lambda m: m.live),
+    ]
+    for name, kind, description, value in counters:
+        lines += [f"# HELP {prefix}_{name} {description}", f"# TYPE {prefix}_{name} {kind}"]
+        lines += [f'{prefix}_{name}{{provider="{_escape(m.name)}"}} {value(m)}' for m in metrics]
+
+    histograms = [
+        ("resolution_seconds", "Time spent resolving a provider", "resolution"),
+        ("creation_seconds", "Time spent creating an object", "creation"),
+        ("teardown_seconds", "Time spent tearing an object down", "teardown"),
+        ("lock_wait_seconds", "Time spent waiting for the locks of the provider and its scopes", "lock_wait"),
+    ]
+    for name, description, attr in histograms:
+        lines += [f"# HELP {prefix}_{name} {description}", f"# TYPE {prefix}_{name} histogram"]
+        for m in metrics:
+            label = f'provider="{_escape(m.name)}"'
+            data = getattr(m, attr).to_dict()
+            for bound, count in data["buckets"].items():
+                le = "+Inf" if bound == "inf" else bound
+                lines.append(f'{prefix}_{name}_bucket{{{label},le="{le}"}} {count}')
+            lines.append(f"{prefix}_{name}_sum{{{label}}} {data['sum']}")
+            lines.append(f"{prefix}_{name}_count{{{label}}} {data['count']}")
+
+    return "\n".join(lines) + "\n"
@@ -8,6 +8,7 @@ from typing import Generic, TypeVar
 from laima.exc import LaimaAsyncError, LaimaError
 from laima.utils.empty import EMPTY, Empty
 from laima.utils.lock import Lock
+from laima.utils.offload import OFFLOAD_TEARDOWN, Offload, run_sync
 
 T = TypeVar("T")
 
@@ -26,9 +27,10 @@ class Data(Generic[T], ABC):
 class Object(Data[T]):
     object: AsyncIterator[T] | Iterator[T] | Awaitable[T] | T
     instance: T | Empty = EMPTY
+    offload: Offload = False
 
     @classmethod
-    def create(cls, obj: AsyncIterator[T] | Iterator[T] | T) -> "Object":
+    def create(cls, obj: AsyncIterator[T] | Iterator[T] | T, *, offload: Offload = False) -> "Object":
         match obj:
             case AsyncIterator():
                 raise LaimaAsyncError("Object have to be created asynchronously; use `acreate()`")
@@ -40,15 +42,21 @@ class Object(Data[T]):
         return cls(
             object=obj,
             instance=instance,
+            offload=offload,
         )
 
     @classmethod
-    async def acreate(cls, obj: AsyncIterator[T] | Iterator[T] | Awaitable[T] | T) -> "Object":
+    async def acreate(
+        cls,
+        obj: AsyncIterator[T] | Iterator[T] | Awaitable[T] | T,
+        *,
+        offload: Offload = False,
+    ) -> "Object":
         match obj:
             case AsyncIterator():
                 instance = await anext(obj)
             case Iterator():
-                instance = next(obj)
+                instance = await run_sync(offload, _first, obj)
             case Awaitable():
                 instance = await obj
             case _:
@@ -57,6 +65,7 @@ class Object(Data[T]):
         return cls(
             object=obj,
             instance=instance,
+            offload=offload,
         )
 
     def get(self) -> T:
@@ -91,15 +100,21 @@ class Object(Data[T]):
                     self.instance = EMPTY
             case Iterator():
                 try:
-                    next(self.object)
-                except StopIteration:
-                    pass
+                    # StopIteration cannot cross an executor future, so the generator is finished with a default
+                    await run_sync(self.offload or OFFLOAD_TEARDOWN.get(), next, self.object, None)
                 except Exception as exc:
                     warnings.warn(f"Object closed with error: {exc}", stacklevel=2)
                 finally:
                     self.instance = EMPTY
 
 
+def _first(obj: Iterator[T]) -> T:
+    try:
+        return next(obj)
+    except StopIteration:
+        raise LaimaError("Generator finished without yielding an object") from None
+
+
 @dataclass()
 class TransientData(Data[T]):
     objects: list[Object[T]] = field(default_factory=list)
@@ -0,0 +1,23 @@
+import asyncio
+from collections.abc import Callable
+from concurrent.futures import Executor
+from contextvars import ContextVar, copy_context
+from typing import Any, TypeVar
+
+R = TypeVar("R")
+
+Offload = bool | Executor
+
+# Set while a container tears down asynchronously, so that sync generators finish off the event loop even when their
+# provider does not offload; per-scope teardown keeps running inline
+OFFLOAD_TEARDOWN: ContextVar[bool] = ContextVar("OFFLOAD_TEARDOWN", default=False)
+
+
+async def run_sync(offload: Offload, func: Callable[..., R], *args: Any) -> R:
+    if offload is False:
+        return func(*args)
+
+    # The copied context carries the current scope, so injection inside the worker resolves against it
+    executor = None if offload is True else offload
+    ctx = copy_context()
+    return await asyncio.get_running_loop().run_in_executor(executor, ctx.run, func, *args)
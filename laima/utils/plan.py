@@ -0,0 +1,121 @@
+import inspect
+from collections.abc import Callable
+from dataclasses import dataclass
+from functools import cached_property
+from typing import Annotated, Any, get_args, get_origin
+
+from laima.container import Container
+from laima.exc import LaimaTypeError
+from laima.providers.provider import Provider
+from laima.utils.lazy import Lazy, LazyProvider
+
+
+@dataclass(frozen=True)
+class PlanParameter:
+    name: str
+    index: int | None
+    positional_only: bool
+    provider: Provider | None
+
+
+@dataclass(frozen=True)
+class InjectionPlan:
+    qualname: str
+    version: int
+    parameters: tuple[PlanParameter, ...]
+    # Built from a frozen container, whose bindings can no longer change
+    final: bool = False
+
+    @cached_property
+    def providers(self) -> tuple[Provider | None, ...]:
+        return tuple(param.provider for param in self.parameters)
+
+    @classmethod
+    def build(
+        cls,
+        func: Callable,
+        signature: inspect.Signature,
+        container: Container,
+        *,
+        lazy: bool = False,
+    ) -> "InjectionPlan":
+        # The version has to be read before the registry so that a concurrent bind invalidates this plan; a container
+        # seen frozen here is never bound again
+        final = container.frozen
+        version = container.version
+        parameters = []
+        for index, param in enumerate(signature.parameters.values()):
+            if param.kind in (param.VAR_POSITIONAL, param.VAR_KEYWORD) or param.default is not param.empty:
+                continue
+
+            parameters.append(
+                PlanParameter(
+                    name=param.name,
+                    index=None if param.kind is param.KEYWORD_ONLY else index,
+                    positional_only=param.kind is param.POSITIONAL_ONLY,
+                    provider=resolve_provider(param.annotation, container, lazy=lazy),
+                ),
+            )
+
+        return cls(
+            qualname=func.__qualname__,
+            version=version,
+            parameters=tuple(parameters),
+            final=final,
+        )
+
+    def missing(self, args: tuple[Any, ...], kwargs: dict[str, Any]) -> list[tuple[PlanParameter, Provider]]:
+        n_args = len(args)
+        missing = []
+        for param in self.parameters:
+            if param.index is not None and param.index < n_args:
+                continue
+            if not param.positional_only and param.name in kwargs:
+                continue
+            if param.provider is None:
+                raise LaimaTypeError(f"{self.qualname} missing a required argument: '{param.name}'")
+            missing.append((param, param.provider))
+        return missing
+
+    @staticmethod
+    def apply(
+        args: tuple[Any, ...],
+        kwargs: dict[str, Any],
+        missing: list[tuple[PlanParameter, Provider]],
+        values: list[Any],
+    ) -> tuple[tuple[Any, ...], dict[str, Any]]:
+        positional = []
+        for (param, _), value in zip(missing, values, strict=True):
+            if param.positional_only:
+                positional.append(value)
+            else:
+                kwargs[param.name] = value
+
+        if positional:
+            args = (*args, *positional)
+        return args, kwargs
+
+
+def resolve_provider(annotation: Any, container: Container, *, lazy: bool = False) -> Provider | None:
+    if get_origin(annotation) is Lazy:
+        (annotation,) = get_args(annotation)
+        lazy = True
+
+    provider = _lookup_provider(annotation, container)
+    if provider is not None and lazy:
+        return LazyProvider(provider)
+    return provider
+
+
+def _lookup_provider(annotation: Any, container: Container) -> Provider | None:
+    if provider := container.get(annotation, default=None):
+        return provider
+
+    if get_origin(annotation) is Annotated:
+        annot_args = get_args(annotation)
+        if len(annot_args) == 2:
+            _, annot_meta = annot_args
+            if callable(annot_meta) or isinstance(annot_meta, (str, Provider)):
+                return container.get(annot_meta, default=None)
+
+    return None
@@ -0,0 +1,233 @@
+import asyncio
+import threading
+import time
+import warnings
+from collections import deque
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from typing import Generic, TypeVar
+
+from laima.exc import LaimaAsyncError, LaimaError
+from laima.utils.context import Context
+from laima.utils.lock import Lock
+from laima.utils.object import Data, Object
+
+T = TypeVar("T")
+
+
+@dataclass
+class Lease(Generic[T]):
+    obj: Object[T]
+    ctx: Context
+    generation: int
+
+    def close(self) -> None:
+        self.obj.close()
+        self.ctx.close()
+
+    async def aclose(self) -> None:
+        await self.obj.aclose()
+        await self.ctx.aclose()
+
+
+@dataclass(frozen=True)
+class PoolStats:
+    max_size: int
+    size: int
+    idle: int
+    waiting: int
+    hits: int
+    misses: int
+    wait_time: float
+    max_wait_time: float
+
+    @property
+    def in_use(self) -> int:
+        return self.size - self.idle
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def to_dict(self) -> dict[str, float]:
+        return {
+            "max_size": self.max_size,
+            "size": self.size,
+            "idle": self.idle,
+            "in_use": self.in_use,
+            "waiting": self.waiting,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hit_rate,
+            "wait_time": self.wait_time,
+            "max_wait_time": self.max_wait_time,
+        }
+
+
+# Only bookkeeping of leases; creating and closing objects is left to the caller. `acquire` returns an idle lease
+# or `None`, in which case the caller has reserved a slot and has to either create a new object and register it
+# with `lease`, or give the slot back with `discard`.
+class Pool(Generic[T]):
+    def __init__(self, *, max_size: int, min_size: int = 0) -> None:
+        if max_size < 1 or not 0 <= min_size <= max_size:
+            raise LaimaError(f"Invalid pool size: min_size={min_size}, max_size={max_size}")
+
+        self._max_size = max_size
+        self._min_size = min_size
+        self._mutex = threading.Lock()
+        self._idle: deque[Lease[T]] = deque()
+        self._waiters: deque[Future[Lease[T] | None]] = deque()
+        self._size = 0
+        self._generation = 0
+        self._hits = 0
+        self._misses = 0
+        self._wait_time = 0.0
+        self._max_wait_time = 0.0
+
+    @property
+    def min_size(self) -> int:
+        return self._min_size
+
+    def stats(self) -> PoolStats:
+        with self._mutex:
+            return PoolStats(
+                max_size=self._max_size,
+                size=self._size,
+                idle=len(self._idle),
+                waiting=len(self._waiters),
+                hits=self._hits,
+                misses=self._misses,
+                wait_time=self._wait_time,
+                max_wait_time=self._max_wait_time,
+            )
+
+    def acquire(self, wait_timeout: float | None = None) -> Lease[T] | None:
+        future = self._checkout()
+        if future.done():
+            return future.result()
+
+        start = time.perf_counter()
+        try:
+            result = future.result(timeout=wait_timeout)
+        except TimeoutError:
+            if future.cancel():
+                raise LaimaError(f"Pool exhausted; no object returned within {wait_timeout} seconds") from None
+            result = future.result()
+
+        self._record_wait(time.perf_counter() - start)
+        return result
+
+    async def aacquire(self, wait_timeout: float | None = None) -> Lease[T] | None:
+        future = self._checkout()
+        if future.done():
+            return future.result()
+
+        start = time.perf_counter()
+        try:
+            result = await asyncio.wait_for(asyncio.wrap_future(future), timeout=wait_timeout)
+        except (TimeoutError, asyncio.CancelledError) as exc:
+            if not future.cancel():
+                # The lease has already been handed over to this waiter, give it back
+                future.add_done_callback(self._give_back)
+            if isinstance(exc, TimeoutError):
+                raise LaimaError(f"Pool exhausted; no object returned within {wait_timeout} seconds") from None
+            raise
+
+        self._record_wait(time.perf_counter() - start)
+        return result
+
+    def lease(self, obj: Object[T], ctx: Context) -> Lease[T]:
+        return Lease(obj=obj, ctx=ctx, generation=self._generation)
+
+    def release(self, lease: Lease[T]) -> bool:
+        with self._mutex:
+            if lease.generation != self._generation:
+                waiter = self._free_slot()
+                fresh = False
+            else:
+                waiter = self._next_waiter()
+                fresh = True
+                if waiter is None:
+                    self._idle.append(lease)
+                else:
+                    self._hits += 1
+
+        # Waiters are resolved outside the mutex since resolving runs their callbacks
+        if waiter is not None:
+            waiter.set_result(lease if fresh else None)
+        return fresh
+
+    def discard(self) -> None:
+        with self._mutex:
+            waiter = self._free_slot()
+        if waiter is not None:
+            waiter.set_result(None)
+
+    def clear(self) -> list[Lease[T]]:
+        with self._mutex:
+            self._generation += 1
+            leases = list(self._idle)
+            self._idle.clear()
+            self._size -= len(leases)
+            return leases
+
+    def _checkout(self) -> Future[Lease[T] | None]:
+        future: Future[Lease[T] | None] = Future()
+        with self._mutex:
+            if self._idle:
+                self._hits += 1
+                future.set_result(self._idle.pop())
+            elif self._size < self._max_size:
+                self._size += 1
+                self._misses += 1
+                future.set_result(None)
+            else:
+                self._waiters.append(future)
+        return future
+
+    def _free_slot(self) -> Future[Lease[T] | None] | None:
+        # Hand the slot over to a waiter, so that it can create a replacement object
+        waiter = self._next_waiter()
+        if waiter is None:
+            self._size -= 1
+        else:
+            self._misses += 1
+        return waiter
+
+    def _next_waiter(self) -> Future[Lease[T] | None] | None:
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if waiter.set_running_or_notify_cancel():
+                return waiter
+        return None
+
+    def _give_back(self, future: Future[Lease[T] | None]) -> None:
+        lease = future.result()
+        if lease is None:
+            self.discard()
+        elif not self.release(lease):
+            try:
+                lease.close()
+            except LaimaAsyncError:
+                warnings.warn(f"Stale pooled object {lease.obj} could not be closed synchronously", stacklevel=2)
+
+    def _record_wait(self, duration: float) -> None:
+        with self._mutex:
+            self._wait_time += duration
+            self._max_wait_time = max(self._max_wait_time, duration)
+
+
+@dataclass
+class PooledData(Data[T]):
+    pool: Pool[T]
+    lock: Lock = field(default_factory=Lock)
+    lease: Lease[T] | None = None
+
+    def close(self) -> None:
+        if self.lease is not None and not self.pool.release(self.lease):
+            self.lease.close()
+
+    async def aclose(self) -> None:
+        if self.lease is not None and not self.pool.release(self.lease):
+            await self.lease.aclose()
@@ -0,0 +1,91 @@
+import threading
+from dataclasses import dataclass, field
+from typing import Generic, TypeVar
+
+from laima.utils.context import Context
+from laima.utils.object import Data, Object
+
+T = TypeVar("T")
+
+
+@dataclass
+class Generation(Generic[T]):
+    obj: Object[T]
+    ctx: Context
+    number: int
+    created_at: float
+    expires_at: float
+    _lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False)
+    _users: int = field(default=0, init=False)
+    _retired: bool = field(default=False, init=False)
+    _closed: bool = field(default=False, init=False)
+
+    # Each of `acquire`, `release` and `retire` decides under the lock whether this generation may still be handed
+    # out or has to be closed; the caller that receives `True` from the last two is the one closing it
+    def acquire(self) -> bool:
+        with self._lock:
+            if self._closed:
+                return False
+            self._users += 1
+            return True
+
+    def release(self) -> bool:
+        with self._lock:
+            self._users -= 1
+            return self._try_close()
+
+    def retire(self) -> bool:
+        with self._lock:
+            self._retired = True
+            return self._try_close()
+
+    def close(self) -> None:
+        self.obj.close()
+        self.ctx.close()
+
+    async def aclose(self) -> None:
+        await self.obj.aclose()
+        await self.ctx.aclose()
+
+    def _try_close(self) -> bool:
+        if self._retired and not self._users and not self._closed:
+            self._closed = True
+            return True
+        return False
+
+
+@dataclass
+class RefreshingData(Data[T]):
+    generation: Generation[T]
+
+    def close(self) -> None:
+        if self.generation.release():
+            self.generation.close()
+
+    async def aclose(self) -> None:
+        if self.generation.release():
+            await self.generation.aclose()
+
+
+@dataclass(frozen=True)
+class RefreshStats:
+    generation: int
+    age: float | None
+    refreshes: int
+    failures: int
+    last_duration: float
+    max_duration: float
+    total_duration: float
+    last_error: str | None
+
+    def to_dict(self) -> dict[str, float | str | None]:
+        return {
+            "generation": self.generation,
+            "age": self.age,
+            "refreshes": self.refreshes,
+            "failures": self.failures,
+            "last_duration": self.last_duration,
+            "max_duration": self.max_duration,
+            "total_duration": self.total_duration,
+            "last_error": self.last_error,
+        }
@@ -0,0 +1,32 @@
+import heapq
+import threading
+
+from laima.utils import fork
+
+
+# Hands out small integer ids that index per-context storage. Released ids are reused lowest first,
+# so that context arrays stay as short as the number of live providers.
+class SlotAllocator:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._free: list[int] = []
+        self._next = 0
+        fork.register(self)
+
+    def allocate(self) -> int:
+        with self._lock:
+            if self._free:
+                return heapq.heappop(self._free)
+            slot = self._next
+            self._next += 1
+            return slot
+
+    def release(self, slot: int) -> None:
+        with self._lock:
+            heapq.heappush(self._free, slot)
+
+    def after_fork(self) -> None:
+        self._lock = threading.Lock()
+
+
+SLOTS = SlotAllocator()
@@ -0,0 +1,92 @@
+import asyncio
+import os
+import threading
+import weakref
+from collections.abc import Coroutine
+from contextvars import ContextVar
+from typing import Any
+
+# Guards the trackers of all loops; only taken when a structured scope is opened or closed
+_TRACKERS_LOCK = threading.Lock()
+_TRACKERS: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, "TaskTracker"] = weakref.WeakKeyDictionary()
+
+# The innermost structured scope; tasks inherit it, so it also tells apart scopes that share a reused context
+SCOPE: ContextVar[object | None] = ContextVar("SCOPE", default=None)
+
+
+# Chained in front of the loop's task factory while structured scopes are open on it, and records every task
+# created inside one of those scopes
+class TaskTracker:
+    def __init__(self, loop: asyncio.AbstractEventLoop) -> None:
+        self._loop = loop
+        self._previous = loop.get_task_factory()
+        self._scopes: dict[object, set[asyncio.Future[Any]]] = {}
+        loop.set_task_factory(self._factory)  # type: ignore[arg-type]
+
+    def open(self, scope: object) -> None:
+        self._scopes[scope] = set()
+
+    async def wait(self, scope: object) -> None:
+        children = self._scopes[scope]
+        try:
+            # Children may spawn further children, which join the same set
+            while children:
+                await asyncio.wait(list(children))
+        except asyncio.CancelledError:
+            # Cancelling the owner cancels its children, the scope is still only closed once they are done
+            for child in children:
+                child.cancel()
+            await asyncio.gather(*children, return_exceptions=True)
+            raise
+        finally:
+            self._release(scope)
+
+    def _release(self, scope: object) -> None:
+        del self._scopes[scope]
+        if self._scopes:
+            return
+
+        with _TRACKERS_LOCK:
+            _TRACKERS.pop(self._loop, None)
+        # A factory installed after this one has chained onto it, so it has to stay in place
+        if self._loop.get_task_factory() == self._factory:
+            self._loop.set_task_factory(self._previous)
+
+    def _factory(
+        self,
+        loop: asyncio.AbstractEventLoop,
+        coro: Coroutine[Any, Any, Any],
+        **kwargs: Any,
+    ) -> asyncio.Future[Any]:
+        if self._previous is None:
+            task: asyncio.Future[Any] = asyncio.Task(coro, loop=loop, **kwargs)
+        else:
+            task = self._previous(loop, coro, **kwargs)  # type: ignore[call-arg]
+
+        context = kwargs.get("context")
+        scope = SCOPE.get() if context is None else context.get(SCOPE)
+        children = self._scopes.get(scope) if scope is not None else None
+        if children is not None and not task.done():
+            children.add(task)
+            task.add_done_callback(children.discard)
+        return task
+
+
+def track() -> tuple[TaskTracker, object]:
+    loop = asyncio.get_running_loop()
+    with _TRACKERS_LOCK:
+        tracker = _TRACKERS.get(loop)
+        if tracker is None:
+            tracker = _TRACKERS[loop] = TaskTracker(loop)
+    scope = object()
+    tracker.open(scope)
+    return tracker, scope
+
+
+def _reinit_trackers_lock() -> None:
+    global _TRACKERS_LOCK  # noqa: PLW0603
+    _TRACKERS_LOCK = threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reinit_trackers_lock)
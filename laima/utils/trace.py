@@ -0,0 +1,202 @@
+import functools
+import json
+import os
+import threading
+import time
+import warnings
+from collections import deque
+from collections.abc import Callable, Coroutine
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, TypeVar
+
+from laima.exc import LaimaError
+from laima.providers.provider import Provider
+from laima.utils.instrument import Instrument
+
+T = TypeVar("T")
+
+# The span resolutions are recorded into; only set inside a sampled `inject`, so untraced calls never see one
+TRACE: ContextVar["Span | None"] = ContextVar("TRACE", default=None)
+
+
+@dataclass
+class Span:
+    name: str
+    lifetime: str
+    created: bool = False
+    start: float = field(default_factory=time.perf_counter)
+    end: float | None = None
+    thread: int = field(default_factory=threading.get_ident)
+    children: list["Span"] = field(default_factory=list)
+
+    @property
+    def finished(self) -> bool:
+        return self.end is not None
+
+    @property
+    def duration(self) -> float:
+        return (self.end or time.perf_counter()) - self.start
+
+    def open(self, name: str, lifetime: str) -> "Span":
+        child = Span(name=name, lifetime=lifetime)
+        self.children.append(child)
+        return child
+
+    def close(self) -> None:
+        self.end = time.perf_counter()
+
+    def to_dict(self, origin: float | None = None) -> dict[str, Any]:
+        origin = self.start if origin is None else origin
+        return {
+            "name": self.name,
+            "lifetime": self.lifetime,
+            "created": self.created,
+            "offset": self.start - origin,
+            "duration": self.duration,
+            "children": [child.to_dict(origin) for child in self.children],
+        }
+
+
+@dataclass(frozen=True)
+class Trace:
+    root: Span
+    pid: int = field(default_factory=os.getpid)
+
+    def to_dict(self) -> dict[str, Any]:
+        return self.root.to_dict()
+
+    def to_json(self, **kwargs: Any) -> str:
+        return json.dumps(self.to_dict(), **kwargs)
+
+    # Complete ("X") events of the Trace Event Format, loadable by chrome://tracing, Perfetto and speedscope
+    def to_chrome_trace(self) -> dict[str, Any]:
+        origin = self.root.start
+        events = []
+        pending = [self.root]
+        while pending:
+            span = pending.pop()
+            events.append(
+                {
+                    "name": span.name,
+                    "cat": span.lifetime,
+                    "ph": "X",
+                    "ts": (span.start - origin) * 1_000_000,
+                    "dur": span.duration * 1_000_000,
+                    "pid": self.pid,
+                    "tid": span.thread,
+                    "args": {"created": span.created},
+                },
+            )
+            pending.extend(reversed(span.children))
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+
+class TraceProbe(Instrument):
+    def __init__(self, name: str, lifetime: str) -> None:
+        self.name = name
+        self.lifetime = lifetime
+
+    def wrap_provide(self, provide: Callable[..., T]) -> Callable[..., T]:
+        @functools.wraps(provide)
+        def wrapper(*args: Any, **kwargs: Any) -> T:
+            parent = TRACE.get()
+            # Background refreshes may outlive the call they were started from
+            if parent is None or parent.finished:
+                return provide(*args, **kwargs)
+
+            span = parent.open(self.name, self.lifetime)
+            token = TRACE.set(span)
+            try:
+                return provide(*args, **kwargs)
+            finally:
+                TRACE.reset(token)
+                span.close()
+
+        return wrapper
+
+    def wrap_aprovide(self, aprovide: Callable[..., Coroutine[Any, Any, T]]) -> Callable[..., Coroutine[Any, Any, T]]:
+        @functools.wraps(aprovide)
+        async def wrapper(*args: Any, **kwargs: Any) -> T:
+            parent = TRACE.get()
+            if parent is None or parent.finished:
+                return await aprovide(*args, **kwargs)
+
+            span = parent.open(self.name, self.lifetime)
+            token = TRACE.set(span)
+            try:
+                return await aprovide(*args, **kwargs)
+            finally:
+                TRACE.reset(token)
+                span.close()
+
+        return wrapper
+
+    # The factory is only called by the provider when there is nothing to reuse
+    def wrap_factory(self, func: Callable[..., Any], *, is_generator: bool, is_async: bool) -> Callable[..., Any]:  # noqa: ARG002
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            span = TRACE.get()
+            if span is not None:
+                span.created = True
+            return func(*args, **kwargs)
+
+        return wrapper
+
+
+class Tracer:
+    def __init__(
+        self,
+        *,
+        sample_rate: float = 1.0,
+        on_trace: Callable[[Trace], None] | None = None,
+        max_traces: int = 100,
+    ) -> None:
+        if not 0.0 <= sample_rate <= 1.0:
+            raise LaimaError(f"Invalid sample rate: {sample_rate}")
+
+        self._sample_rate = sample_rate
+        self._on_trace = on_trace
+        self._traces: deque[Trace] = deque(maxlen=max_traces)
+        self._credit = 0.0
+        self._probes: dict[Provider, TraceProbe] = {}
+
+    @property
+    def sample_rate(self) -> float:
+        return self._sample_rate
+
+    @property
+    def traces(self) -> list[Trace]:
+        return list(self._traces)
+
+    # Sampling spreads traced calls evenly instead of drawing random numbers; concurrent callers may race on the
+    # credit, which only skews the rate slightly
+    def start(self, name: str) -> Span | None:
+        self._credit += self._sample_rate
+        if self._credit < 1.0:
+            return None
+        self._credit -= 1.0
+        return Span(name=name, lifetime="inject")
+
+    def finish(self, root: Span) -> Trace:
+        root.close()
+        trace = Trace(root=root)
+        self._traces.append(trace)
+        if self._on_trace is not None:
+            # An exporter failing must not fail the traced call or mask its own error
+            try:
+                self._on_trace(trace)
+            except Exception as exc:
+                warnings.warn(f"Trace callback failed with error: {exc}", stacklevel=2)
+        return trace
+
+    def attach(self, name: str, provider: Provider) -> None:
+        if provider not in self._probes:
+            probe = TraceProbe(name, provider.__class__.__qualname__)
+            self._probes[provider] = probe
+            provider.instrument(probe)
+
+    def detach(self) -> None:
+        for provider, probe in self._probes.items():
+            provider.uninstrument(probe)
+        self._probes.clear()
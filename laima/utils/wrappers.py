@@ -1,4 +1,6 @@
+import inspect
 from collections.abc import Callable
+from functools import partial
 from typing import Any, cast
 
 from laima.container import LAIMA_MAIN_CONTAINER, Container
@@ -6,17 +8,38 @@ from laima.context import inject
 from laima.exc import LaimaError
 from laima.providers.provider import Provider
 
+VARIADIC = (inspect.Parameter.VAR_POSITIONAL, inspect.Parameter.VAR_KEYWORD)
+
 
 class ClassWrapper:
-    def __init__(self, cls: type[object]) -> None:
+    def __init__(self, cls: type[object], container: Container) -> None:
         self.cls = cls
+        self.container = container
         self.origin_new = cls.__new__
         self.origin_init = cls.__init__
+        self.init = self._prepare_init()
+        if (get_plan := getattr(self.init, "__laima_plan__", None)) is not None:
+            self.__laima_plan__ = get_plan
+
+    def _prepare_init(self) -> Callable[..., None] | None:
+        if self.origin_init is object.__init__:
+            return None
+
+        if getattr(self.origin_init, "__laima_inject__", False):
+            return self.origin_init
+
+        parameters = list(inspect.signature(self.origin_init).parameters.values())[1:]
+        if all(param.default is not param.empty or param.kind in VARIADIC for param in parameters):
+            return self.origin_init
 
-    def __call__(self) -> Any:
+        return inject(container=self.container, compile=True)(self.origin_init)
+
+    def __call__(self, *args: Any, **kwargs: Any) -> Any:
         instance = self.origin_new(self.cls)
-        if self.origin_init is not object.__init__:
-            inject(self.origin_init)(instance)
+        if self.init is not None:
+            self.init(instance, *args, **kwargs)
+        elif args or kwargs:
+            raise LaimaError(f"Provider '{self.cls.__qualname__}' takes no parameters")
         return instance
 
 
@@ -30,11 +53,9 @@ class ClassInitWrapper:
         if instance is None:
             raise LaimaError("Init requires an instance")
 
-        def init(*args: Any, **kwargs: Any) -> None:
-            if type(instance) is not self.cls:
-                self.origin_init(instance, *args, **kwargs)
-
-        return init
+        if type(instance) is self.cls:
+            return _skip_init
+        return partial(self.origin_init, instance)
 
 
 class ClassNewWrapper:
@@ -45,9 +66,9 @@ class ClassNewWrapper:
 
     def __call__(self, cls: type[object], *args: Any, **kwargs: Any) -> Any:
         if self.cls is cls:
-            if args or kwargs:
+            if (args or kwargs) and not self.provider.accepts_arguments:
                 raise LaimaError(f"Provider '{cls.__qualname__}' takes no external parameters")
-            instance = self.provider()
+            instance = self.provider(*args, **kwargs)
         elif self.origin_new is object.__new__:
             instance = object.__new__(cls)
         else:
@@ -56,6 +77,10 @@ class ClassNewWrapper:
         return instance
 
 
+def _skip_init(*args: Any, **kwargs: Any) -> None:
+    pass
+
+
 def provider_wrapper(
     *,
     provider_cls: type[Provider],
@@ -63,8 +88,10 @@ def provider_wrapper(
     bind_to: type | str | None = None,
     container: Container | None = None,
     override: bool = False,
+    options: dict[str, Any] | None = None,
 ) -> Any:
     container = container or LAIMA_MAIN_CONTAINER
+    options = options or {}
 
     def wrapper(f: Callable) -> Any:
         if isinstance(f, Provider):
@@ -72,15 +99,15 @@ def provider_wrapper(
 
         if isinstance(f, type):
             cls = cast("type[object]", f)
-            class_wrapper = ClassWrapper(cls)
-            provider = provider_cls(class_wrapper)
+            class_wrapper = ClassWrapper(cls, container)
+            provider = provider_cls(class_wrapper, **options)
             cls.__new__ = ClassNewWrapper(cls, provider)  # type: ignore[method-assign]
             cls.__init__ = ClassInitWrapper(cls)  # type: ignore[method-assign]
             container.bind(provider, to=bind_to or cls, override=override)
             return cls
 
-        f = inject(f)
-        provider = provider_cls(f)
+        f = inject(container=container)(f)
+        provider = provider_cls(f, **options)
 
         container.bind(provider, to=bind_to or f"{f.__module__}:{f.__qualname__}", override=override)
 
@@ -0,0 +1,192 @@
+import asyncio
+import threading
+import time
+from collections.abc import AsyncIterator, Iterator
+from unittest.mock import Mock
+
+import pytest
+
+import laima
+from laima.exc import LaimaError, LaimaTypeError
+
+
+def test_keyed__instance_per_key() -> None:
+    func = laima.keyed(lambda region: Mock(region=region), container=laima.Container())
+
+    assert isinstance(func, laima.Keyed)
+    assert func("eu") is func("eu")
+    assert func("eu") is not func("us")
+    assert func(region="eu") is not func("eu")
+    assert func.stats.misses == 3
+
+    with pytest.raises(LaimaTypeError):
+        func(["eu"])
+
+
+def test_keyed__positional_arguments_do_not_collide_with_keyword_arguments() -> None:
+    func = laima.keyed(lambda *args, **kwargs: Mock(args=args, kwargs=kwargs), container=laima.Container())
+
+    assert func(1, x=2) is not func((1,), (("x", 2),))
+    assert func(1, x=2, y=3) is func(1, y=3, x=2)
+
+
+def test_keyed__class_accepts_arguments() -> None:
+    class Client:
+        def __init__(self, tenant: str) -> None:
+            self.tenant = tenant
+
+    laima.keyed(Client, container=laima.Container())
+
+    assert Client("a") is Client("a")
+    assert Client("a") is not Client("b")
+    assert Client("b").tenant == "b"
+
+
+def test_keyed__lru_eviction_runs_teardown() -> None:
+    events = []
+
+    def create_client(tenant: str) -> Iterator[str]:
+        yield tenant
+        events.append(tenant)
+
+    func = laima.keyed(create_client, container=laima.Container(), max_size=2)
+
+    func("a")
+    func("b")
+    func("a")
+    func("c")
+
+    assert events == ["b"]
+    assert func.stats.evictions == 1
+
+    func.reset()
+    assert sorted(events) == ["a", "b", "c"]
+
+
+def test_keyed__evicted_instance_closed_after_context() -> None:
+    events = []
+
+    def create_client(tenant: str) -> Iterator[str]:
+        yield tenant
+        events.append(tenant)
+
+    func = laima.keyed(create_client, container=laima.Container(), max_size=1)
+
+    with laima.inject():
+        func("a")
+        func("b")
+        assert events == []
+    assert events == ["a"]
+    func.reset()
+
+
+def test_keyed__ttl_expiration() -> None:
+    func = laima.keyed(lambda tenant: Mock(tenant=tenant), container=laima.Container(), ttl=0.01)
+
+    first = func("a")
+    time.sleep(0.02)
+
+    assert func("a") is not first
+    assert func.stats.expirations == 1
+
+
+def test_keyed__concurrent_creation_is_coalesced() -> None:
+    calls = []
+    started = threading.Event()
+    release = threading.Event()
+
+    def create_client(tenant: str) -> Mock:
+        calls.append(tenant)
+        started.set()
+        release.wait()
+        return Mock()
+
+    func = laima.keyed(create_client, container=laima.Container())
+    results: list[object] = []
+    threads = [threading.Thread(target=lambda: results.append(func("a"))) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    started.wait()
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert calls == ["a"]
+    assert len({id(result) for result in results}) == 1
+
+
+async def test_keyed__async_coalesced_and_failures_retried() -> None:
+    attempts = []
+
+    async def create_session(tenant: str) -> AsyncIterator[Mock]:
+        attempts.append(tenant)
+        await asyncio.sleep(0.01)
+        if len(attempts) == 1:
+            raise RuntimeError
+        yield Mock(tenant=tenant)
+
+    func = laima.keyed(create_session, container=laima.Container())
+
+    async def resolve() -> Mock:
+        return await func("a")
+
+    results = await asyncio.gather(*(resolve() for _ in range(10)), return_exceptions=True)
+    assert all(isinstance(result, RuntimeError) for result in results)
+
+    tasks = [asyncio.create_task(resolve()) for _ in range(10)]
+    await asyncio.sleep(0)
+    tasks[0].cancel()
+    results = await asyncio.gather(*tasks[1:])
+
+    assert attempts == ["a", "a"]
+    assert len({id(result) for result in results}) == 1
+    await func.areset()
+
+
+async def test_keyed__creation_in_flight_during_reset_is_closed() -> None:
+    events = []
+    release = asyncio.Event()
+
+    async def create_session(tenant: str) -> AsyncIterator[Mock]:
+        await release.wait()
+        yield Mock(tenant=tenant)
+        events.append("finish")
+
+    func = laima.keyed(create_session, container=laima.Container())
+    task = asyncio.create_task(func.aprovide("a"))
+    await asyncio.sleep(0)
+
+    await func.areset()
+    release.set()
+    # The caller retries with a fresh instance once the one it waited for was closed
+    await task
+    assert events == ["finish"]
+
+    await func.areset()
+    assert events == ["finish"] * 2
+
+
+def test_keyed__sync_provide_during_creation_on_same_loop_raises() -> None:
+    release = threading.Event()
+
+    def create_client(tenant: str) -> Mock:
+        release.wait()
+        return Mock(tenant=tenant)
+
+    func = laima.keyed(create_client, container=laima.Container(), offload=True)
+
+    async def main() -> None:
+        task = asyncio.create_task(func.aprovide("a"))
+        await asyncio.sleep(0.01)
+        with pytest.raises(LaimaError):
+            func.provide("a")
+        release.set()
+        await task
+
+    asyncio.run(main())
+    func.reset()
+
+
+def test_keyed__invalid_settings() -> None:
+    with pytest.raises(LaimaError):
+        laima.Keyed(lambda: Mock(), max_size=0)
@@ -0,0 +1,105 @@
+import asyncio
+import threading
+from collections.abc import AsyncIterator, Iterator
+from unittest.mock import Mock
+
+import pytest
+
+import laima
+from laima.exc import LaimaError
+
+
+async def test_loop_singleton__same_instance_in_loop() -> None:
+    func = laima.loop_singleton(lambda: Mock(), container=laima.Container())
+
+    assert isinstance(func, laima.LoopSingleton)
+    results = await asyncio.gather(*(func.aprovide() for _ in range(10)))
+    assert len({id(result) for result in results}) == 1
+    assert func.provide() is results[0]
+    await func.areset()
+
+
+def test_loop_singleton__no_loop_raise_error() -> None:
+    func = laima.loop_singleton(lambda: Mock(), container=laima.Container())
+
+    with pytest.raises(LaimaError):
+        func()
+
+
+def test_loop_singleton__instance_per_loop_torn_down_on_its_loop() -> None:
+    closed_on = []
+
+    async def create_session() -> AsyncIterator[Mock]:
+        yield Mock(loop=asyncio.get_running_loop())
+        closed_on.append(asyncio.get_running_loop())
+
+    func = laima.loop_singleton(create_session, container=laima.Container())
+
+    async def resolve() -> Mock:
+        return await func()
+
+    loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=loop.run_forever)
+    thread.start()
+    try:
+        other = asyncio.run_coroutine_threadsafe(resolve(), loop).result()
+
+        async def run() -> Mock:
+            session = await resolve()
+            assert session is not other
+            await func.areset()
+            return session
+
+        session = asyncio.run(run())
+        assert other.loop is loop
+        assert session.loop is not loop
+        assert len(closed_on) == 2
+        assert set(closed_on) == {loop, session.loop}
+    finally:
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join()
+        loop.close()
+
+
+async def test_loop_singleton__reset_on_running_loop_leaves_async_teardown_to_areset() -> None:
+    events = []
+
+    async def create_session() -> AsyncIterator[Mock]:
+        yield Mock()
+        events.append("finish")
+
+    func = laima.loop_singleton(create_session, container=laima.Container())
+    first = await func()
+
+    with pytest.warns(UserWarning, match="closed by `areset`"):
+        func.reset()
+    assert events == []
+    assert await func() is not first
+
+    await func.areset()
+    assert events == ["finish"] * 2
+
+
+async def test_loop_singleton__sync_provide_during_async_creation_keeps_one_instance() -> None:
+    events = []
+    started = threading.Event()
+    release = threading.Event()
+
+    def create_session() -> Iterator[Mock]:
+        # The offloaded creation blocks its worker thread until the synchronous one has finished on the loop
+        if not started.is_set():
+            started.set()
+            release.wait()
+        yield Mock()
+        events.append("finish")
+
+    func = laima.loop_singleton(create_session, container=laima.Container(), offload=True)
+    task = asyncio.create_task(func.aprovide())
+    await asyncio.to_thread(started.wait)
+    first = func.provide()
+    release.set()
+
+    assert await task is first
+    assert events == ["finish"]
+    await func.areset()
+    assert events == ["finish"] * 2
@@ -0,0 +1,129 @@
+import asyncio
+import threading
+from collections.abc import AsyncIterator, Iterator
+from unittest.mock import Mock
+
+import pytest
+
+import laima
+from laima.exc import LaimaError
+
+
+def test_pooled__same_instance_in_context() -> None:
+    func = laima.pooled(lambda: Mock(), container=laima.Container())
+
+    assert isinstance(func, laima.Pooled)
+    with laima.inject():
+        assert func() is func()
+
+
+def test_pooled__instance_reused_across_contexts() -> None:
+    events = []
+
+    def get_session() -> Iterator[Mock]:
+        events.append("start")
+        yield Mock()
+        events.append("finish")
+
+    func = laima.pooled(get_session, container=laima.Container(), max_size=2)
+
+    with laima.inject():
+        result = func()
+    with laima.inject():
+        assert func() is result
+
+    assert events == ["start"]
+    assert func.stats.hits == 1
+    assert func.stats.misses == 1
+
+    func.reset()
+    assert events == ["start", "finish"]
+
+
+def test_pooled__no_context_raise_error() -> None:
+    func = laima.pooled(lambda: Mock(), container=laima.Container())
+
+    with pytest.raises(LaimaError):
+        func()
+
+
+def test_pooled__blocks_when_exhausted() -> None:
+    func = laima.pooled(lambda: Mock(), container=laima.Container(), max_size=1)
+    acquired = threading.Event()
+    release = threading.Event()
+
+    def hold() -> None:
+        with laima.inject():
+            func()
+            acquired.set()
+            release.wait()
+
+    thread = threading.Thread(target=hold)
+    thread.start()
+    acquired.wait()
+
+    threading.Timer(0.05, release.set).start()
+    with laima.inject(reuse_context=False):
+        func()
+    thread.join()
+
+    assert func.stats.size == 1
+    assert func.stats.max_wait_time > 0
+
+
+def test_pooled__timeout_when_exhausted() -> None:
+    func = laima.pooled(lambda: Mock(), container=laima.Container(), max_size=1, timeout=0.01)
+
+    with laima.inject():
+        func()
+        with laima.inject(reuse_context=False), pytest.raises(LaimaError):
+            func()
+
+
+def test_pooled__invalid_instance_is_replaced() -> None:
+    closed = []
+
+    def get_session() -> Iterator[Mock]:
+        session = Mock(valid=True)
+        yield session
+        closed.append(session)
+
+    func = laima.pooled(get_session, container=laima.Container(), validate=lambda session: session.valid)
+
+    with laima.inject():
+        first = func()
+    first.valid = False
+    with laima.inject():
+        second = func()
+
+    assert second is not first
+    assert closed == [first]
+    func.reset()
+
+
+async def test_pooled__async_factory() -> None:
+    events = []
+
+    async def get_session() -> AsyncIterator[Mock]:
+        events.append("start")
+        yield Mock()
+        events.append("finish")
+
+    func = laima.pooled(get_session, container=laima.Container(), max_size=1, min_size=1)
+    await func.awarmup()
+
+    async def use() -> Mock:
+        async with laima.inject(reuse_context=False):
+            result = await func()
+            await asyncio.sleep(0)
+            return result
+
+    results = await asyncio.gather(*(use() for _ in range(10)))
+
+    assert len({id(result) for result in results}) == 1
+    assert events == ["start"]
+    assert func.stats.hits == 10
+    assert func.stats.misses == 1
+
+    await func.areset()
+    assert events == ["start", "finish"]
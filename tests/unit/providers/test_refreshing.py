@@ -0,0 +1,149 @@
+import asyncio
+import itertools
+import threading
+import time
+from collections.abc import AsyncIterator, Callable, Iterator
+
+import pytest
+
+import laima
+
+
+def wait_for(condition: Callable[[], bool], timeout: float = 1.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline
+        time.sleep(0.001)
+
+
+def test_refreshing__stale_instance_served_while_refreshing() -> None:
+    events = []
+    counter = itertools.count(1)
+    refreshing = threading.Event()
+
+    def create_token() -> Iterator[int]:
+        token = next(counter)
+        if token > 1:
+            refreshing.wait()
+        yield token
+        events.append(token)
+
+    func = laima.refreshing(create_token, container=laima.Container(), ttl=0.02)
+
+    assert isinstance(func, laima.Refreshing)
+    assert func() == 1
+    time.sleep(0.03)
+    assert func() == 1
+    assert func() == 1
+    refreshing.set()
+
+    wait_for(lambda: func.stats.generation == 2)
+    assert func() == 2
+    assert events == [1]
+    assert func.stats.refreshes == 1
+
+    func.reset()
+    assert events == [1, 2]
+
+
+def test_refreshing__old_instance_closed_after_users_are_done() -> None:
+    events = []
+    counter = itertools.count(1)
+
+    def create_token() -> Iterator[int]:
+        token = next(counter)
+        yield token
+        events.append(token)
+
+    func = laima.refreshing(create_token, container=laima.Container())
+
+    with laima.inject():
+        assert func() == 1
+        func.refresh()
+        assert func() == 1
+        with laima.inject(reuse_context=False):
+            assert func() == 2
+        assert events == []
+
+    assert events == [1]
+    func.reset()
+    assert events == [1, 2]
+
+
+def test_refreshing__failed_refresh_keeps_current_instance() -> None:
+    counter = itertools.count(1)
+
+    def create_token() -> int:
+        token = next(counter)
+        if token == 2:
+            raise RuntimeError
+        return token
+
+    func = laima.refreshing(create_token, container=laima.Container(), ttl=0.01, retry_interval=0.01)
+
+    assert func() == 1
+    time.sleep(0.02)
+    with pytest.warns(UserWarning, match="refresh failed"):
+        func()
+        wait_for(lambda: func.stats.failures == 1)
+    assert func() == 1
+
+    time.sleep(0.02)
+    func()
+    wait_for(lambda: func.stats.refreshes == 1)
+    assert func() == 3
+    assert func.stats.last_error is None
+    func.reset()
+
+
+async def test_refreshing__async_refresh_runs_as_task() -> None:
+    events = []
+    counter = itertools.count(1)
+
+    async def create_token() -> AsyncIterator[int]:
+        token = next(counter)
+        yield token
+        events.append(token)
+
+    func = laima.refreshing(create_token, container=laima.Container(), ttl=0.02)
+
+    assert await func() == 1
+    await asyncio.sleep(0.03)
+    assert await func() == 1
+    for _ in range(1000):
+        if func.stats.generation == 2:
+            break
+        await asyncio.sleep(0.001)
+
+    assert await func() == 2
+    assert events == [1]
+    assert func.stats.max_duration >= func.stats.last_duration > 0
+
+    await func.areset()
+    assert events == [1, 2]
+
+
+def test_refreshing__built_by_container_warmup() -> None:
+    container = laima.Container()
+    counter = itertools.count(1)
+    func = laima.refreshing(lambda: next(counter), container=container, bind_to="token", ttl=60)
+
+    container.warmup()
+
+    assert func.stats.generation == 1
+    assert func() == 1
+    container.reset()
+
+
+async def test_refreshing__built_by_container_awarmup() -> None:
+    container = laima.Container()
+
+    async def create_token() -> int:
+        return 1
+
+    func = laima.refreshing(create_token, container=container, bind_to="token", ttl=60)
+
+    await container.awarmup()
+
+    assert func.stats.generation == 1
+    await container.areset()
@@ -1,3 +1,7 @@
+import threading
+from collections.abc import Iterator
+from contextvars import copy_context
+from typing import Annotated
 from unittest.mock import Mock
 
 import laima
@@ -32,3 +36,58 @@ def test_scoped__same_instance_in_different_contexts() -> None:
     with laima.inject():
         assert result is not func()
         assert func() is func()
+
+
+async def test_scoped__offloaded_generator_runs_in_executor() -> None:
+    container = laima.Container()
+    loop_thread = threading.get_ident()
+    threads = []
+
+    def get_client() -> Iterator[Mock]:
+        threads.append(threading.get_ident())
+        yield Mock()
+        threads.append(threading.get_ident())
+
+    laima.scoped(get_client, container=container, bind_to="client", offload=True)
+
+    def get_service(client: Annotated[Mock, "client"]) -> Mock:
+        threads.append(threading.get_ident())
+        return Mock(client=client)
+
+    laima.scoped(get_service, container=container, bind_to="service", offload=True)
+
+    @laima.inject(container=container)
+    async def func(service: Annotated[Mock, "service"], client: Annotated[Mock, "client"]) -> None:
+        assert service.client is client
+
+    await func()
+
+    assert len(threads) == 3
+    assert loop_thread not in threads
+
+
+def test_scoped__shared_context_creates_once_across_threads() -> None:
+    created = []
+    barrier = threading.Barrier(8)
+
+    def create() -> Mock:
+        created.append(threading.get_ident())
+        return Mock()
+
+    func = laima.scoped(create, container=laima.Container())
+    results = []
+
+    def resolve() -> None:
+        barrier.wait()
+        results.append(func())
+
+    with laima.inject():
+        # Threads start with empty context variables, so the laima context opened here is handed over explicitly
+        threads = [threading.Thread(target=copy_context().run, args=(resolve,)) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    assert len(created) == 1
+    assert len({id(result) for result in results}) == 1
@@ -1,6 +1,12 @@
+import asyncio
+import random
+import threading
+from collections.abc import AsyncIterator
+from concurrent.futures import ThreadPoolExecutor
 from unittest.mock import Mock
 
 import laima
+from laima.utils.status import Status
 
 
 def test_singleton__same_instance_function() -> None:
@@ -30,3 +36,98 @@ def test_singleton__same_instance_in_different_contexts() -> None:
     with laima.inject():
         assert result is func()
         assert func() is func()
+
+
+def test_singleton__concurrent_reset() -> None:
+    func = laima.singleton(lambda: Mock())
+    errors = []
+
+    def resolve() -> None:
+        try:
+            for _ in range(1000):
+                assert func() is not None
+        except Exception as exc:
+            errors.append(exc)
+
+    threads = [threading.Thread(target=resolve) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for _ in range(100):
+        func.reset()
+    for thread in threads:
+        thread.join()
+
+    func.reset()
+    assert not errors
+
+
+async def test_singleton__offload_to_custom_executor() -> None:
+    def create_client() -> str:
+        return threading.current_thread().name
+
+    with ThreadPoolExecutor(thread_name_prefix="laima-offload") as executor:
+        func = laima.singleton(create_client, container=laima.Container(), offload=executor)
+
+        assert (await func.aprovide()).startswith("laima-offload")
+        assert func.provide() == await func.aprovide()
+        await func.areset()
+
+
+async def test_singleton__shared_async_initialization_survives_cancellations() -> None:
+    rng = random.Random(0)
+    attempts = 0
+    events = []
+
+    async def create_client() -> AsyncIterator[Mock]:
+        nonlocal attempts
+        attempts += 1
+        await asyncio.sleep(0.01)
+        if attempts == 1:
+            raise RuntimeError
+        events.append("start")
+        yield Mock()
+        events.append("finish")
+
+    func = laima.singleton(create_client, container=laima.Container())
+
+    async def resolve() -> Mock:
+        await asyncio.sleep(rng.random() * 0.05)
+        return await func()
+
+    tasks = [asyncio.create_task(resolve()) for _ in range(2000)]
+    await asyncio.sleep(0.005)
+    for task in rng.sample(tasks, 500):
+        task.cancel()
+    results = await asyncio.gather(*tasks, return_exceptions=True)
+
+    instances = {id(result) for result in results if isinstance(result, Mock)}
+    failures = [result for result in results if isinstance(result, RuntimeError)]
+    cancelled = [result for result in results if isinstance(result, asyncio.CancelledError)]
+    assert len(instances) == 1
+    assert failures
+    assert len(failures) + len(cancelled) < len(results)
+    assert len(cancelled) == 500
+    assert attempts == 2
+    assert func.status is Status.RUNNING
+
+    await func.areset()
+    assert events == ["start", "finish"]
+
+
+async def test_singleton__cancelling_first_caller_does_not_abort_initialization() -> None:
+    started = asyncio.Event()
+
+    async def create_client() -> Mock:
+        started.set()
+        await asyncio.sleep(0.01)
+        return Mock()
+
+    func = laima.singleton(create_client, container=laima.Container())
+    first = asyncio.create_task(func.aprovide())
+    await started.wait()
+    second = asyncio.create_task(func.aprovide())
+    first.cancel()
+
+    assert isinstance(await second, Mock)
+    assert first.cancelled()
+    await func.areset()
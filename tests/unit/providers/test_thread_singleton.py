@@ -0,0 +1,108 @@
+import asyncio
+import gc
+import threading
+from collections.abc import AsyncIterator, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import Mock
+
+import pytest
+
+import laima
+
+
+def test_thread_singleton__instance_per_thread() -> None:
+    func = laima.thread_singleton(lambda: Mock(), container=laima.Container())
+
+    assert isinstance(func, laima.ThreadSingleton)
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        results = list(executor.map(lambda _: (threading.get_ident(), id(func())), range(100)))
+
+    per_thread = dict(results)
+    assert len(set(results)) == len(per_thread)
+    assert len(set(per_thread.values())) == len(per_thread)
+    assert func() is func()
+    func.reset()
+
+
+def test_thread_singleton__reset_closes_instances_of_all_threads() -> None:
+    events = []
+
+    def create_client() -> Iterator[Mock]:
+        yield Mock()
+        events.append("finish")
+
+    func = laima.thread_singleton(create_client, container=laima.Container())
+    barrier = threading.Barrier(3)
+
+    def resolve() -> None:
+        func()
+        barrier.wait()
+        barrier.wait()
+
+    threads = [threading.Thread(target=resolve) for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    barrier.wait()
+    first = func()
+
+    func.reset()
+    assert events == ["finish"] * 3
+    assert func() is not first
+
+    barrier.wait()
+    for thread in threads:
+        thread.join()
+    func.reset()
+
+
+def test_thread_singleton__instance_closed_when_thread_exits() -> None:
+    events = []
+
+    def create_client() -> Iterator[Mock]:
+        yield Mock()
+        events.append("finish")
+
+    func = laima.thread_singleton(create_client, container=laima.Container())
+    thread = threading.Thread(target=func)
+    thread.start()
+    thread.join()
+    gc.collect()
+
+    assert events == ["finish"]
+
+
+def test_thread_singleton__reset_invalidates_plain_instances() -> None:
+    container = laima.Container()
+    func = laima.thread_singleton(lambda: Mock(), container=container)
+    first = func()
+
+    func.reset()
+    second = func()
+    assert second is not first
+
+    container.reset()
+    assert func() is not second
+
+
+def test_thread_singleton__reset_leaves_async_teardown_to_areset() -> None:
+    events = []
+
+    async def create_client() -> AsyncIterator[Mock]:
+        yield Mock()
+        events.append("finish")
+
+    func = laima.thread_singleton(create_client, container=laima.Container())
+
+    async def main() -> None:
+        first = await func()
+
+        with pytest.warns(UserWarning, match="closed by `areset`"):
+            func.reset()
+        assert events == []
+
+        await func.areset()
+        assert events == ["finish"]
+        assert await func() is not first
+        await func.areset()
+
+    asyncio.run(main())
@@ -1,3 +1,5 @@
+import gc
+import weakref
 from unittest.mock import Mock
 
 import laima
@@ -32,3 +34,28 @@ def test_transient__same_instance_in_different_contexts() -> None:
     with laima.inject():
         assert result is not func()
         assert func() is not func()
+
+
+def test_transient__plain_instances_are_not_kept_by_context() -> None:
+    class Service:
+        pass
+
+    func = laima.transient(Service, container=laima.Container())
+
+    with laima.inject():
+        ref = weakref.ref(func())
+        gc.collect()
+        assert ref() is None
+
+
+async def test_transient__async_factory_is_awaited() -> None:
+    service = Mock()
+
+    async def get_service() -> Mock:
+        return service
+
+    func = laima.transient(get_service, container=laima.Container())
+
+    assert await func() is service
+    async with laima.inject():
+        assert await func() is service
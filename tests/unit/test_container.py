@@ -0,0 +1,295 @@
+import asyncio
+import threading
+from collections.abc import AsyncIterator, Iterator
+from unittest.mock import Mock
+
+import pytest
+
+import laima
+from laima.exc import LaimaError
+from laima.utils.status import Status
+
+
+class Service:
+    pass
+
+
+def test_container__registry_is_snapshot() -> None:
+    container = laima.Container()
+    provider = laima.transient(lambda: Mock(), container=container, bind_to=Service)
+
+    registry = container.registry
+    container.bind(provider, to="service")
+
+    assert "service" not in registry
+    assert container.registry["service"] is provider
+    with pytest.raises(TypeError):
+        registry["other"] = provider  # type: ignore[index]
+
+
+def test_container__freeze() -> None:
+    container = laima.Container()
+    provider = laima.transient(lambda: Mock(), container=container, bind_to=Service)
+    container.freeze()
+
+    assert container.frozen
+    assert container.get(Service) is provider
+    with pytest.raises(LaimaError):
+        container.bind(provider, to="service")
+    with pytest.raises(LaimaError):
+        container.unbind(Service)
+    with pytest.raises(LaimaError):
+        container.unbind_all()
+
+
+def test_container__freeze_makes_injection_plans_final() -> None:
+    container = laima.Container()
+    laima.transient(lambda: Mock(), container=container, bind_to=Service)
+
+    @laima.inject(container=container)
+    def func(service: Service) -> Service:
+        return service
+
+    func()
+    assert not func.__laima_plan__().final  # type: ignore[attr-defined]
+
+    container.freeze()
+    func()
+    plan = func.__laima_plan__()  # type: ignore[attr-defined]
+    assert plan.final
+    assert func.__laima_plan__() is plan  # type: ignore[attr-defined]
+
+
+def test_container__warmup_initializes_singletons_in_dependency_order() -> None:
+    container = laima.Container()
+    created: list[type] = []
+
+    class Database:
+        def __init__(self) -> None:
+            created.append(Database)
+
+    class Repository:
+        def __init__(self, database: Database) -> None:
+            created.append(Repository)
+            self.database = database
+
+    laima.singleton(Repository, container=container)
+    laima.singleton(Database, container=container)
+
+    assert not container.ready.done()
+    container.warmup()
+
+    assert container.ready.done()
+    assert created == [Database, Repository]
+    container.reset()
+
+
+async def test_container__awarmup_initializes_sync_and_async_singletons() -> None:
+    container = laima.Container()
+    client, database = Mock(), Mock()
+
+    async def get_client() -> Mock:
+        return client
+
+    def get_database() -> Mock:
+        return database
+
+    async_provider = laima.singleton(get_client, container=container, bind_to="client")
+    sync_provider = laima.singleton(get_database, container=container, bind_to="database")
+
+    await container.awarmup()
+    await asyncio.wrap_future(container.ready)
+
+    assert async_provider.status == Status.RUNNING
+    assert sync_provider.status == Status.RUNNING
+    await container.areset()
+
+
+def test_container__warmup_with_async_providers_is_not_ready() -> None:
+    container = laima.Container()
+
+    async def get_client() -> Mock:
+        return Mock()
+
+    laima.singleton(get_client, container=container, bind_to="client")
+
+    with pytest.warns(UserWarning, match="awarmup"):
+        container.warmup()
+
+    assert not container.ready.done()
+    asyncio.run(container.awarmup())
+    assert container.ready.done()
+    asyncio.run(container.areset())
+
+
+def test_container__reset_tears_down_dependents_first() -> None:
+    container = laima.Container()
+    closed: list[str] = []
+
+    class Database:
+        pass
+
+    class Repository:
+        def __init__(self, database: Database) -> None:
+            self.database = database
+
+    def get_database() -> Iterator[Database]:
+        yield Database()
+        closed.append("database")
+
+    def get_repository(database: Database) -> Iterator[Repository]:
+        yield Repository(database)
+        closed.append("repository")
+
+    laima.singleton(get_database, container=container, bind_to=Database)
+    laima.singleton(get_repository, container=container, bind_to=Repository)
+    container.warmup()
+
+    reports = container.reset()
+
+    assert closed == ["repository", "database"]
+    assert all(report.duration >= 0 and not report.timed_out for report in reports)
+
+
+def test_container__reset_with_provider_timeout() -> None:
+    container = laima.Container()
+    release = threading.Event()
+
+    def get_service() -> Iterator[Service]:
+        yield Service()
+        release.wait()
+
+    provider = laima.singleton(get_service, container=container, bind_to=Service)
+    provider()
+
+    with pytest.warns(UserWarning, match="timed out"):
+        (report,) = container.reset(provider_timeout=0.05)
+
+    release.set()
+    assert report.provider is provider
+    assert report.timed_out
+
+
+def test_container__reset_propagates_teardown_base_exception() -> None:
+    container = laima.Container()
+
+    def get_service() -> Iterator[Service]:
+        yield Service()
+        raise KeyboardInterrupt
+
+    laima.singleton(get_service, container=container, bind_to=Service)()
+
+    with pytest.raises(KeyboardInterrupt):
+        container.reset(provider_timeout=1)
+
+
+async def test_container__areset_runs_sync_teardown_off_event_loop() -> None:
+    container = laima.Container()
+    threads = []
+
+    def get_service() -> Iterator[Service]:
+        yield Service()
+        threads.append(threading.current_thread())
+
+    laima.singleton(get_service, container=container, bind_to=Service)()
+
+    (report,) = await container.areset()
+
+    assert threads
+    assert threads[0] is not threading.current_thread()
+    assert report.error is None
+
+
+@pytest.mark.parametrize("provider_timeout", [None, 1.0])
+async def test_container__reset_on_event_loop_leaves_loop_singletons_to_areset(provider_timeout: float | None) -> None:
+    container = laima.Container()
+    closed = []
+
+    async def get_client() -> AsyncIterator[Mock]:
+        yield Mock()
+        closed.append("client")
+
+    async def get_session() -> AsyncIterator[Mock]:
+        yield Mock()
+        closed.append("session")
+
+    client = laima.loop_singleton(get_client, container=container, bind_to="client")
+    session = laima.loop_singleton(get_session, container=container, bind_to="session")
+    await client()
+    await session()
+
+    with pytest.warns(UserWarning, match="closed by `areset`"):
+        reports = container.reset(provider_timeout=provider_timeout)
+    assert not any(report.timed_out or report.error for report in reports)
+    assert closed == []
+
+    await container.areset()
+    assert sorted(closed) == ["client", "session"]
+
+
+async def test_container__areset_closes_async_state_of_sync_providers() -> None:
+    container = laima.Container()
+    closed = []
+
+    async def open_client() -> AsyncIterator[Mock]:
+        yield Mock()
+        closed.append("client")
+
+    # A sync factory may still hand out an asynchronous object
+    def get_client() -> AsyncIterator[Mock]:
+        return open_client()
+
+    provider = laima.singleton(get_client, container=container, bind_to="client")
+    await provider.aprovide()
+    assert not provider.is_async
+
+    (report,) = await container.areset()
+
+    assert report.error is None
+    assert closed == ["client"]
+
+
+def test_container__metrics() -> None:
+    container = laima.Container()
+
+    def get_session() -> Iterator[Mock]:
+        yield Mock()
+
+    session = laima.scoped(get_session, container=container, bind_to="session")
+    config = laima.singleton(lambda: Mock(), container=container, bind_to="config")
+    container.enable_metrics()
+
+    with laima.inject():
+        session()
+        session()
+        config()
+        stats = container.stats()
+        assert stats["session"]["live"] == 1
+    config()
+
+    stats = container.stats()
+    assert stats["session"]["resolutions"] == 2
+    assert stats["session"]["creations"] == 1
+    assert stats["session"]["cache_hits"] == 1
+    assert stats["session"]["live"] == 0
+    assert stats["session"]["teardown_seconds"]["count"] == 1
+    assert stats["session"]["lock_wait_seconds"]["count"] == 1
+    assert stats["config"]["resolutions"] == 2
+    assert stats["config"]["lock_wait_seconds"]["count"] == 1
+
+    text = container.export_prometheus()
+    assert 'laima_resolutions_total{provider="session"} 2' in text
+    assert 'laima_creation_seconds_bucket{provider="config",le="+Inf"} 1' in text
+    config.reset()
+
+
+def test_container__metrics_disabled() -> None:
+    container = laima.Container()
+    provider = laima.transient(lambda: Mock(), container=container, bind_to=Service)
+    container.enable_metrics()
+    laima.transient(lambda: Mock(), container=container, bind_to="late")
+    container.disable_metrics()
+
+    assert container.stats() == {}
+    assert "provide" not in vars(provider)
+    assert "provide" not in vars(container.get("late"))
@@ -0,0 +1,324 @@
+import asyncio
+import inspect
+import threading
+from collections.abc import AsyncIterator, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import Mock
+
+import pytest
+
+import laima
+from laima.exc import LaimaAsyncError, LaimaError, LaimaTypeError
+
+
+class Service:
+    pass
+
+
+class Repository:
+    pass
+
+
+def test_inject__missing_parameters_are_provided() -> None:
+    container = laima.Container()
+    service = Mock()
+    laima.transient(lambda: service, container=container, bind_to=Service)
+
+    @laima.inject(container=container)
+    def func(value: int, service: Service, /, *, other: Service) -> tuple[int, Service, Service]:
+        return value, service, other
+
+    assert func(1) == (1, service, service)
+
+
+def test_inject__passed_arguments_are_not_overridden() -> None:
+    container = laima.Container()
+    laima.transient(lambda: Mock(), container=container, bind_to=Service)
+    service = Mock()
+
+    @laima.inject(container=container)
+    def func(service: Service) -> Service:
+        return service
+
+    assert func(service) is service
+    assert func(service=service) is service
+
+
+def test_inject__plan_follows_container_bindings() -> None:
+    container = laima.Container()
+
+    @laima.inject(container=container)
+    def func(service: Service) -> Service:
+        return service
+
+    with pytest.raises(LaimaTypeError):
+        func()
+
+    first = Mock()
+    laima.transient(lambda: first, container=container, bind_to=Service, override=True)
+    assert func() is first
+
+    second = Mock()
+    laima.transient(lambda: second, container=container, bind_to=Service, override=True)
+    assert func() is second
+
+    container.unbind(Service)
+    with pytest.raises(LaimaTypeError):
+        func()
+
+
+def test_inject__container_version_changes_on_bindings() -> None:
+    container = laima.Container()
+    provider = laima.transient(lambda: Mock(), container=container, bind_to=Repository)
+
+    version = container.version
+    container.bind(provider, to=Service)
+    assert container.version > version
+
+    version = container.version
+    container.unbind(Service)
+    assert container.version > version
+
+    version = container.version
+    container.unbind_all()
+    assert container.version > version
+
+
+def test_inject__compiled_wrapper_keeps_signature() -> None:
+    container = laima.Container()
+    service = Mock()
+    laima.transient(lambda: service, container=container, bind_to=Service)
+
+    @laima.inject(container=container, compile=True)
+    def func(value: int, service: Service, /, *args: int, other: Service, flag: bool = True) -> tuple:
+        return value, service, args, other, flag
+
+    assert func(1) == (1, service, (), service, True)
+    assert func(1, 2, 3, other=4, flag=False) == (1, 2, (3,), 4, False)
+    assert str(inspect.signature(func)) == str(inspect.signature(func.__wrapped__))  # type: ignore[attr-defined]
+    with pytest.raises(LaimaTypeError):
+        func()
+
+
+def test_inject__compiled_generator_closes_context() -> None:
+    container = laima.Container()
+    events = []
+
+    def get_service() -> Iterator[Mock]:
+        events.append("start")
+        yield Mock()
+        events.append("finish")
+
+    laima.scoped(get_service, container=container, bind_to=Service)
+
+    @laima.inject(container=container, compile=True)
+    def func(service: Service) -> Iterator[Service]:
+        yield service
+        yield service
+
+    first, second = func()
+    assert first is second
+    assert events == ["start", "finish"]
+
+
+async def test_inject__compiled_async_function() -> None:
+    container = laima.Container()
+    service = Mock()
+
+    async def get_service() -> Mock:
+        return service
+
+    laima.scoped(get_service, container=container, bind_to=Service)
+
+    @laima.inject(container=container, compile=True)
+    async def func(service: Service) -> Service:
+        return service
+
+    assert await func() is service
+
+
+def test_inject__lazy_dependency_is_created_on_first_use() -> None:
+    container = laima.Container()
+    factory = Mock(return_value=Mock(value=1))
+    laima.scoped(lambda: factory(), container=container, bind_to=Service)
+
+    @laima.inject(container=container)
+    def func(service: laima.Lazy[Service], *, use: bool) -> int | None:
+        return service.value if use else None
+
+    assert func(use=False) is None
+    factory.assert_not_called()
+
+    assert func(use=True) == 1
+    factory.assert_called_once()
+
+
+def test_inject__lazy_dependency_is_closed_with_context() -> None:
+    class Session:
+        def run(self) -> None:
+            pass
+
+    container = laima.Container()
+    events = []
+
+    def get_service() -> Iterator[Mock]:
+        events.append("start")
+        yield Mock()
+        events.append("finish")
+
+    laima.scoped(get_service, container=container, bind_to=Session)
+
+    @laima.inject(container=container, lazy=True)
+    def func(session: Session) -> None:
+        assert events == []
+        session.run()
+        assert events == ["start"]
+
+    func()
+    assert events == ["start", "finish"]
+
+
+def test_inject__lazy_dependency_forwards_special_methods() -> None:
+    class Items(list[int]):
+        pass
+
+    container = laima.Container()
+    laima.scoped(lambda: Items([1, 2]), container=container, bind_to=Items)
+
+    @laima.inject(container=container, lazy=True)
+    def func(items: Items) -> None:
+        assert len(items) == 2
+        assert list(items) == [1, 2]
+        assert 2 in items
+        assert items[0] == 1
+        assert items == [1, 2]
+        assert items
+
+    func()
+
+
+def test_inject__lazy_dependency_is_resolved_once_across_threads() -> None:
+    container = laima.Container()
+    barrier = threading.Barrier(4)
+    factory = Mock(side_effect=lambda: Mock())
+    laima.transient(lambda: factory(), container=container, bind_to=Service)
+
+    @laima.inject(container=container)
+    def func(service: laima.Lazy[Service]) -> set[int]:
+        def resolve() -> int:
+            barrier.wait()
+            return id(service.value)
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            return set(executor.map(lambda _: resolve(), range(4)))
+
+    assert len(func()) == 1
+    factory.assert_called_once()
+
+
+def test_inject__lazy_dependency_cannot_be_resolved_after_scope_exits() -> None:
+    container = laima.Container()
+    laima.scoped(lambda: Mock(), container=container, bind_to=Service)
+
+    @laima.inject(container=container)
+    def func(service: laima.Lazy[Service]) -> laima.Lazy[Service]:
+        return service
+
+    with pytest.raises(LaimaError):
+        str(func())
+
+
+async def test_inject__lazy_async_dependency_is_awaited() -> None:
+    container = laima.Container()
+    service = Mock()
+
+    async def get_service() -> AsyncIterator[Mock]:
+        yield service
+
+    laima.scoped(get_service, container=container, bind_to=Service)
+
+    @laima.inject(container=container)
+    async def func(lazy_service: laima.Lazy[Service]) -> Service:
+        with pytest.raises(LaimaAsyncError):
+            lazy_service.run()
+        return await lazy_service
+
+    assert await func() is service
+
+
+async def test_inject__structured_scope_waits_for_child_tasks() -> None:
+    events = []
+
+    async def get_session() -> AsyncIterator[Mock]:
+        yield Mock()
+        events.append("closed")
+
+    func = laima.scoped(get_session, container=laima.Container())
+    children = []
+
+    @laima.inject(structured=True)
+    async def handler() -> Mock:
+        session = await func()
+
+        async def child() -> None:
+            await asyncio.sleep(0.01)
+            assert await func() is session
+            events.append("child")
+
+        children.append(asyncio.create_task(child()))
+        events.append("returned")
+        return session
+
+    await handler()
+
+    assert events == ["returned", "child", "closed"]
+
+
+async def test_inject__structured_scope_waits_for_child_tasks_when_context_is_reused() -> None:
+    events = []
+
+    async def get_session() -> AsyncIterator[Mock]:
+        yield Mock()
+        events.append("closed")
+
+    func = laima.scoped(get_session, container=laima.Container())
+    children = []
+
+    @laima.inject(structured=True)
+    async def handler() -> None:
+        session = await func()
+
+        async def child() -> None:
+            await asyncio.sleep(0.01)
+            assert await func() is session
+            events.append("child")
+
+        children.append(asyncio.create_task(child()))
+        events.append("returned")
+
+    async with laima.inject():
+        await handler()
+        events.append("outer-body-done")
+
+    assert events == ["returned", "child", "outer-body-done", "closed"]
+
+
+async def test_inject__structured_scope_shares_instance_between_task_group_children() -> None:
+    created = []
+
+    async def get_session() -> AsyncIterator[Mock]:
+        await asyncio.sleep(0)
+        created.append(Mock())
+        yield created[-1]
+
+    func = laima.scoped(get_session, container=laima.Container())
+
+    async def resolve() -> Mock:
+        return await func()
+
+    async with laima.inject(structured=True), asyncio.TaskGroup() as group:
+        tasks = [group.create_task(resolve()) for _ in range(10)]
+
+    assert len(created) == 1
+    assert all(task.result() is created[0] for task in tasks)
+    assert asyncio.get_running_loop().get_task_factory() is None
@@ -0,0 +1,58 @@
+import gc
+from functools import partial
+from unittest.mock import Mock
+
+import laima
+from laima.utils.context import Context
+from laima.utils.object import TransientData
+
+
+def test_context__empty_context_is_compact() -> None:
+    ctx: Context = Context()
+    provider = laima.Transient(lambda: Mock())
+
+    assert ctx.get(provider) is None
+    ctx.close()
+    assert not hasattr(ctx, "__dict__")
+
+
+def test_context__setdefault_stores_once() -> None:
+    ctx: Context = Context()
+    first = laima.Transient(lambda: Mock())
+    second = laima.Transient(lambda: Mock())
+
+    data = ctx.setdefault(second, TransientData)
+
+    assert ctx.setdefault(second, TransientData) is data
+    assert ctx.get(second) is data
+    assert ctx.get(first) is None
+
+
+def test_context__closes_in_insertion_order() -> None:
+    ctx: Context = Context()
+    events: list[int] = []
+    providers = [laima.Transient(lambda: Mock()) for _ in range(3)]
+
+    class Recorder(TransientData):
+        def __init__(self, slot: int) -> None:
+            super().__init__()
+            self.slot = slot
+
+        def close(self) -> None:
+            events.append(self.slot)
+
+    for provider in reversed(providers):
+        ctx.setdefault(provider, partial(Recorder, provider.slot))
+    ctx.close()
+
+    assert events == [provider.slot for provider in reversed(providers)]
+
+
+def test_provider__slot_is_recycled() -> None:
+    provider = laima.Transient(lambda: Mock())
+    slot = provider.slot
+
+    del provider
+    gc.collect()
+
+    assert laima.Transient(lambda: Mock()).slot <= slot
@@ -0,0 +1,59 @@
+import asyncio
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from unittest.mock import Mock
+
+import pytest
+
+import laima
+from laima.exc import LaimaError
+
+SETUPS: list[int] = []
+
+
+class Client:
+    pass
+
+
+def setup_worker() -> laima.Container:
+    container = laima.Container()
+    laima.singleton(lambda: Client(), container=container, bind_to=Client)
+    SETUPS.append(os.getpid())
+    return container
+
+
+def worker_setups() -> int:
+    return len(SETUPS)
+
+
+def test_submit__shares_scope_with_worker() -> None:
+    func = laima.scoped(lambda: Mock(), container=laima.Container())
+
+    with laima.inject(), ThreadPoolExecutor(max_workers=2) as executor:
+        result = func()
+        futures = [laima.submit(executor, func) for _ in range(4)]
+        assert all(future.result() is result for future in futures)
+
+
+async def test_context_executor__run_in_executor_shares_scope() -> None:
+    func = laima.scoped(lambda: Mock(), container=laima.Container())
+    executor = laima.ContextExecutor(ThreadPoolExecutor(max_workers=2))
+
+    async with laima.inject():
+        result = func()
+        loop = asyncio.get_running_loop()
+        assert await loop.run_in_executor(executor, func) is result
+
+    executor.shutdown()
+
+
+def test_submit__process_pool_raise_error() -> None:
+    with ProcessPoolExecutor(max_workers=1) as executor, pytest.raises(LaimaError):
+        laima.submit(executor, worker_setups)
+
+
+def test_bootstrap__runs_setup_once_per_worker() -> None:
+    with ProcessPoolExecutor(max_workers=1, initializer=laima.bootstrap, initargs=(setup_worker,)) as executor:
+        results = [executor.submit(worker_setups).result() for _ in range(3)]
+
+    assert results == [1, 1, 1]
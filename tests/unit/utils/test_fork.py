@@ -0,0 +1,84 @@
+import json
+import os
+import threading
+from collections.abc import Iterator
+from unittest.mock import Mock
+
+import pytest
+
+import laima
+from laima.utils.metrics import ProviderMetrics
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="requires os.fork")
+def test_fork__reinit_singletons_are_recreated_in_child() -> None:
+    events: list[str] = []
+
+    def create_connection() -> Iterator[Mock]:
+        yield Mock()
+        events.append("closed")
+
+    container = laima.Container()
+    shared = laima.singleton(lambda: Mock(), container=container, bind_to="shared")
+    connection = laima.singleton(create_connection, container=container, bind_to="connection", fork="reinit")
+    parent_ids = {"shared": id(shared()), "connection": id(connection())}
+
+    # A singleton being created by another thread holds its lock at fork time, which must not deadlock the child
+    held = threading.Event()
+    release = threading.Event()
+
+    def create_slow() -> Mock:
+        held.set()
+        release.wait()
+        return Mock()
+
+    slow = laima.singleton(create_slow, container=container, bind_to="slow")
+    thread = threading.Thread(target=slow)
+    thread.start()
+    held.wait()
+
+    read_fd, write_fd = os.pipe()
+    pid = os.fork()
+    if pid == 0:
+        os.close(read_fd)
+        release.set()
+        slow()
+        connection.reset()
+        child_ids = {"shared": id(shared()), "connection": id(connection()), "events": events}
+        os.write(write_fd, json.dumps(child_ids).encode())
+        os._exit(0)
+
+    os.close(write_fd)
+    release.set()
+    thread.join()
+    with os.fdopen(read_fd) as pipe:
+        child_ids = json.loads(pipe.read())
+    _, status = os.waitpid(pid, 0)
+
+    assert os.waitstatus_to_exitcode(status) == 0
+    assert child_ids["shared"] == parent_ids["shared"]
+    assert child_ids["connection"] != parent_ids["connection"]
+    assert child_ids["events"] == []
+    assert id(connection()) == parent_ids["connection"]
+
+    connection.reset()
+    assert events == ["closed"]
+    shared.reset()
+    slow.reset()
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="requires os.fork")
+def test_fork__metrics_usable_in_child_while_parent_holds_mutex() -> None:
+    provider = laima.singleton(lambda: Mock(), container=laima.Container())
+    metrics = ProviderMetrics("provider")
+    provider.instrument(metrics)
+
+    # Stands in for another thread recording a resolution at fork time
+    with metrics._mutex, metrics.resolution._mutex:  # noqa: SLF001
+        pid = os.fork()
+        if pid == 0:
+            provider()
+            os._exit(0 if metrics.resolutions == 1 else 1)
+
+    _, status = os.waitpid(pid, 0)
+    assert os.waitstatus_to_exitcode(status) == 0
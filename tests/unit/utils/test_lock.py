@@ -0,0 +1,91 @@
+import asyncio
+import threading
+import time
+
+from laima.utils.lock import Lock
+
+
+async def test_lock__async_acquire_does_not_block_event_loop() -> None:
+    lock = Lock()
+    acquired = threading.Event()
+
+    def hold() -> None:
+        with lock:
+            acquired.set()
+            time.sleep(0.2)
+
+    thread = threading.Thread(target=hold)
+    thread.start()
+    acquired.wait()
+
+    ticks = 0
+
+    async def tick() -> None:
+        nonlocal ticks
+        while True:
+            ticks += 1
+            await asyncio.sleep(0.01)
+
+    ticker = asyncio.create_task(tick())
+    async with lock:
+        pass
+    ticker.cancel()
+    thread.join()
+
+    assert ticks > 5
+
+
+async def test_lock__mutual_exclusion_between_tasks_and_threads() -> None:
+    lock = Lock()
+    inside = 0
+    overlaps = 0
+
+    def enter() -> None:
+        nonlocal inside, overlaps
+        inside += 1
+        if inside > 1:
+            overlaps += 1
+
+    def leave() -> None:
+        nonlocal inside
+        inside -= 1
+
+    def thread_worker() -> None:
+        for _ in range(200):
+            with lock:
+                enter()
+                time.sleep(0)
+                leave()
+
+    async def task_worker() -> None:
+        for _ in range(20):
+            async with lock:
+                enter()
+                await asyncio.sleep(0)
+                leave()
+
+    threads = [threading.Thread(target=thread_worker) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    await asyncio.gather(*(task_worker() for _ in range(50)))
+    for thread in threads:
+        thread.join()
+
+    assert overlaps == 0
+    assert not lock.locked()
+
+
+async def test_lock__cancelled_waiter_does_not_lose_wakeup() -> None:
+    lock = Lock()
+    await lock.aacquire()
+
+    cancelled = asyncio.create_task(lock.aacquire())
+    waiting = asyncio.create_task(lock.aacquire())
+    await asyncio.sleep(0)
+
+    lock.release()
+    cancelled.cancel()
+    await asyncio.wait_for(waiting, timeout=1)
+
+    assert lock.locked()
+    lock.release()
@@ -0,0 +1,86 @@
+import json
+from unittest.mock import Mock
+
+import pytest
+
+import laima
+from laima.utils.trace import Trace
+
+
+class Database:
+    pass
+
+
+class Repository:
+    def __init__(self, database: Database) -> None:
+        self.database = database
+
+
+def test_trace__records_resolution_tree() -> None:
+    container = laima.Container()
+    laima.singleton(Database, container=container)
+    laima.scoped(Repository, container=container)
+    database = container.get(Database)
+    tracer = container.enable_tracing()
+    database()
+
+    @laima.inject(container=container)
+    def handle(first: Repository, second: Repository) -> None:
+        pass
+
+    handle()
+
+    [trace] = tracer.traces
+    tree = trace.to_dict()
+    assert tree["name"] == handle.__qualname__
+    first, second = tree["children"]
+    assert first["lifetime"] == "Scoped"
+    assert first["created"]
+    assert not second["created"]
+    [nested] = first["children"]
+    assert nested["lifetime"] == "Singleton"
+    assert not nested["created"]
+
+    chrome = json.loads(json.dumps(trace.to_chrome_trace()))
+    assert [event["cat"] for event in chrome["traceEvents"]] == ["inject", "Scoped", "Singleton", "Scoped"]
+    database.reset()
+
+
+async def test_trace__sample_rate() -> None:
+    container = laima.Container()
+    service = laima.transient(lambda: Mock(), container=container, bind_to="service")
+    traces: list[Trace] = []
+    container.enable_tracing(sample_rate=0.25, on_trace=traces.append)
+
+    for _ in range(8):
+        async with laima.inject(container=container):
+            service()
+
+    assert len(traces) == 2
+    assert traces[0].to_dict()["children"][0]["created"]
+
+
+def test_trace__callback_error_is_reported_as_warning() -> None:
+    container = laima.Container()
+    service = laima.transient(lambda: Mock(), container=container, bind_to="service")
+
+    def export(trace: Trace) -> None:
+        raise RuntimeError(trace)
+
+    container.enable_tracing(on_trace=export)
+
+    with pytest.warns(UserWarning, match="Trace callback failed"), laima.inject(container=container):
+        service()
+
+
+def test_trace__disabled() -> None:
+    container = laima.Container()
+    service = laima.transient(lambda: Mock(), container=container, bind_to="service")
+    tracer = container.enable_tracing()
+    container.disable_tracing()
+
+    with laima.inject(container=container):
+        service()
+
+    assert tracer.traces == []
+    assert "provide" not in vars(service)
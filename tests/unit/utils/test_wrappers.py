@@ -0,0 +1,72 @@
+from dataclasses import dataclass
+from unittest.mock import Mock
+
+import laima
+
+
+class Service:
+    pass
+
+
+def test_class_wrapper__injects_constructor_once() -> None:
+    container = laima.Container()
+    service = Mock()
+    laima.transient(lambda: service, container=container, bind_to=Service)
+
+    class MockClass:
+        def __init__(self, service: Service) -> None:
+            self.service = service
+
+    cls = laima.transient(MockClass, container=container)
+
+    with laima.inject():
+        first, second = cls(), cls()  # type: ignore[call-arg]
+
+    assert first is not second
+    assert first.service is service
+    assert second.service is service
+
+
+def test_class_wrapper__dataclass() -> None:
+    container = laima.Container()
+    service = Mock()
+    laima.transient(lambda: service, container=container, bind_to=Service)
+
+    @dataclass
+    class MockClass:
+        service: Service
+        value: int = 1
+
+    cls = laima.transient(MockClass, container=container)
+
+    with laima.inject():
+        instance = cls()  # type: ignore[call-arg]
+
+    assert instance.service is service
+    assert instance.value == 1
+
+
+def test_class_wrapper__slots_class() -> None:
+    class MockClass:
+        __slots__ = ("value",)
+
+        def __init__(self, value: int = 1) -> None:
+            self.value = value
+
+    cls = laima.transient(MockClass, container=laima.Container())
+
+    with laima.inject():
+        assert cls().value == 1
+
+
+def test_class_wrapper__subclass_is_initialized() -> None:
+    class MockClass:
+        def __init__(self, value: int = 1) -> None:
+            self.value = value
+
+    laima.transient(MockClass, container=laima.Container())
+
+    class SubClass(MockClass):
+        pass
+
+    assert SubClass(2).value == 2